@@ -0,0 +1,467 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from core.inference.engine import HybridSSMEngine
+from core.metrics import MetricsRegistry
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from monetization.l402_gate import L402Gate
+from monetization.store import SQLiteMonetizationBackend
+from orchestrator.omega_swarm import OmegaSwarm
+
+MODES = ("creative", "verified", "hybrid")
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    402: "Payment Required",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    505: "HTTP Version Not Supported",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    version: str
+    headers: Dict[str, str]
+    body: bytes = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            body = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body is not valid JSON") from None
+        if not isinstance(body, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return body
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    # NDJSON lines, sent with chunked transfer encoding instead of `body`.
+    stream: Optional[AsyncIterator[bytes]] = None
+
+
+def _encode(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(status: int, obj: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(status, _encode(obj), {"Content-Type": "application/json", **(headers or {})})
+
+
+class AxiomHiveServer:
+    """
+    Local HTTP/1.1 API over one OmegaSwarm, on asyncio streams.
+
+    Routes:
+    - GET  /health
+    - POST /axiom/{creative,verified,hybrid}   {"prompt", "context"}
+    - POST /monetization/create_invoice        {"purpose"}
+    - POST /monetization/issue_token           {"invoice_id"}
+    - GET  /metrics, /metrics/json             (with a MetricsRegistry)
+
+    Connections are kept alive (HTTP/1.1 default) and may pipeline: each
+    connection reads ahead up to `max_pipeline` requests, runs them
+    concurrently and writes the responses in request order. Pipeline stages
+    run on the swarm's worker threads (OmegaSwarm.execute_async), so the
+    event loop only parses and writes; at most `max_in_flight` pipeline runs
+    are admitted server-wide. Modes in `gated_modes` need a valid
+    `X-L402-Token`, otherwise the reply is 402 with a fresh invoice; gate
+    calls run on the swarm's I/O thread, off the event loop.
+    Requests sent with `Accept: application/x-ndjson` get one JSON line per
+    completed task followed by the result, as a chunked response.
+    """
+
+    def __init__(
+        self,
+        swarm: OmegaSwarm,
+        gate: L402Gate,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_in_flight: int = 64,
+        max_pipeline: int = 16,
+        max_body_bytes: int = 1 << 20,
+        max_header_bytes: int = 1 << 16,
+        idle_timeout_seconds: float = 15.0,
+        gated_modes: Tuple[str, ...] = ("verified",),
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.swarm = swarm
+        self.gate = gate
+        self.host = host
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.max_pipeline = max_pipeline
+        self.max_body_bytes = max_body_bytes
+        self.max_header_bytes = max_header_bytes
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.gated_modes = gated_modes
+        self.metrics = metrics
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._admission: Optional[asyncio.Semaphore] = None
+        self.stats = {"connections": 0, "requests": 0, "in_flight": 0}
+
+    # -- lifecycle --
+
+    async def start(self) -> asyncio.AbstractServer:
+        self._admission = asyncio.Semaphore(self.max_in_flight)
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=self.max_header_bytes
+        )
+        # With port=0 the OS picks one; report the bound port.
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # -- connection handling --
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["connections"] += 1
+        # (response task, keep-alive) in request order; None ends the connection.
+        pending: "asyncio.Queue[Optional[Tuple[asyncio.Future, bool]]]" = asyncio.Queue(self.max_pipeline)
+        sender = asyncio.create_task(self._send_responses(pending, writer))
+        try:
+            while not sender.done():
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.idle_timeout_seconds)
+                except HTTPError as exc:
+                    # The stream position is unknown after a bad request; answer and close.
+                    failed = asyncio.get_running_loop().create_future()
+                    failed.set_result(json_response(exc.status, {"error": str(exc)}, exc.headers))
+                    await pending.put((failed, False))
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                self.stats["requests"] += 1
+                await pending.put((asyncio.create_task(self._dispatch(request)), request.keep_alive))
+                if not request.keep_alive:
+                    break
+        finally:
+            await pending.put(None)
+            await sender
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as exc:
+            if not exc.partial.strip():
+                return None  # clean close between requests
+            raise HTTPError(400, "truncated request head") from None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "request head too large") from None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "malformed request line") from None
+        if version not in ("HTTP/1.1", "HTTP/1.0"):
+            raise HTTPError(505, f"unsupported version {version}")
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPError(400, "malformed header line")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise HTTPError(411, "request bodies must use Content-Length")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length") from None
+        if length < 0:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"body exceeds {self.max_body_bytes} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), path.split("?", 1)[0], version, headers, body)
+
+    async def _send_responses(
+        self,
+        pending: "asyncio.Queue[Optional[Tuple[asyncio.Future, bool]]]",
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        open_ = True
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            response_task, keep_alive = item
+            # Once the connection is gone, queued requests still run to
+            # completion (their C=0 entries are committed in order); only
+            # the replies are dropped.
+            if not open_:
+                continue
+            response = await response_task
+            try:
+                await self._write(writer, response, keep_alive)
+            except ConnectionError:
+                open_ = False
+            else:
+                open_ = keep_alive
+            if not open_:
+                writer.close()
+
+    async def _write(self, writer: asyncio.StreamWriter, response: Response, keep_alive: bool) -> None:
+        headers = dict(response.headers)
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        if response.stream is None:
+            headers["Content-Length"] = str(len(response.body))
+        else:
+            headers["Transfer-Encoding"] = "chunked"
+        head = f"HTTP/1.1 {response.status} {REASONS.get(response.status, '')}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n")
+        if response.stream is None:
+            writer.write(response.body)
+            await writer.drain()
+            return
+        try:
+            async for chunk in response.stream:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+        finally:
+            await response.stream.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    # -- routing --
+
+    async def _dispatch(self, request: Request) -> Response:
+        try:
+            if request.path == "/health":
+                self._allow(request, "GET")
+                return json_response(200, {"status": "ok", **self.stats})
+            if request.path in ("/metrics", "/metrics/json"):
+                self._allow(request, "GET")
+                if self.metrics is None:
+                    raise HTTPError(404, "metrics are disabled")
+                if request.path == "/metrics/json":
+                    return Response(200, self.metrics.to_json().encode("utf-8"), {"Content-Type": "application/json"})
+                return Response(
+                    200,
+                    self.metrics.to_prometheus().encode("utf-8"),
+                    {"Content-Type": "text/plain; version=0.0.4"},
+                )
+            if request.path.startswith("/axiom/"):
+                mode = request.path[len("/axiom/") :]
+                if mode not in MODES:
+                    raise HTTPError(404, f"unknown mode {mode!r}")
+                self._allow(request, "POST")
+                return await self._axiom(mode, request)
+            if request.path == "/monetization/create_invoice":
+                self._allow(request, "POST")
+                purpose = request.json().get("purpose", "axiom_call")
+                if not isinstance(purpose, str):
+                    raise HTTPError(400, "purpose must be a string")
+                return json_response(200, await self._gate(self.gate.create_invoice, purpose))
+            if request.path == "/monetization/issue_token":
+                self._allow(request, "POST")
+                invoice_id = request.json().get("invoice_id")
+                if not isinstance(invoice_id, str):
+                    raise HTTPError(400, "invoice_id must be a string")
+                token = await self._gate(self.gate.issue_token, invoice_id)
+                if token is None:
+                    raise HTTPError(404, f"unknown invoice {invoice_id!r}")
+                return json_response(200, {"token": token})
+            raise HTTPError(404, f"no route for {request.path}")
+        except HTTPError as exc:
+            return json_response(exc.status, {"error": str(exc)}, exc.headers)
+        except Exception as exc:  # one bad request must not drop the connection
+            return json_response(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+    @staticmethod
+    def _allow(request: Request, method: str) -> None:
+        if request.method != method:
+            raise HTTPError(405, f"{request.method} not allowed", {"Allow": method})
+
+    def _gate(self, fn: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        # Gate calls may write to the SQLite backend; they run one at a time on
+        # the swarm's I/O thread, which also keeps the gate's own maps serial.
+        return self.swarm._submit(self.swarm._pools()[2], fn, *args)
+
+    async def _axiom(self, mode: str, request: Request) -> Response:
+        body = request.json()
+        prompt = body.get("prompt")
+        context = body.get("context", {})
+        if not isinstance(prompt, str) or not isinstance(context, dict):
+            raise HTTPError(400, "expected {\"prompt\": str, \"context\": object}")
+        if mode in self.gated_modes and not await self._gate(
+            self.gate.verify_token, request.headers.get("x-l402-token", "")
+        ):
+            invoice = await self._gate(self.gate.create_invoice, f"axiom/{mode}")
+            return json_response(
+                402,
+                {"error": "payment required", "invoice": invoice},
+                {"WWW-Authenticate": f'L402 invoice="{invoice["bolt11"]}"'},
+            )
+        streaming = request.version == "HTTP/1.1" and "application/x-ndjson" in request.headers.get("accept", "")
+        events: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        run = asyncio.create_task(
+            self._execute(mode, prompt, context, events.put_nowait if streaming else None)
+        )
+        if not streaming:
+            return json_response(200, await run)
+        run.add_done_callback(lambda _: events.put_nowait(None))
+        return Response(200, headers={"Content-Type": "application/x-ndjson"}, stream=self._events(run, events))
+
+    async def _execute(
+        self,
+        mode: str,
+        prompt: str,
+        context: Dict[str, Any],
+        on_task: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> Dict[str, Any]:
+        async with self._admission:
+            self.stats["in_flight"] += 1
+            try:
+                return await self.swarm.execute_async(mode, prompt, context, on_task=on_task)
+            finally:
+                self.stats["in_flight"] -= 1
+
+    @staticmethod
+    async def _events(run: asyncio.Task, events: "asyncio.Queue[Optional[Dict[str, Any]]]") -> AsyncIterator[bytes]:
+        while True:
+            task = await events.get()
+            if task is None:
+                break
+            yield _encode({"event": "task", **task}) + b"\n"
+        exc = run.exception()
+        if exc is not None:
+            # Headers are already sent; report the failure in-band.
+            yield _encode({"event": "error", "error": f"{type(exc).__name__}: {exc}"}) + b"\n"
+        else:
+            yield _encode({"event": "result", "result": run.result()}) + b"\n"
+
+
+def build_swarm(
+    log_dir: str,
+    verifier_workers: int,
+    metrics: Optional[MetricsRegistry] = None,
+    key_dir: str = "keys/fhe",
+) -> OmegaSwarm:
+    return OmegaSwarm(
+        HybridSSMEngine(),
+        TLAVerifier(metrics=metrics),
+        C0Logger(log_dir, metrics=metrics),
+        LocalDeoxysCKKS(key_dir),
+        verifier_workers=verifier_workers,
+        metrics=metrics,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Axiom Hive local HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="0 picks a free port")
+    parser.add_argument("--log-dir", default="logs/c0", help="C=0 log directory")
+    parser.add_argument("--key-dir", default="keys/fhe", help="Local FHE key directory")
+    parser.add_argument("--verifier-workers", type=int, default=8, help="Concurrent verifier runs")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="Pipeline runs admitted at once")
+    parser.add_argument("--max-pipeline", type=int, default=16, help="Requests read ahead per connection")
+    parser.add_argument(
+        "--state-db",
+        default=None,
+        help="SQLite file persisting invoices and L402 tokens across runs",
+    )
+    parser.add_argument("--metrics", action="store_true", help="Record stage metrics, served at /metrics")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="With --metrics, also run the sampling profiler (top frames in /metrics/json)",
+    )
+    parser.add_argument(
+        "--metrics-sample-every",
+        type=int,
+        default=1,
+        help="With --metrics, time one call in N per stage (counters stay exact)",
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    metrics = MetricsRegistry(sample_every=args.metrics_sample_every) if args.metrics else None
+    if metrics is not None and args.profile:
+        metrics.start_profiler()
+    swarm = build_swarm(args.log_dir, args.verifier_workers, metrics, args.key_dir)
+    gate = L402Gate(backend=SQLiteMonetizationBackend(args.state_db) if args.state_db else None)
+    server = AxiomHiveServer(
+        swarm,
+        gate,
+        host=args.host,
+        port=args.port,
+        max_in_flight=args.max_in_flight,
+        max_pipeline=args.max_pipeline,
+        metrics=metrics,
+    )
+
+    async def run() -> None:
+        await server.start()
+        startup_ms = (time.perf_counter() - start) * 1000
+        sys.stderr.write(f"[api] listening on {server.host}:{server.port} (startup {startup_ms:.1f} ms)\n")
+        sys.stderr.flush()
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        swarm.close()
+        swarm.c0.close()
+        gate.close()
+    return 0
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    sys.exit(main())
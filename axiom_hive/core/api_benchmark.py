@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+# API_Benchmark: api.server latency and throughput, new connection per request vs keep-alive vs pipelining
+
+REQUESTS = 2000
+CONNECTIONS = 16
+PIPELINE_DEPTH = 8
+
+
+# 1. Start api.server on a free port (or use HOST:PORT from the command line)
+def start_server(log_dir):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "api.server", "--port", "0", "--log-dir", log_dir,
+         "--key-dir", os.path.join(log_dir, "keys")],
+        cwd=root,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stderr.readline()
+    match = re.search(r"listening on ([\d.]+):(\d+)", line)
+    if match is None:
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return proc, match.group(1), int(match.group(2))
+
+
+# 2. Minimal HTTP/1.1 client on asyncio streams
+def _request(i, close):
+    body = json.dumps({"prompt": f"Summarize: request {i}", "context": {"request": i}}).encode()
+    connection = "Connection: close\r\n" if close else ""
+    return (
+        f"POST /axiom/creative HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"{connection}Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(re.search(rb"Content-Length: (\d+)", head).group(1))
+    await reader.readexactly(length)
+    return int(head.split(b" ", 2)[1])
+
+
+async def _per_request(host, port, ids, latencies):
+    for i in ids:
+        start = time.perf_counter()
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(_request(i, close=True))
+        status = await _read_response(reader)
+        writer.close()
+        await writer.wait_closed()
+        latencies.append(time.perf_counter() - start)
+        assert status == 200, status
+
+
+async def _keep_alive(host, port, ids, latencies, depth):
+    # `depth` requests are written back to back before reading their responses.
+    reader, writer = await asyncio.open_connection(host, port)
+    for k in range(0, len(ids), depth):
+        batch = ids[k : k + depth]
+        start = time.perf_counter()
+        writer.write(b"".join(_request(i, close=False) for i in batch))
+        for _ in batch:
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            assert status == 200, status
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _load(host, port, n, connections, mode, depth):
+    latencies = []
+    shards = [list(range(c, n, connections)) for c in range(connections)]
+    start = time.perf_counter()
+    if mode == "per-request":
+        await asyncio.gather(*(_per_request(host, port, ids, latencies) for ids in shards))
+    else:
+        await asyncio.gather(*(_keep_alive(host, port, ids, latencies, depth) for ids in shards))
+    return n / (time.perf_counter() - start), sorted(latencies)
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+# 3. Compare connection strategies at the same concurrency
+def run_benchmark(host, port, n=REQUESTS, connections=CONNECTIONS, depth=PIPELINE_DEPTH):
+    rows = []
+    for label, mode, d in (
+        ("connection per request", "per-request", 1),
+        ("keep-alive", "keep-alive", 1),
+        (f"keep-alive, pipelined x{depth}", "keep-alive", depth),
+    ):
+        asyncio.run(_load(host, port, n // 10, connections, mode, d))  # warm-up
+        rps, latencies = asyncio.run(_load(host, port, n, connections, mode, d))
+        rows.append((label, rps, _percentile(latencies, 0.5) * 1000, _percentile(latencies, 0.99) * 1000))
+    return rows
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    proc = None
+    with tempfile.TemporaryDirectory() as log_dir:
+        if len(sys.argv) > 1:
+            host, _, port = sys.argv[1].rpartition(":")
+            port = int(port)
+        else:
+            proc, host, port = start_server(log_dir)
+        try:
+            print(
+                f"\n--- API Benchmark ({REQUESTS} creative requests, {CONNECTIONS} concurrent clients, "
+                f"{host}:{port}) ---"
+            )
+            print("| Client | requests/s | p50 ms | p99 ms |")
+            print("|---|---|---|---|")
+            for label, rps, p50, p99 in run_benchmark(host, port):
+                print(f"| {label} | {rps:,.0f} | {p50:.2f} | {p99:.2f} |")
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import time
+
+from crypto.c0_signatures import C0Logger
+
+# C0_Store_Benchmark: per-entry JSON files vs indexed append-only store
+
+ENTRIES = 20_000
+
+
+def _disk_usage(path):
+    files = 0
+    blocks = 0
+    for root, _dirs, names in os.walk(path):
+        for name in names:
+            st = os.stat(os.path.join(root, name))
+            files += 1
+            blocks += st.st_blocks * 512
+    return files, blocks
+
+
+# 1. Append throughput and on-disk footprint per layout
+def run_benchmark(n=ENTRIES):
+    rows = []
+    for layout in ("files", "segments", "store"):
+        with tempfile.TemporaryDirectory() as tmp:
+            logger = C0Logger(tmp, layout=layout)
+            start = time.perf_counter()
+            entries = [logger.sign_and_log("bench", {"request": i}) for i in range(n)]
+            appends = n / (time.perf_counter() - start)
+            lookups = None
+            if layout == "store":
+                # 2. Lookup-by-hash through the index
+                start = time.perf_counter()
+                for e in entries:
+                    assert logger.lookup(e["hash"])[0]["signature"] == e["signature"]
+                lookups = n / (time.perf_counter() - start)
+            logger.close()
+            files, size = _disk_usage(tmp)
+        rows.append((layout, appends, files, size, lookups))
+    return rows
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else ENTRIES
+    print(f"\n--- C0 Store Benchmark ({n:,} entries) ---")
+    print("| Layout | appends/s | files | bytes on disk | lookups/s |")
+    print("|---|---|---|---|---|")
+    for layout, appends, files, size, lookups in run_benchmark(n):
+        lookup_s = "-" if lookups is None else f"{lookups:,.0f}"
+        print(f"| {layout} | {appends:,.0f} | {files:,} | {size:,} | {lookup_s} |")
@@ -0,0 +1,216 @@
+import contextlib
+import contextvars
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class CanonicalHashCache:
+    """
+    Shared cache of canonical encodings and their SHA-256 digests.
+
+    Two encodings are supported, matching the existing call sites:
+    - text: `s.encode("utf-8")` (prompt hashing)
+    - json: `json.dumps(obj, sort_keys=True).encode("utf-8")` (context,
+      payload and audit hashing)
+
+    Digests are content-addressed in one LRU bounded by `max_bytes`: text by
+    the string itself, and JSON by a fingerprint built without serializing.
+    The fingerprint of a small document (dicts with str keys and short
+    lists, through COMPOSE_DEPTH levels, of COMPOSE_MAX_KEYS items at most)
+    mirrors its structure, with strings as themselves and other scalars as
+    their JSON text, so equal fingerprints mean equal canonical text and a
+    long system context sent on every request is serialized and hashed
+    once. Larger documents are serialized and hashed every time.
+
+    Inside `request_scope()` JSON objects also get an identity fast path:
+    while the scope is open the same dict/list object is canonicalized only
+    once, and a parent document is composed from the already-encoded text
+    of any child hashed earlier in the scope instead of being re-encoded.
+    The scope's entries are released when it closes. Digests are unchanged.
+    Callers must not mutate objects they hash within a scope.
+    """
+
+    COMPOSE_DEPTH = 3
+    COMPOSE_MAX_KEYS = 16
+
+    def __init__(self, max_bytes: int = 1 << 20) -> None:
+        self.max_bytes = max_bytes
+        # key -> (canonical JSON text or None for text entries, digest, size)
+        self._entries: "OrderedDict[Any, Tuple[Optional[str], bytes, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # A context variable gives each thread and each asyncio task its own scope.
+        self._scope: "contextvars.ContextVar[Optional[Dict[int, Any]]]" = contextvars.ContextVar(
+            f"canonical_scope_{id(self):x}", default=None
+        )
+        self.hits = 0
+        self.misses = 0
+        self.scope_hits = 0
+
+    # -- scopes --
+
+    @contextlib.contextmanager
+    def request_scope(self) -> Iterator[None]:
+        """Enable the identity fast path for the enclosed block (per thread/task)."""
+        if self._scope.get() is not None:
+            yield
+            return
+        token = self._scope.set({})
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+
+    # -- LRU --
+
+    def _get(self, key: Any) -> Optional[Tuple[Optional[str], bytes, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _put(self, key: Any, canonical: Optional[str], digest: bytes, size: int) -> None:
+        # Inputs larger than the whole budget are hashed but not retained.
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (canonical, digest, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[1][2]
+
+    # -- lookups --
+
+    def text(self, value: str) -> Tuple[bytes, bytes]:
+        """(utf-8 bytes, sha256 digest) of a string."""
+        encoded = value.encode("utf-8")
+        entry = self._get(value)
+        if entry is not None:
+            return encoded, entry[1]
+        digest = hashlib.sha256(encoded).digest()
+        self._put(value, None, digest, len(encoded) + len(digest))
+        return encoded, digest
+
+    @staticmethod
+    def _encode(canonical: str) -> Tuple[bytes, bytes]:
+        encoded = canonical.encode("utf-8")
+        return encoded, hashlib.sha256(encoded).digest()
+
+    def _fingerprint(self, obj: Any, scope: Optional[Dict[int, Any]], depth: int) -> Any:
+        # Hashable stand-in for obj's canonical text, or None if not worth
+        # building. Tags keep dicts, lists and scalars apart, and scalars
+        # other than str use their JSON text (1, 1.0 and True differ there).
+        t = type(obj)
+        if t is str:
+            return obj
+        if t is dict or t is list:
+            if scope is not None:
+                hit = scope.get(id(obj))
+                if hit is not None and hit[0] is obj:
+                    return hit[3]
+            if depth == 0 or len(obj) > self.COMPOSE_MAX_KEYS:
+                return None
+            if t is list:
+                items = tuple(self._fingerprint(v, scope, depth - 1) for v in obj)
+                return None if None in items else ("[", items)
+            pairs = []
+            for k, v in obj.items():
+                fp = self._fingerprint(v, scope, depth - 1) if type(k) is str else None
+                if fp is None:
+                    return None
+                pairs.append((k, fp))
+            pairs.sort()
+            return ("{", tuple(pairs))
+        if t is int or t is float or t is bool or obj is None:
+            return ("=", json.dumps(obj))
+        return None
+
+    def _fragment(self, obj: Any, scope: Dict[int, Any], depth: int) -> str:
+        # Canonical text of `obj`, reusing fragments already encoded in scope.
+        # `json.dumps(..., sort_keys=True)` of a dict is the sorted "key: value"
+        # fragments joined by ", ", so composing gives byte-identical output.
+        if isinstance(obj, (dict, list)):
+            hit = scope.get(id(obj))
+            if hit is not None and hit[0] is obj:
+                with self._lock:
+                    self.scope_hits += 1
+                return hit[1]
+            if (
+                depth > 0
+                and isinstance(obj, dict)
+                and len(obj) <= self.COMPOSE_MAX_KEYS
+                and all(type(k) is str for k in obj)
+            ):
+                parts = [
+                    json.dumps(k) + ": " + self._fragment(obj[k], scope, depth - 1)
+                    for k in sorted(obj)
+                ]
+                return "{" + ", ".join(parts) + "}"
+        return json.dumps(obj, sort_keys=True)
+
+    def json(self, obj: Any) -> Tuple[bytes, bytes]:
+        """(canonical JSON bytes, sha256 digest) of a JSON-serializable object."""
+        scope = self._scope.get()
+        scoped = scope is not None and isinstance(obj, (dict, list))
+        if scoped:
+            hit = scope.get(id(obj))
+            # The scope holds a reference, so the id cannot be recycled.
+            if hit is not None and hit[0] is obj:
+                with self._lock:
+                    self.scope_hits += 1
+                return hit[2]
+        fp = self._fingerprint(obj, scope, self.COMPOSE_DEPTH)
+        cached = self._get(("json", fp)) if fp is not None else None
+        if cached is not None:
+            canonical = cached[0]
+            entry = (canonical.encode("utf-8"), cached[1])
+        else:
+            if scope:
+                canonical = self._fragment(obj, scope, self.COMPOSE_DEPTH)
+            else:
+                canonical = json.dumps(obj, sort_keys=True)
+            entry = self._encode(canonical)
+            if fp is not None:
+                # The fingerprint holds the document's strings, about as much again.
+                self._put(("json", fp), canonical, entry[1], 2 * len(entry[0]) + len(entry[1]))
+        if scoped:
+            scope[id(obj)] = (obj, canonical, entry, fp)
+        return entry
+
+    def text_digest(self, value: str) -> bytes:
+        return self.text(value)[1]
+
+    def json_hexdigest(self, obj: Any) -> str:
+        return self.json(obj)[1].hex()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "scope_hits": self.scope_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.scope_hits = 0
+
+
+# Process-wide cache shared by the engine, verifier, orchestrator and C0 logger.
+DEFAULT_HASH_CACHE = CanonicalHashCache()
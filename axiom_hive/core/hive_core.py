@@ -1,12 +1,41 @@
 import argparse
+import base64
+import errno
 import hashlib
 import hmac
+import io
 import json
 import os
+import signal
+import socket
+import socketserver
+import stat
 import sys
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; bulk kernels fall back to int ops
+    np = None
+
+if __package__ in (None, ""):
+    # Run as a script (python axiom_hive/core/hive_core.py): put the package
+    # root on the path so the shared monetization types import.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monetization.store import (  # noqa: E402
+    ExpiringTokenStore,
+    Invoice,
+    L402Token,
+    MonetizationBackend,
+    SQLiteMonetizationBackend,
+)
+
+# Reference point for reporting daemon startup latency.
+_PROCESS_START = time.perf_counter()
 
 
 # =========================
@@ -20,44 +49,228 @@ class CZeroSignature:
     timestamp_ns: int
 
 
+def _signature_to_line(record: CZeroSignature) -> str:
+    return (
+        json.dumps(
+            {
+                "signature": record.signature,
+                "context": record.context,
+                "timestamp_ns": record.timestamp_ns,
+            }
+        )
+        + "\n"
+    )
+
+
+class GroupCommitWriter:
+    """
+    Buffered append-only writer for C=0 log records.
+
+    Keeps a single file handle open and hands records to a background
+    flusher thread. The flusher commits records in groups once either
+    `flush_size` records are pending or `flush_interval` seconds have
+    elapsed, so the request path only pays for a list append. The pending
+    queue is bounded by `max_pending`; producers block when it is full.
+
+    The flusher is a daemon thread: records still pending when the process
+    exits without `close()` are lost, so buffering is opt-in
+    (`CZeroLogger(buffered=True)`) for owners that close the logger.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        flush_size: int = 256,
+        max_pending: int = 10_000,
+        fsync: bool = False,
+    ) -> None:
+        if flush_size < 1 or max_pending < flush_size:
+            raise ValueError("Require 1 <= flush_size <= max_pending")
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self._fh = open(path, "a", encoding="utf-8")
+        self._pending: List[CZeroSignature] = []
+        self._cond = threading.Condition()
+        # Serializes swap+write so groups reach the file in submit order.
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="c0-group-commit", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, record: CZeroSignature) -> None:
+        with self._cond:
+            if self._closed:
+                raise ValueError("GroupCommitWriter is closed")
+            while len(self._pending) >= self.max_pending and not self._closed:
+                self._cond.notify_all()
+                self._cond.wait()
+            self._pending.append(record)
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify_all()
+
+    def submit_many(self, records: Sequence[CZeroSignature]) -> None:
+        with self._cond:
+            if self._closed:
+                raise ValueError("GroupCommitWriter is closed")
+            while len(self._pending) >= self.max_pending and not self._closed:
+                self._cond.notify_all()
+                self._cond.wait()
+            # A grouped submit is kept whole even if it overshoots max_pending.
+            self._pending.extend(records)
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.flush_size,
+                    timeout=self.flush_interval,
+                )
+                if self._closed:
+                    return
+            self._commit()
+
+    def _commit(self) -> None:
+        with self._io_lock:
+            with self._cond:
+                batch = self._pending
+                self._pending = []
+                self._cond.notify_all()
+            if not batch or self._fh.closed:
+                return
+            try:
+                self._fh.write("".join(_signature_to_line(r) for r in batch))
+                self._fh.flush()
+                if self.fsync:
+                    os.fsync(self._fh.fileno())
+            except Exception:
+                # Logging failures must not crash sensitive operations
+                pass
+
+    def flush(self) -> None:
+        """Write every record submitted before this call."""
+        self._commit()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._commit()
+        with self._io_lock:
+            self._fh.close()
+
+
 class CZeroLogger:
-    def __init__(self, secret_key: Optional[bytes] = None, log_file: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        secret_key: Optional[bytes] = None,
+        log_file: Optional[str] = None,
+        buffered: bool = False,
+        flush_interval: float = 0.05,
+        flush_size: int = 256,
+        max_pending: int = 10_000,
+        fsync: bool = False,
+        metrics: Optional[Any] = None,
+    ) -> None:
         self._secret_key = secret_key or os.urandom(32)
         self._log: List[CZeroSignature] = []
         self._log_file = log_file
+        self._writer: Optional[GroupCommitWriter] = None
+        if log_file and buffered:
+            self._writer = GroupCommitWriter(
+                log_file,
+                flush_interval=flush_interval,
+                flush_size=flush_size,
+                max_pending=max_pending,
+                fsync=fsync,
+            )
+        if metrics is not None:
+            self._instrument(metrics)
+
+    def _instrument(self, metrics: Any) -> None:
+        # Timed wrappers (metrics.wrap) shadow the methods on this logger only.
+        self.log = metrics.wrap("secure.c0_log", self.log)
+        self.log_many = metrics.wrap("secure.c0_log", self.log_many)
+        self.log_signed = metrics.wrap("secure.c0_log", self.log_signed)
 
     def _derive_signature(self, payload: bytes, context: str) -> str:
-        m = hmac.new(self._secret_key, digestmod=hashlib.sha256)
-        m.update(context.encode("utf-8"))
+        m = self.new_signer(context)
         m.update(payload)
         return m.hexdigest()
 
+    def new_signer(self, context: str) -> hmac.HMAC:
+        """Incremental HMAC context; feed payload chunks, then `log_signed`."""
+        m = hmac.new(self._secret_key, digestmod=hashlib.sha256)
+        m.update(context.encode("utf-8"))
+        return m
+
     def log(self, payload: bytes, context: str) -> CZeroSignature:
         ts_ns = time.time_ns()
         sig = self._derive_signature(payload, context)
+        return self._record(sig, context, ts_ns)
+
+    def log_many(self, entries: Sequence[Tuple[bytes, str]]) -> List[CZeroSignature]:
+        """Sign `(payload, context)` pairs in one pass and write them as one group."""
+        records = [
+            CZeroSignature(
+                signature=self._derive_signature(payload, context),
+                context=context,
+                timestamp_ns=time.time_ns(),
+            )
+            for payload, context in entries
+        ]
+        self._log.extend(records)
+        if self._writer is not None:
+            self._writer.submit_many(records)
+        elif self._log_file and records:
+            try:
+                with open(self._log_file, "a", encoding="utf-8") as f:
+                    f.write("".join(_signature_to_line(r) for r in records))
+            except Exception:
+                # Logging failures must not crash sensitive operations
+                pass
+        return records
+
+    def log_signed(self, signer: hmac.HMAC, context: str) -> CZeroSignature:
+        return self._record(signer.hexdigest(), context, time.time_ns())
+
+    def _record(self, sig: str, context: str, ts_ns: int) -> CZeroSignature:
         record = CZeroSignature(signature=sig, context=context, timestamp_ns=ts_ns)
         self._log.append(record)
-        if self._log_file:
+        if self._writer is not None:
+            self._writer.submit(record)
+        elif self._log_file:
             self._append_to_file(record)
         return record
 
     def _append_to_file(self, record: CZeroSignature) -> None:
         try:
             with open(self._log_file, "a", encoding="utf-8") as f:
-                f.write(
-                    json.dumps(
-                        {
-                            "signature": record.signature,
-                            "context": record.context,
-                            "timestamp_ns": record.timestamp_ns,
-                        }
-                    )
-                    + "\n"
-                )
+                f.write(_signature_to_line(record))
         except Exception:
             # Logging failures must not crash sensitive operations
             pass
 
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        # Later records fall back to the per-record append path.
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
     def verify(self, payload: bytes, context: str, signature: str) -> bool:
         expected = self._derive_signature(payload, context)
         return hmac.compare_digest(expected, signature)
@@ -85,14 +298,95 @@ class FHEKeySet:
         self.key_id = key_id
 
 
+# Bulk byte kernels. Each operates on whole buffers at once: NumPy uint8
+# arrays when available, otherwise a single big integer per buffer with
+# SIMD-within-a-register tricks so every byte lane is processed together.
+
+BULK_BACKENDS = ("numpy", "python")
+DEFAULT_BULK_BACKEND = "numpy" if np is not None else "python"
+
+
+def _tile(pattern: bytes, length: int) -> bytes:
+    reps = length // len(pattern) + 1
+    return (pattern * reps)[:length]
+
+
+def _lane_mask(byte: int, length: int) -> int:
+    return int.from_bytes(bytes([byte]) * length, "little")
+
+
+def _xor_bytes_python(a: bytes, b: bytes) -> bytes:
+    n = len(a)
+    x = int.from_bytes(a, "little") ^ int.from_bytes(b, "little")
+    return x.to_bytes(n, "little")
+
+
+def _mul_bytes_python(a: bytes, b: bytes) -> bytes:
+    # Lane-wise (a * b) % 256 via shift-and-add over the 8 bits of b.
+    n = len(a)
+    if n == 0:
+        return b""
+    x = int.from_bytes(a, "little")
+    y = int.from_bytes(b, "little")
+    ones = _lane_mask(0x01, n)
+    low7 = _lane_mask(0x7F, n)
+    high = _lane_mask(0x80, n)
+    acc = 0
+    for k in range(8):
+        select = ((y >> k) & ones) * 0xFF
+        term = x & select
+        # Carry-free lane-wise addition modulo 256
+        acc = ((acc & low7) + (term & low7)) ^ ((acc ^ term) & high)
+        # Lane-wise doubling modulo 256: a << (k + 1) within each byte
+        x = (x & low7) << 1
+    return acc.to_bytes(n, "little")
+
+
+def _xor_bytes(a: bytes, b: bytes, backend: str) -> bytes:
+    if backend == "numpy":
+        return (np.frombuffer(a, dtype=np.uint8) ^ np.frombuffer(b, dtype=np.uint8)).tobytes()
+    return _xor_bytes_python(a, b)
+
+
+def _mul_bytes(a: bytes, b: bytes, backend: str) -> bytes:
+    if backend == "numpy":
+        return (np.frombuffer(a, dtype=np.uint8) * np.frombuffer(b, dtype=np.uint8)).tobytes()
+    return _mul_bytes_python(a, b)
+
+
 class FHEEngine:
     SUPPORTED_SCHEMES = {"deoxys", "ckks"}
 
-    def __init__(self, scheme: str = "ckks") -> None:
+    def __init__(
+        self,
+        scheme: str = "ckks",
+        backend: Optional[str] = None,
+        keystream_cap: int = 1 << 24,
+        metrics: Optional[Any] = None,
+    ) -> None:
         if scheme not in self.SUPPORTED_SCHEMES:
             raise ValueError(f"Unsupported FHE scheme: {scheme}")
+        backend = backend or DEFAULT_BULK_BACKEND
+        if backend not in BULK_BACKENDS:
+            raise ValueError(f"Unsupported bulk backend: {backend}")
+        if backend == "numpy" and np is None:
+            raise ValueError("NumPy backend requested but numpy is not installed")
         self.scheme = scheme
+        self.backend = backend
+        # Largest keystream kept pre-tiled; longer payloads are tiled per call.
+        self.keystream_cap = keystream_cap
         self._keyset = FHEKeySet(scheme=scheme, key_id=self._generate_key_id())
+        self._mask_key_id: Optional[str] = None
+        self._mask_cache = b""
+        self._keystream = b""
+        if metrics is not None:
+            self._instrument(metrics)
+
+    def _instrument(self, metrics: Any) -> None:
+        # Timed wrappers (metrics.wrap) shadow the methods on this engine only.
+        self.encrypt = metrics.wrap("secure.fhe_encrypt", self.encrypt)
+        self.encrypt_many = metrics.wrap("secure.fhe_encrypt", self.encrypt_many)
+        self.encrypt_chunk = metrics.wrap("secure.fhe_encrypt", self.encrypt_chunk)
 
     @staticmethod
     def _generate_key_id() -> str:
@@ -101,59 +395,158 @@ class FHEEngine:
     def get_keyset(self) -> FHEKeySet:
         return self._keyset
 
+    def rotate_keys(self) -> FHEKeySet:
+        self._keyset = FHEKeySet(scheme=self.scheme, key_id=self._generate_key_id())
+        self._invalidate_mask()
+        return self._keyset
+
+    def _invalidate_mask(self) -> None:
+        self._mask_key_id = None
+        self._mask_cache = b""
+        self._keystream = b""
+
     def _mask(self) -> bytes:
-        return hashlib.sha256(self._keyset.key_id.encode("utf-8")).digest()
+        # Cached per key_id, so any keyset change invalidates it.
+        key_id = self._keyset.key_id
+        if self._mask_key_id != key_id:
+            self._mask_cache = hashlib.sha256(key_id.encode("utf-8")).digest()
+            self._keystream = b""
+            self._mask_key_id = key_id
+        return self._mask_cache
+
+    def _keystream_for(self, offset: int, length: int) -> bytes:
+        mask = self._mask()
+        shift = offset % len(mask)
+        end = shift + length
+        # Work on a local reference so concurrent growth cannot shrink it.
+        keystream = self._keystream
+        if end > len(keystream):
+            if end > self.keystream_cap:
+                return _tile(mask[shift:] + mask[:shift], length)
+            # Grow geometrically (bounded by the cap) to amortize re-tiling.
+            size = min(max(end, 2 * len(keystream)), self.keystream_cap)
+            keystream = _tile(mask, size)
+            self._keystream = keystream
+        return memoryview(keystream)[shift:end]
+
+    def _apply_mask(self, data: bytes, offset: int = 0) -> bytes:
+        return _xor_bytes(data, self._keystream_for(offset, len(data)), self.backend)
+
+    def encrypt_chunk(self, chunk: bytes, offset: int) -> bytes:
+        """Encrypt `chunk` as if it sat at byte `offset` of a larger plaintext."""
+        return self._apply_mask(chunk, offset)
 
     def encrypt(self, plaintext: bytes) -> FHECiphertext:
-        mask = self._mask()
-        obfuscated = bytes(b ^ mask[i % len(mask)] for i, b in enumerate(plaintext))
-        return FHECiphertext(raw=obfuscated, scheme=self.scheme)
+        return FHECiphertext(raw=self._apply_mask(plaintext), scheme=self.scheme)
+
+    def encrypt_many(self, plaintexts: Sequence[bytes]) -> List[FHECiphertext]:
+        """Encrypt several payloads with a single bulk XOR over their concatenation."""
+        joined = b"".join(plaintexts)
+        keystream = b"".join(self._keystream_for(0, len(p)) for p in plaintexts)
+        raw = _xor_bytes(joined, keystream, self.backend)
+        out: List[FHECiphertext] = []
+        pos = 0
+        for p in plaintexts:
+            out.append(FHECiphertext(raw=raw[pos : pos + len(p)], scheme=self.scheme))
+            pos += len(p)
+        return out
 
     def decrypt(self, ciphertext: FHECiphertext) -> bytes:
         if ciphertext.scheme != self.scheme:
             raise ValueError("Ciphertext scheme mismatch")
-        mask = self._mask()
-        plain = bytes(b ^ mask[i % len(mask)] for i, b in enumerate(ciphertext.raw))
-        return plain
+        return self._apply_mask(ciphertext.raw)
 
     def eval_add(self, a: FHECiphertext, b: FHECiphertext) -> FHECiphertext:
         if a.scheme != b.scheme or a.scheme != self.scheme:
             raise ValueError("Ciphertext scheme mismatch")
         min_len = min(len(a.raw), len(b.raw))
-        combined = bytes(a.raw[i] ^ b.raw[i] for i in range(min_len))
+        combined = _xor_bytes(a.raw[:min_len], b.raw[:min_len], self.backend)
         return FHECiphertext(raw=combined, scheme=self.scheme)
 
     def eval_mul(self, a: FHECiphertext, b: FHECiphertext) -> FHECiphertext:
         if a.scheme != b.scheme or a.scheme != self.scheme:
             raise ValueError("Ciphertext scheme mismatch")
         min_len = min(len(a.raw), len(b.raw))
-        combined = bytes((a.raw[i] * b.raw[i]) % 256 for i in range(min_len))
+        combined = _mul_bytes(a.raw[:min_len], b.raw[:min_len], self.backend)
         return FHECiphertext(raw=combined, scheme=self.scheme)
 
 
 # =========================
 # MONETIZATION STUBS
 # =========================
+# Invoice, L402Token, ExpiringTokenStore and the persistence backends live in
+# monetization/store.py, shared with the HTTP gate.
+
+class StatelessTokenCodec:
+    """
+    Macaroon-style self-describing L402 tokens.
+
+    A token is `PREFIX + base64url(json{r, e, n}) + "." + hex(HMAC-SHA256)`
+    where `r` is the resource_id, `e` the expiry in ns and `n` a random
+    nonce. Validation recomputes the HMAC under the server key and checks
+    the caveats, so any process holding the key can validate without shared
+    state.
+    """
+
+    PREFIX = "l402s1."
+
+    def __init__(self, server_key: bytes) -> None:
+        if not server_key:
+            raise ValueError("server_key must not be empty")
+        self._key = server_key
+
+    def _mac(self, body: bytes) -> str:
+        return hmac.new(self._key, body, hashlib.sha256).hexdigest()
+
+    def encode(self, resource_id: str, expires_at_ns: int) -> str:
+        claims = {"r": resource_id, "e": expires_at_ns, "n": os.urandom(8).hex()}
+        body = base64.urlsafe_b64encode(
+            json.dumps(claims, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        ).rstrip(b"=")
+        return f"{self.PREFIX}{body.decode('ascii')}.{self._mac(body)}"
+
+    def decode(self, token_value: str) -> Optional[L402Token]:
+        """Return the token's claims if the MAC verifies, else None (expiry is not checked)."""
+        # Tokens are pure ASCII; anything else is rejected rather than stripped.
+        if not token_value.isascii() or not token_value.startswith(self.PREFIX):
+            return None
+        body, dot, mac = token_value[len(self.PREFIX):].rpartition(".")
+        if not dot:
+            return None
+        body_bytes = body.encode("ascii")
+        if not hmac.compare_digest(self._mac(body_bytes), mac):
+            return None
+        try:
+            claims = json.loads(base64.urlsafe_b64decode(body_bytes + b"=" * (-len(body_bytes) % 4)))
+            return L402Token(token=token_value, resource_id=claims["r"], expires_at_ns=int(claims["e"]))
+        except (ValueError, KeyError, TypeError):
+            return None
 
-@dataclass
-class Invoice:
-    invoice_id: str
-    amount_sats: int
-    description: str
-    settled: bool = False
 
+class MonetizationManager:
+    def __init__(
+        self,
+        token_capacity: int = 1_000_000,
+        stateless_tokens: bool = False,
+        server_key: Optional[bytes] = None,
+        backend: Optional[MonetizationBackend] = None,
+    ) -> None:
+        # In-memory maps act as a write-through cache in front of `backend`.
+        self._backend = backend or MonetizationBackend()
+        self._invoices: Dict[str, Invoice] = {}
+        self._tokens = ExpiringTokenStore(capacity=token_capacity)
+        # Share `server_key` across processes to validate each other's tokens.
+        self.stateless_tokens = stateless_tokens
+        self._codec = StatelessTokenCodec(os.urandom(32) if server_key is None else server_key)
 
-@dataclass
-class L402Token:
-    token: str
-    resource_id: str
-    expires_at_ns: int
+    def start_background_eviction(self, interval_seconds: float = 1.0) -> None:
+        self._tokens.start_sweeper(interval_seconds)
 
+    def stop_background_eviction(self) -> None:
+        self._tokens.stop_sweeper()
 
-class MonetizationManager:
-    def __init__(self) -> None:
-        self._invoices: Dict[str, Invoice] = {}
-        self._tokens: Dict[str, L402Token] = {}
+    def close(self) -> None:
+        self._backend.close()
 
     # Lightning stubs
 
@@ -168,17 +561,27 @@ class MonetizationManager:
             settled=False,
         )
         self._invoices[invoice_id] = invoice
+        self._backend.add_invoices([invoice])
         return invoice
 
-    def settle_invoice(self, invoice_id: str) -> bool:
+    def _get_invoice(self, invoice_id: str) -> Optional[Invoice]:
         inv = self._invoices.get(invoice_id)
+        if inv is None:
+            inv = self._backend.get_invoice(invoice_id)
+            if inv is not None:
+                self._invoices[invoice_id] = inv
+        return inv
+
+    def settle_invoice(self, invoice_id: str) -> bool:
+        inv = self._get_invoice(invoice_id)
         if not inv:
             return False
         inv.settled = True
+        self._backend.mark_settled(invoice_id)
         return True
 
     def is_invoice_settled(self, invoice_id: str) -> bool:
-        inv = self._invoices.get(invoice_id)
+        inv = self._get_invoice(invoice_id)
         return bool(inv and inv.settled)
 
     # L402 stubs
@@ -186,6 +589,12 @@ class MonetizationManager:
     def issue_l402_token(self, resource_id: str, ttl_seconds: int) -> L402Token:
         now_ns = time.time_ns()
         expires_at_ns = now_ns + ttl_seconds * 1_000_000_000
+        if self.stateless_tokens:
+            return L402Token(
+                token=self._codec.encode(resource_id, expires_at_ns),
+                resource_id=resource_id,
+                expires_at_ns=expires_at_ns,
+            )
         raw = f"{resource_id}:{now_ns}:{os.urandom(16).hex()}".encode("utf-8")
         token_val = hashlib.sha256(raw).hexdigest()
         token = L402Token(
@@ -193,17 +602,25 @@ class MonetizationManager:
             resource_id=resource_id,
             expires_at_ns=expires_at_ns,
         )
-        self._tokens[token_val] = token
+        self._tokens.put(token_val, token, expires_at_ns)
+        self._backend.add_token(token)
         return token
 
     def validate_l402_token(self, token_value: str, resource_id: str) -> bool:
+        if token_value.startswith(StatelessTokenCodec.PREFIX):
+            token = self._codec.decode(token_value)
+            if token is None or token.resource_id != resource_id:
+                return False
+            return time.time_ns() <= token.expires_at_ns
+        # The store drops expired tokens on lookup.
         token = self._tokens.get(token_value)
         if not token:
-            return False
+            token = self._backend.get_token(token_value)
+            if not token or time.time_ns() > token.expires_at_ns:
+                return False
+            self._tokens.put(token_value, token, token.expires_at_ns)
         if token.resource_id != resource_id:
             return False
-        if time.time_ns() > token.expires_at_ns:
-            return False
         return True
 
 
@@ -217,10 +634,70 @@ class SecureService:
         c0_logger: Optional[CZeroLogger] = None,
         fhe_engine: Optional[FHEEngine] = None,
         monetization: Optional[MonetizationManager] = None,
+        metrics: Optional[Any] = None,
     ) -> None:
         self.c0_logger = c0_logger or CZeroLogger(log_file="c0_log.jsonl")
         self.fhe_engine = fhe_engine or FHEEngine(scheme="ckks")
         self.monetization = monetization or MonetizationManager()
+        self.metrics: Optional[Any] = None
+        # Per-operation latency histograms; empty without metrics.
+        self._timers: Dict[str, Any] = {}
+        if metrics is not None:
+            self._instrument(metrics)
+
+    def _instrument(self, metrics: Any) -> None:
+        """
+        Time the sensitive operations and count bytes hashed, encrypted and logged.
+
+        `metrics` needs `histogram`, `add` and `collect`, as
+        core.metrics.MetricsRegistry provides (duck-typed so this module stays
+        self-contained). An operation takes tens of microseconds, where even
+        one wrapper frame per call costs over 1%, so each operation times
+        itself at the service boundary: it asks its histogram whether this
+        call is sampled and, if so, records its latency and adds its bytes
+        (scaled like the histogram's counts) to the registry's counters.
+        Logged bytes are read from the log file size at export time. For
+        C=0 log and FHE encrypt timings, pass `metrics` to CZeroLogger and
+        FHEEngine as well.
+        """
+        self.metrics = metrics
+        log_file = self.c0_logger._log_file
+        if log_file is not None:
+            try:
+                base = os.path.getsize(log_file)
+            except OSError:
+                base = 0
+            last = [0]
+
+            def logged_bytes() -> Dict[str, int]:
+                try:
+                    last[0] = os.path.getsize(log_file) - base
+                except OSError:
+                    pass
+                return {"bytes_logged": last[0]}
+
+            metrics.collect(logged_bytes)
+
+        for name in (
+            "sensitive_transform",
+            "sensitive_transform_batch",
+            "sensitive_transform_stream",
+            "sensitive_add_encrypted",
+            "sensitive_add_batch",
+        ):
+            self._timers[name] = metrics.histogram(f"secure.{name}")
+
+    def _observe(self, timer: Any, start_ns: int, hashed: int, encrypted: int) -> None:
+        # Bytes fed to SHA-256 / the C=0 HMAC, and to the FHE encryptor. A
+        # sampled call stands for `sample_every` calls, like its latency.
+        timer.record(time.perf_counter_ns() - start_ns)
+        every = timer.sample_every
+        self.metrics.add("bytes_hashed", hashed * every)
+        self.metrics.add("bytes_encrypted", encrypted * every)
+
+    def close(self) -> None:
+        self.c0_logger.close()
+        self.monetization.close()
 
     # Sensitive operations: always log C=0 and use FHE stubs
 
@@ -230,7 +707,10 @@ class SecureService:
         context: str,
         resource_id: str,
         l402_token: Optional[str],
+        sink: Optional[BinaryIO] = None,
     ) -> Dict[str, Any]:
+        timer = self._timers.get("sensitive_transform")
+        start_ns = time.perf_counter_ns() if timer is not None and timer.sampled() else 0
         monetization_pass = True
         if l402_token is not None:
             monetization_pass = self.monetization.validate_l402_token(
@@ -240,9 +720,13 @@ class SecureService:
 
         sig_record = self.c0_logger.log(payload=payload, context=context)
         ciphertext = self.fhe_engine.encrypt(plaintext=payload)
+        if sink is not None:
+            sink.write(ciphertext.raw)
 
         # Example deterministic transformation on plaintext
         digest = hashlib.sha256(payload).hexdigest()
+        if start_ns:
+            self._observe(timer, start_ns, 2 * len(payload), len(payload))
 
         return {
             "monetization_pass": monetization_pass,
@@ -253,6 +737,62 @@ class SecureService:
             "resource_id": resource_id,
         }
 
+    def sensitive_transform_stream(
+        self,
+        source: BinaryIO,
+        context: str,
+        resource_id: str,
+        l402_token: Optional[str],
+        sink: Optional[BinaryIO] = None,
+        chunk_size: int = 1 << 20,
+    ) -> Dict[str, Any]:
+        """
+        Chunked variant of `sensitive_transform` for large inputs.
+
+        Reads `source` (a binary file object or mmap) in `chunk_size` pieces,
+        feeding the SHA-256 digest, the C=0 HMAC and the FHE keystream in one
+        pass, and writes ciphertext to `sink` as it goes. Peak memory is one
+        chunk; the returned dict matches `sensitive_transform` field for field.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        timer = self._timers.get("sensitive_transform_stream")
+        start_ns = time.perf_counter_ns() if timer is not None and timer.sampled() else 0
+        monetization_pass = True
+        if l402_token is not None:
+            monetization_pass = self.monetization.validate_l402_token(
+                token_value=l402_token,
+                resource_id=resource_id,
+            )
+
+        signer = self.c0_logger.new_signer(context)
+        digest = hashlib.sha256()
+        offset = 0
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            signer.update(chunk)
+            digest.update(chunk)
+            encrypted = self.fhe_engine.encrypt_chunk(chunk, offset)
+            if sink is not None:
+                sink.write(encrypted)
+            offset += len(chunk)
+
+        sig_record = self.c0_logger.log_signed(signer, context)
+        ciphertext_repr = f"FHECiphertext(scheme={self.fhe_engine.scheme!r}, len={offset})"
+        if start_ns:
+            self._observe(timer, start_ns, 2 * offset, offset)
+
+        return {
+            "monetization_pass": monetization_pass,
+            "c0_signature": sig_record.signature,
+            "c0_timestamp_ns": sig_record.timestamp_ns,
+            "ciphertext_repr": ciphertext_repr,
+            "digest_sha256": digest.hexdigest(),
+            "resource_id": resource_id,
+        }
+
     def sensitive_add_encrypted(
         self,
         a_plain: bytes,
@@ -261,6 +801,8 @@ class SecureService:
         resource_id: str,
         l402_token: Optional[str],
     ) -> Dict[str, Any]:
+        timer = self._timers.get("sensitive_add_encrypted")
+        start_ns = time.perf_counter_ns() if timer is not None and timer.sampled() else 0
         monetization_pass = True
         if l402_token is not None:
             monetization_pass = self.monetization.validate_l402_token(
@@ -274,6 +816,8 @@ class SecureService:
         ct_a = self.fhe_engine.encrypt(a_plain)
         ct_b = self.fhe_engine.encrypt(b_plain)
         ct_sum = self.fhe_engine.eval_add(ct_a, ct_b)
+        if start_ns:
+            self._observe(timer, start_ns, len(combined_payload), len(combined_payload))
 
         return {
             "monetization_pass": monetization_pass,
@@ -285,11 +829,109 @@ class SecureService:
             "resource_id": resource_id,
         }
 
+    def _validate_tokens(self, items: Sequence[Dict[str, Any]]) -> List[bool]:
+        # Each distinct (token, resource) pair is validated once per batch.
+        seen: Dict[Tuple[str, str], bool] = {}
+        passes = []
+        for item in items:
+            token = item.get("l402_token")
+            if token is None:
+                passes.append(True)
+                continue
+            key = (token, item["resource_id"])
+            if key not in seen:
+                seen[key] = self.monetization.validate_l402_token(
+                    token_value=token,
+                    resource_id=item["resource_id"],
+                )
+            passes.append(seen[key])
+        return passes
+
+    def sensitive_transform_batch(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Batched `sensitive_transform`.
+
+        Each item carries `payload`, `context`, `resource_id` and optionally
+        `l402_token`. Results are returned in input order and are identical in
+        shape to the single-item call; all records go to the log as one group.
+        """
+        timer = self._timers.get("sensitive_transform_batch")
+        start_ns = time.perf_counter_ns() if timer is not None and timer.sampled() else 0
+        passes = self._validate_tokens(items)
+        sig_records = self.c0_logger.log_many([(i["payload"], i["context"]) for i in items])
+        ciphertexts = self.fhe_engine.encrypt_many([i["payload"] for i in items])
+        if start_ns:
+            n = sum(len(i["payload"]) for i in items)
+            self._observe(timer, start_ns, 2 * n, n)
+
+        return [
+            {
+                "monetization_pass": monetization_pass,
+                "c0_signature": sig_record.signature,
+                "c0_timestamp_ns": sig_record.timestamp_ns,
+                "ciphertext_repr": repr(ciphertext),
+                "digest_sha256": hashlib.sha256(item["payload"]).hexdigest(),
+                "resource_id": item["resource_id"],
+            }
+            for item, monetization_pass, sig_record, ciphertext in zip(
+                items, passes, sig_records, ciphertexts
+            )
+        ]
+
+    def sensitive_add_batch(self, pairs: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Batched `sensitive_add_encrypted`.
+
+        Each pair carries `a`, `b`, `context`, `resource_id` and optionally
+        `l402_token`.
+        """
+        timer = self._timers.get("sensitive_add_batch")
+        start_ns = time.perf_counter_ns() if timer is not None and timer.sampled() else 0
+        passes = self._validate_tokens(pairs)
+        sig_records = self.c0_logger.log_many([(p["a"] + p["b"], p["context"]) for p in pairs])
+        ciphertexts = self.fhe_engine.encrypt_many(
+            [plain for p in pairs for plain in (p["a"], p["b"])]
+        )
+
+        results = []
+        for idx, (pair, monetization_pass, sig_record) in enumerate(
+            zip(pairs, passes, sig_records)
+        ):
+            ct_a = ciphertexts[2 * idx]
+            ct_b = ciphertexts[2 * idx + 1]
+            ct_sum = self.fhe_engine.eval_add(ct_a, ct_b)
+            results.append(
+                {
+                    "monetization_pass": monetization_pass,
+                    "c0_signature": sig_record.signature,
+                    "c0_timestamp_ns": sig_record.timestamp_ns,
+                    "ciphertext_a_repr": repr(ct_a),
+                    "ciphertext_b_repr": repr(ct_b),
+                    "ciphertext_sum_repr": repr(ct_sum),
+                    "resource_id": pair["resource_id"],
+                }
+            )
+        if start_ns:
+            n = sum(len(p["a"]) + len(p["b"]) for p in pairs)
+            self._observe(timer, start_ns, n, n)
+        return results
+
 
 # =========================
 # CLI APP
 # =========================
 
+# Commands write to `args.out` / read from `args.stdin` when the daemon sets
+# them, so the same handlers serve both local and socket invocations.
+
+def _stdout(args: argparse.Namespace) -> TextIO:
+    return getattr(args, "out", None) or sys.stdout
+
+
+def _stdin(args: argparse.Namespace) -> BinaryIO:
+    return getattr(args, "stdin", None) or sys.stdin.buffer
+
+
 def cmd_create_invoice(args: argparse.Namespace, service: SecureService) -> None:
     invoice = service.monetization.create_invoice(
         amount_sats=args.amount,
@@ -301,13 +943,13 @@ def cmd_create_invoice(args: argparse.Namespace, service: SecureService) -> None
         "description": invoice.description,
         "settled": invoice.settled,
     }
-    sys.stdout.write(json.dumps(output) + "\n")
+    _stdout(args).write(json.dumps(output) + "\n")
 
 
 def cmd_settle_invoice(args: argparse.Namespace, service: SecureService) -> None:
     ok = service.monetization.settle_invoice(invoice_id=args.invoice_id)
     output = {"invoice_id": args.invoice_id, "settled": bool(ok)}
-    sys.stdout.write(json.dumps(output) + "\n")
+    _stdout(args).write(json.dumps(output) + "\n")
 
 
 def cmd_issue_l402(args: argparse.Namespace, service: SecureService) -> None:
@@ -320,33 +962,104 @@ def cmd_issue_l402(args: argparse.Namespace, service: SecureService) -> None:
         "resource_id": token.resource_id,
         "expires_at_ns": token.expires_at_ns,
     }
-    sys.stdout.write(json.dumps(output) + "\n")
+    _stdout(args).write(json.dumps(output) + "\n")
 
 
 def _read_payload_from_args(args: argparse.Namespace) -> bytes:
     if args.input == "-":
-        data = sys.stdin.buffer.read()
+        data = _stdin(args).read()
     else:
         with open(args.input, "rb") as f:
             data = f.read()
     return data
 
 
+def _batch_bytes(record: Dict[str, Any], field: str) -> bytes:
+    # JSONL batch records carry text as `field` or raw bytes as `field_b64`.
+    if f"{field}_b64" in record:
+        return base64.b64decode(record[f"{field}_b64"])
+    return record[field].encode("utf-8")
+
+
+def _iter_batches(args: argparse.Namespace, fields: Tuple[str, ...]):
+    stream = _stdin(args) if args.batch == "-" else open(args.batch, "rb")
+    try:
+        chunk: List[Dict[str, Any]] = []
+        for line in stream:
+            if not line.strip():
+                continue
+            record = json.loads(line.decode("utf-8"))
+            item = {field: _batch_bytes(record, field) for field in fields}
+            item["context"] = record.get("context", args.context)
+            item["resource_id"] = record.get("resource_id", args.resource_id)
+            item["l402_token"] = record.get("l402_token", args.l402_token)
+            if item["context"] is None or item["resource_id"] is None:
+                raise ValueError("Batch record needs context and resource_id")
+            chunk.append(item)
+            if len(chunk) >= args.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if args.batch != "-":
+            stream.close()
+
+
+def _write_jsonl(args: argparse.Namespace, results: List[Dict[str, Any]]) -> None:
+    _stdout(args).write("".join(json.dumps(r) + "\n" for r in results))
+
+
 def cmd_sensitive_transform(args: argparse.Namespace, service: SecureService) -> None:
-    payload = _read_payload_from_args(args)
-    result = service.sensitive_transform(
-        payload=payload,
-        context=args.context,
-        resource_id=args.resource_id,
-        l402_token=args.l402_token,
-    )
-    sys.stdout.write(json.dumps(result) + "\n")
+    if args.batch:
+        for chunk in _iter_batches(args, ("payload",)):
+            _write_jsonl(args, service.sensitive_transform_batch(chunk))
+        return
+    sink = open(args.ciphertext_out, "wb") if args.ciphertext_out else None
+    try:
+        if args.stream:
+            if args.input == "-":
+                result = service.sensitive_transform_stream(
+                    source=_stdin(args),
+                    context=args.context,
+                    resource_id=args.resource_id,
+                    l402_token=args.l402_token,
+                    sink=sink,
+                    chunk_size=args.chunk_size,
+                )
+            else:
+                with open(args.input, "rb") as f:
+                    result = service.sensitive_transform_stream(
+                        source=f,
+                        context=args.context,
+                        resource_id=args.resource_id,
+                        l402_token=args.l402_token,
+                        sink=sink,
+                        chunk_size=args.chunk_size,
+                    )
+        else:
+            payload = _read_payload_from_args(args)
+            result = service.sensitive_transform(
+                payload=payload,
+                context=args.context,
+                resource_id=args.resource_id,
+                l402_token=args.l402_token,
+                sink=sink,
+            )
+    finally:
+        if sink is not None:
+            sink.close()
+    _stdout(args).write(json.dumps(result) + "\n")
 
 
 def cmd_sensitive_add(args: argparse.Namespace, service: SecureService) -> None:
+    if args.batch:
+        for chunk in _iter_batches(args, ("a", "b")):
+            _write_jsonl(args, service.sensitive_add_batch(chunk))
+        return
     a = _read_payload_from_args(args)
     if args.input_b == "-":
-        b = sys.stdin.buffer.read()
+        b = _stdin(args).read()
     else:
         with open(args.input_b, "rb") as f:
             b = f.read()
@@ -357,7 +1070,7 @@ def cmd_sensitive_add(args: argparse.Namespace, service: SecureService) -> None:
         resource_id=args.resource_id,
         l402_token=args.l402_token,
     )
-    sys.stdout.write(json.dumps(result) + "\n")
+    _stdout(args).write(json.dumps(result) + "\n")
 
 
 def cmd_show_log(args: argparse.Namespace, service: SecureService) -> None:
@@ -370,7 +1083,184 @@ def cmd_show_log(args: argparse.Namespace, service: SecureService) -> None:
         }
         for r in records
     ]
-    sys.stdout.write(json.dumps(data) + "\n")
+    _stdout(args).write(json.dumps(data) + "\n")
+
+
+# =========================
+# DAEMON MODE
+# =========================
+
+# Options whose values are file paths; the client resolves them against its
+# own working directory before forwarding argv to the daemon.
+PATH_OPTIONS = ("--input", "--input-b", "--batch", "--ciphertext-out")
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        # One JSON request per line; a connection may pipeline several.
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+            if isinstance(request, dict):
+                response = self.server.dispatch(request)
+            else:
+                response = {"ok": False, "error": "malformed request"}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class HiveDaemon(socketserver.ThreadingUnixStreamServer):
+    """
+    Unix-socket server holding one warm SecureService.
+
+    Requests carry the CLI argv (plus stdin bytes when an option reads '-')
+    and are executed by the regular command handlers. Handler threads run
+    concurrently; service access is serialized by a lock so the logger,
+    keystream cache and token/invoice maps see one request at a time.
+
+    Requests read and write files with the daemon's privileges, so the
+    socket is made owner-only (0600) before it starts listening. A socket
+    left by a daemon that died is replaced; a live one is not.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, service: SecureService) -> None:
+        self.service = service
+        self._parser = build_parser()
+        self._service_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests_served = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self._remove_stale_socket(socket_path)
+        super().__init__(socket_path, _DaemonRequestHandler)
+
+    @staticmethod
+    def _remove_stale_socket(socket_path: str) -> None:
+        try:
+            mode = os.lstat(socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise OSError(errno.EEXIST, f"{socket_path} exists and is not a socket")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+            except ConnectionRefusedError:
+                os.unlink(socket_path)
+                return
+        raise OSError(errno.EADDRINUSE, f"a daemon is already serving on {socket_path}")
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        # Still not listening, so nobody can connect before the chmod.
+        os.chmod(self.server_address, 0o600)
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            args = self._parser.parse_args(request["argv"])
+        except (SystemExit, KeyError):
+            return {"ok": False, "error": "invalid arguments"}
+        if args.command == "serve":
+            return {"ok": False, "error": "serve cannot be forwarded"}
+        args.out = io.StringIO()
+        args.stdin = io.BytesIO(base64.b64decode(request.get("stdin_b64", "")))
+        try:
+            with self._service_lock:
+                args.func(args, self.service)
+        except Exception as exc:
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self.requests_served += 1
+            self.total_latency_ms += latency_ms
+            self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        return {"ok": True, "stdout": args.out.getvalue(), "latency_ms": latency_ms}
+
+    def stats_line(self) -> str:
+        mean = self.total_latency_ms / self.requests_served if self.requests_served else 0.0
+        return (
+            f"requests={self.requests_served} mean_ms={mean:.3f} "
+            f"max_ms={self.max_latency_ms:.3f}"
+        )
+
+
+def _raise_keyboard_interrupt(signum: int, frame: Any) -> None:
+    raise KeyboardInterrupt
+
+
+def cmd_serve(args: argparse.Namespace, service: SecureService) -> None:
+    server = HiveDaemon(args.socket, service)
+    service.monetization.start_background_eviction()
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    startup_ms = (time.perf_counter() - _PROCESS_START) * 1000
+    sys.stderr.write(f"[hive_core] serving on {args.socket} (startup {startup_ms:.1f} ms)\n")
+    sys.stderr.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.monetization.stop_background_eviction()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        sys.stderr.write(f"[hive_core] stopped: {server.stats_line()}\n")
+
+
+def _absolutize_paths(argv: List[str]) -> List[str]:
+    out: List[str] = []
+    expect_path = False
+    for token in argv:
+        if expect_path:
+            out.append(token if token == "-" else os.path.abspath(token))
+            expect_path = False
+            continue
+        opt, eq, value = token.partition("=")
+        if opt in PATH_OPTIONS:
+            if eq:
+                token = f"{opt}={value if value == '-' else os.path.abspath(value)}"
+            else:
+                expect_path = True
+        out.append(token)
+    return out
+
+
+def run_client(socket_path: str, argv: List[str], timing: bool = False) -> int:
+    """Forward a CLI invocation to a running `serve` daemon; returns an exit code."""
+    started = time.perf_counter()
+    request: Dict[str, Any] = {"argv": _absolutize_paths(argv)}
+    if "-" in argv or any(t.endswith("=-") for t in argv):
+        request["stdin_b64"] = base64.b64encode(sys.stdin.buffer.read()).decode("ascii")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reader:
+            response = json.loads(reader.readline())
+
+    if timing:
+        round_trip_ms = (time.perf_counter() - started) * 1000
+        server_ms = response.get("latency_ms", 0.0)
+        sys.stderr.write(f"[hive_core] server_ms={server_ms:.3f} round_trip_ms={round_trip_ms:.3f}\n")
+    if not response.get("ok"):
+        sys.stderr.write(f"error: {response.get('error')}\n")
+        return 1
+    sys.stdout.write(response["stdout"])
+    return 0
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -378,6 +1268,36 @@ def build_parser() -> argparse.ArgumentParser:
         description="Local-only secure app with C=0 logging, FHE stubs, and monetization stubs."
     )
 
+    parser.add_argument(
+        "--connect",
+        type=str,
+        default=None,
+        metavar="SOCKET",
+        help="Send the command to a running 'serve' daemon on this Unix socket",
+    )
+    parser.add_argument(
+        "--stateless-l402",
+        action="store_true",
+        help="Issue self-verifying HMAC L402 tokens instead of stored ones",
+    )
+    parser.add_argument(
+        "--l402-key-file",
+        type=str,
+        default=None,
+        help="File holding the L402 server key; share it to validate tokens across processes",
+    )
+    parser.add_argument(
+        "--state-db",
+        type=str,
+        default=None,
+        help="SQLite file persisting invoices and L402 tokens across runs",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="With --connect, report server and round-trip latency on stderr",
+    )
+
     sub = parser.add_subparsers(dest="command", required=True)
 
     p_inv = sub.add_parser("create-invoice", help="Create Lightning invoice (stub)")
@@ -397,49 +1317,135 @@ def build_parser() -> argparse.ArgumentParser:
     p_st = sub.add_parser(
         "sensitive-transform", help="Run sensitive transform with C=0 log and FHE stub."
     )
-    p_st.add_argument(
+    st_src = p_st.add_mutually_exclusive_group(required=True)
+    st_src.add_argument(
         "--input",
         type=str,
-        required=True,
         help="Input file path or '-' for stdin",
     )
-    p_st.add_argument("--context", type=str, required=True)
-    p_st.add_argument("--resource-id", type=str, required=True)
+    st_src.add_argument(
+        "--batch",
+        type=str,
+        help="JSONL file path or '-' for stdin; one record per line with "
+        "payload or payload_b64 (context/resource_id/l402_token default to the flags)",
+    )
+    p_st.add_argument("--context", type=str, default=None)
+    p_st.add_argument("--resource-id", type=str, default=None)
     p_st.add_argument("--l402-token", type=str, default=None)
-    p_st.set_defaults(func=cmd_sensitive_transform)
+    p_st.add_argument("--batch-size", type=_positive_int, default=1000, help="Records per batch call")
+    p_st.add_argument(
+        "--stream",
+        action="store_true",
+        help="Process the input in chunks with bounded memory",
+    )
+    p_st.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        default=1 << 20,
+        help="Chunk size in bytes for --stream",
+    )
+    p_st.add_argument(
+        "--ciphertext-out",
+        type=str,
+        default=None,
+        help="Optional file path to write the FHE ciphertext to",
+    )
+    p_st.set_defaults(
+        func=cmd_sensitive_transform,
+        single_required=("context", "resource_id"),
+    )
 
     p_sa = sub.add_parser(
         "sensitive-add",
         help="Encrypt two payloads and perform FHE-stub add with C=0 log.",
     )
-    p_sa.add_argument(
+    sa_src = p_sa.add_mutually_exclusive_group(required=True)
+    sa_src.add_argument(
         "--input",
         type=str,
-        required=True,
         help="First input file path or '-' for stdin",
     )
+    sa_src.add_argument(
+        "--batch",
+        type=str,
+        help="JSONL file path or '-' for stdin; one record per line with "
+        "a/a_b64 and b/b_b64 (context/resource_id/l402_token default to the flags)",
+    )
     p_sa.add_argument(
         "--input-b",
         type=str,
-        required=True,
+        default=None,
         help="Second input file path or '-' for stdin",
     )
-    p_sa.add_argument("--context", type=str, required=True)
-    p_sa.add_argument("--resource-id", type=str, required=True)
+    p_sa.add_argument("--context", type=str, default=None)
+    p_sa.add_argument("--resource-id", type=str, default=None)
     p_sa.add_argument("--l402-token", type=str, default=None)
-    p_sa.set_defaults(func=cmd_sensitive_add)
+    p_sa.add_argument("--batch-size", type=_positive_int, default=1000, help="Records per batch call")
+    p_sa.set_defaults(
+        func=cmd_sensitive_add,
+        single_required=("input_b", "context", "resource_id"),
+    )
 
     p_log = sub.add_parser("show-log", help="Show in-memory C=0 log records")
     p_log.set_defaults(func=cmd_show_log)
 
+    p_serve = sub.add_parser(
+        "serve", help="Keep one warm service alive on a local Unix socket"
+    )
+    p_serve.add_argument("--socket", type=str, default="hive_core.sock")
+    p_serve.set_defaults(func=cmd_serve)
+
     return parser
 
 
 def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
+    argv = sys.argv[1:] if argv is None else argv
     args = parser.parse_args(argv)
-    service = SecureService()
-    args.func(args, service)
+    if not getattr(args, "batch", None):
+        missing = [
+            "--" + name.replace("_", "-")
+            for name in getattr(args, "single_required", ())
+            if getattr(args, name) is None
+        ]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+    if args.connect:
+        if args.command == "serve":
+            parser.error("serve cannot be combined with --connect")
+        ignored = [
+            flag
+            for flag, value in (
+                ("--stateless-l402", args.stateless_l402),
+                ("--l402-key-file", args.l402_key_file),
+                ("--state-db", args.state_db),
+            )
+            if value
+        ]
+        if ignored:
+            sys.stderr.write(
+                f"warning: {', '.join(ignored)} ignored with --connect; the daemon uses its own settings\n"
+            )
+        sys.exit(run_client(args.connect, argv, timing=args.timing))
+    server_key = None
+    if args.l402_key_file:
+        with open(args.l402_key_file, "rb") as f:
+            server_key = f.read()
+        if not server_key:
+            parser.error(f"--l402-key-file {args.l402_key_file} is empty")
+    service = SecureService(
+        # main() closes the service on every exit path, so buffering is safe here.
+        c0_logger=CZeroLogger(log_file="c0_log.jsonl", buffered=True),
+        monetization=MonetizationManager(
+            stateless_tokens=args.stateless_l402,
+            server_key=server_key,
+            backend=SQLiteMonetizationBackend(args.state_db) if args.state_db else None,
+        )
+    )
+    try:
+        args.func(args, service)
+    finally:
+        service.close()
 
 
 if __name__ == "__main__":
@@ -2,5 +2,6 @@
 Inference core for Axiom Hive.
 
 Provides a deterministic, state-space style engine that performs local-only
-computation with a fixed-size hidden state vector.
+computation with a fixed-size hidden state vector, plus a memory-mapped
+store (state_store.MmapStateStore) for session state snapshots.
 """
\ No newline at end of file
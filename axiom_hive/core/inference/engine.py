@@ -1,6 +1,15 @@
 import hashlib
 import json
-from typing import Any, Dict, List, Optional
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.canonical import DEFAULT_HASH_CACHE, CanonicalHashCache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; ArrayHybridSSMEngine falls back to array('d')
+    np = None
 
 
 class HybridSSMEngine:
@@ -12,18 +21,18 @@ class HybridSSMEngine:
     object derived from the updated state and the input.
     """
 
-    def __init__(self, hidden_size: int = 128) -> None:
+    def __init__(self, hidden_size: int = 128, hash_cache: Optional[CanonicalHashCache] = None) -> None:
         self.hidden_size = hidden_size
         self._state: List[float] = [0.0 for _ in range(hidden_size)]
+        self._hash_cache = hash_cache or DEFAULT_HASH_CACHE
 
     def _prompt_vector(self, prompt: str) -> List[int]:
-        h = hashlib.sha256(prompt.encode("utf-8")).digest()
+        h = self._hash_cache.text_digest(prompt)
         vec = list(h) * ((self.hidden_size // len(h)) + 1)
         return vec[: self.hidden_size]
 
     def _context_vector(self, context: Dict[str, Any]) -> List[int]:
-        encoded = json.dumps(context, sort_keys=True).encode("utf-8")
-        h = hashlib.sha256(encoded).digest()
+        h = self._hash_cache.json(context)[1]
         vec = list(h) * ((self.hidden_size // len(h)) + 1)
         return vec[: self.hidden_size]
 
@@ -44,7 +53,23 @@ class HybridSSMEngine:
         context_vec = self._context_vector(ctx)
         self._update_state(prompt_vec, context_vec)
         digest = self._state_digest()
+        return self._build_output(prompt, ctx, digest)
+
+    def snapshot(self, store: Any, session_id: str) -> None:
+        """Persist the hidden state under `session_id` (see MmapStateStore)."""
+        store.store(session_id, self._state)
 
+    def restore(self, store: Any, session_id: str) -> bool:
+        values = store.load(session_id)
+        if values is None:
+            return False
+        self._state = self._coerce_state(values)
+        return True
+
+    def _coerce_state(self, values: Sequence[float]) -> Any:
+        return [float(x) for x in values]
+
+    def _build_output(self, prompt: str, ctx: Dict[str, Any], digest: str) -> Dict[str, Any]:
         summary = {
             "prompt_length": len(prompt),
             "context_keys": sorted(list(ctx.keys())),
@@ -64,6 +89,229 @@ class HybridSSMEngine:
         }
 
 
+class ArrayHybridSSMEngine(HybridSSMEngine):
+    """
+    Array-backed HybridSSMEngine for large hidden sizes.
+
+    State is a float64 NumPy ndarray (or `array('d')` without NumPy) and the
+    prompt/context expansion and state update are whole-vector operations.
+    The update keeps the reference evaluation order,
+    (s * 0.7 + p * 0.2) + c * 0.1, so states are bit-identical to
+    HybridSSMEngine.
+
+    Digest modes:
+    - "compat": hashes the ",".join(f"{x:.6f}") rendering, reproducing
+      HybridSSMEngine's state_digest bit for bit
+    - "raw": hashes the little-endian float64 state bytes (faster; digests
+      differ from compat mode but are equally deterministic)
+    """
+
+    DIGEST_MODES = ("compat", "raw")
+
+    def __init__(
+        self,
+        hidden_size: int = 128,
+        digest_mode: str = "compat",
+        use_numpy: Optional[bool] = None,
+        hash_cache: Optional[CanonicalHashCache] = None,
+    ) -> None:
+        if digest_mode not in self.DIGEST_MODES:
+            raise ValueError(f"Unsupported digest mode: {digest_mode}")
+        if use_numpy and np is None:
+            raise ValueError("NumPy requested but numpy is not installed")
+        self.hidden_size = hidden_size
+        self._hash_cache = hash_cache or DEFAULT_HASH_CACHE
+        self.digest_mode = digest_mode
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        self._state = self._zeros()
+        # Fixed "%.6f,%.6f,..." template: one C-level format call per digest.
+        self._compat_template = ",".join(["%.6f"] * hidden_size)
+
+    def _zeros(self):
+        if self.use_numpy:
+            return np.zeros(self.hidden_size, dtype=np.float64)
+        return array("d", bytes(8 * self.hidden_size))
+
+    def _coerce_state(self, values: Sequence[float]) -> Any:
+        if self.use_numpy:
+            return np.asarray(values, dtype=np.float64)
+        return array("d", values)
+
+    def _expand(self, digest: bytes):
+        tiled = (digest * (self.hidden_size // len(digest) + 1))[: self.hidden_size]
+        if self.use_numpy:
+            return np.frombuffer(tiled, dtype=np.uint8).astype(np.float64)
+        return array("d", list(tiled))
+
+    def _prompt_vector(self, prompt: str):
+        return self._expand(self._hash_cache.text_digest(prompt))
+
+    def _context_vector(self, context: Dict[str, Any]):
+        return self._expand(self._hash_cache.json(context)[1])
+
+    def _update_state(self, prompt_vec: Sequence[float], context_vec: Sequence[float]) -> None:
+        self._state = self._next_state(self._state, prompt_vec, context_vec)
+
+    def _next_state(self, state, prompt_vec, context_vec):
+        # Works row-wise or on stacked (sessions x hidden_size) matrices.
+        if self.use_numpy:
+            return (state * 0.7 + prompt_vec * 0.2) + context_vec * 0.1
+        return array(
+            "d",
+            [
+                (s * 0.7 + p * 0.2) + c * 0.1
+                for s, p, c in zip(state, prompt_vec, context_vec)
+            ],
+        )
+
+    def _state_digest(self) -> str:
+        return self._digest_of(self._state)
+
+    def _digest_of(self, state) -> str:
+        if self.digest_mode == "raw":
+            return hashlib.sha256(self._raw_bytes(state)).hexdigest()
+        buf = (self._compat_template % tuple(state.tolist())).encode("utf-8")
+        return hashlib.sha256(buf).hexdigest()
+
+    def _state_bytes(self) -> bytes:
+        return self._raw_bytes(self._state)
+
+    def _raw_bytes(self, state) -> bytes:
+        if self.use_numpy:
+            return state.astype("<f8", copy=False).tobytes()
+        state = array("d", state)
+        if sys.byteorder == "big":
+            state.byteswap()
+        return state.tobytes()
+
+
+class BatchedHybridSSMEngine(ArrayHybridSSMEngine):
+    """
+    Multi-session engine over a (sessions x hidden_size) state matrix.
+
+    `open_session()` returns an integer handle (a matrix row). `generate_batch`
+    takes (handle, prompt, context) requests and updates all distinct
+    sessions in one vectorized step; a session repeated within a batch is
+    applied in a later step so its updates stay in request order. Outputs are
+    identical to calling `generate` sequentially on one engine per session.
+    """
+
+    def __init__(
+        self,
+        hidden_size: int = 128,
+        digest_mode: str = "compat",
+        use_numpy: Optional[bool] = None,
+        initial_sessions: int = 64,
+        hash_cache: Optional[CanonicalHashCache] = None,
+    ) -> None:
+        super().__init__(
+            hidden_size=hidden_size,
+            digest_mode=digest_mode,
+            use_numpy=use_numpy,
+            hash_cache=hash_cache,
+        )
+        self._capacity = max(1, initial_sessions)
+        self._states = self._zeros_matrix(self._capacity)
+        self._free: List[int] = []
+        self._next_row = 0
+
+    def _zeros_matrix(self, rows: int):
+        if self.use_numpy:
+            return np.zeros((rows, self.hidden_size), dtype=np.float64)
+        return [self._zeros() for _ in range(rows)]
+
+    def _grow(self) -> None:
+        extra = self._zeros_matrix(self._capacity)
+        if self.use_numpy:
+            self._states = np.concatenate([self._states, extra])
+        else:
+            self._states.extend(extra)
+        self._capacity *= 2
+
+    def open_session(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._next_row == self._capacity:
+            self._grow()
+        handle = self._next_row
+        self._next_row += 1
+        return handle
+
+    def close_session(self, handle: int) -> None:
+        self._check_handle(handle)
+        self._states[handle] = self._zeros()
+        self._free.append(handle)
+
+    def _check_handle(self, handle: int) -> None:
+        if not 0 <= handle < self._next_row or handle in self._free:
+            raise KeyError(f"Unknown session handle: {handle}")
+
+    def session_state(self, handle: int):
+        """Copy of one session's hidden state."""
+        self._check_handle(handle)
+        return self._states[handle].copy() if self.use_numpy else array("d", self._states[handle])
+
+    def load_session_state(self, handle: int, state: Sequence[float]) -> None:
+        self._check_handle(handle)
+        self._states[handle] = self._coerce_state(state)
+
+    def save_session(self, handle: int, store: Any, session_id: str) -> None:
+        self._check_handle(handle)
+        store.store(session_id, self._states[handle])
+
+    def restore_session(self, store: Any, session_id: str) -> Optional[int]:
+        """Open a session initialised from `store`; None if `session_id` is absent."""
+        values = store.load(session_id)
+        if values is None:
+            return None
+        handle = self.open_session()
+        self._states[handle] = self._coerce_state(values)
+        return handle
+
+    def generate_batch(
+        self,
+        requests: Sequence[Tuple[int, str, Optional[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        for handle, _, _ in requests:
+            self._check_handle(handle)
+        outputs: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        pending = list(range(len(requests)))
+        while pending:
+            # One step takes the earliest pending request of each session.
+            step: List[int] = []
+            later: List[int] = []
+            seen = set()
+            for idx in pending:
+                handle = requests[idx][0]
+                (later if handle in seen else step).append(idx)
+                seen.add(handle)
+            self._step(requests, step, outputs)
+            pending = later
+        return outputs  # type: ignore[return-value]
+
+    def _step(
+        self,
+        requests: Sequence[Tuple[int, str, Optional[Dict[str, Any]]]],
+        step: List[int],
+        outputs: List[Optional[Dict[str, Any]]],
+    ) -> None:
+        rows = [requests[idx][0] for idx in step]
+        ctxs = [requests[idx][2] or {} for idx in step]
+        prompt_vecs = [self._prompt_vector(requests[idx][1]) for idx in step]
+        context_vecs = [self._context_vector(ctx) for ctx in ctxs]
+        if self.use_numpy:
+            sub = self._next_state(self._states[rows], np.stack(prompt_vecs), np.stack(context_vecs))
+            self._states[rows] = sub
+            new_states = list(sub)
+        else:
+            new_states = []
+            for row, p_vec, c_vec in zip(rows, prompt_vecs, context_vecs):
+                self._states[row] = self._next_state(self._states[row], p_vec, c_vec)
+                new_states.append(self._states[row])
+        for idx, ctx, state in zip(step, ctxs, new_states):
+            outputs[idx] = self._build_output(requests[idx][1], ctx, self._digest_of(state))
+
+
 def run_engine_example() -> None:
     engine = HybridSSMEngine()
     output = engine.generate("Verify: 2+2=4", {"task": "math-check"})
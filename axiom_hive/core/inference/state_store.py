@@ -0,0 +1,230 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; views fall back to memoryview casts
+    np = None
+
+
+class MmapStateStore:
+    """
+    Memory-mapped, fixed-record store of engine hidden states.
+
+    The file is an open-addressing hash table of `capacity` slots keyed by
+    session id. Every slot has the same size, so a session's record is found
+    by hashing its id and probing a few slots, O(1) on average. States are
+    stored as float64 or, with dtype="float32", in half the space; float32
+    snapshots are lossy and restore only approximately.
+
+    Many processes may map the same file. Writers serialize on an flock;
+    readers are lock-free and use a per-slot sequence counter (odd while a
+    write is in progress) to detect and retry torn reads.
+
+    Layout:
+    - header (64 bytes): magic, hidden_size, capacity, dtype code
+    - slots: 16-byte key digest, uint64 sequence, 8 pad bytes, state values
+    """
+
+    MAGIC = b"AXSTATE1"
+    HEADER = struct.Struct("<8sIIc47x")
+    SLOT_HEADER = 32
+    EMPTY = b"\x00" * 16
+    TOMBSTONE = b"\xff" * 16
+    DTYPES = {"float64": b"d", "float32": b"f"}
+    READ_RETRIES = 64
+
+    def __init__(
+        self,
+        path: str,
+        hidden_size: int = 128,
+        capacity: int = 4096,
+        dtype: str = "float64",
+        readonly: bool = False,
+    ) -> None:
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported state dtype: {dtype}")
+        self.path = path
+        self.readonly = readonly
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            if readonly:
+                raise FileNotFoundError(path)
+            self._create(path, hidden_size, capacity, self.DTYPES[dtype])
+        self._fd = os.open(path, os.O_RDONLY if readonly else os.O_RDWR)
+        access = mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._fd, 0, access=access)
+        magic, self.hidden_size, self.capacity, code = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} is not a state store")
+        # An existing file keeps its own geometry; a caller asking for another
+        # one would silently get different precision or capacity.
+        if self.hidden_size != hidden_size:
+            raise ValueError(
+                f"State store hidden_size {self.hidden_size} != requested {hidden_size}"
+            )
+        if self.capacity != capacity:
+            raise ValueError(f"State store capacity {self.capacity} != requested {capacity}")
+        if code != self.DTYPES[dtype]:
+            raise ValueError(f"State store dtype {code.decode('ascii')!r} != requested {dtype!r}")
+        self.typecode = code.decode("ascii")
+        self.dtype = "float64" if self.typecode == "d" else "float32"
+        self._itemsize = 8 if self.typecode == "d" else 4
+        # Pad records to 8 bytes so every state view is aligned.
+        state_bytes = self.hidden_size * self._itemsize
+        self.record_size = self.SLOT_HEADER + (state_bytes + 7) // 8 * 8
+        self._slots: Dict[str, int] = {}
+
+    def _create(self, path: str, hidden_size: int, capacity: int, code: bytes) -> None:
+        itemsize = 8 if code == b"d" else 4
+        record_size = self.SLOT_HEADER + (hidden_size * itemsize + 7) // 8 * 8
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, hidden_size, capacity, code))
+            f.truncate(self.HEADER.size + capacity * record_size)
+        try:
+            # Atomic publish; a concurrent creator's identical file is kept.
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp)
+
+    # -- slot addressing --
+
+    @staticmethod
+    def _key(session_id: str) -> bytes:
+        return hashlib.sha256(session_id.encode("utf-8")).digest()[:16]
+
+    def _offset(self, slot: int) -> int:
+        return self.HEADER.size + slot * self.record_size
+
+    def _slot_key(self, slot: int) -> bytes:
+        off = self._offset(slot)
+        return self._mm[off : off + 16]
+
+    def _seq(self, slot: int) -> int:
+        return struct.unpack_from("<Q", self._mm, self._offset(slot) + 16)[0]
+
+    def _find(self, session_id: str, for_insert: bool = False) -> Optional[int]:
+        key = self._key(session_id)
+        cached = self._slots.get(session_id)
+        if cached is not None and self._slot_key(cached) == key:
+            return cached
+        start = int.from_bytes(key[:8], "little") % self.capacity
+        reusable = None
+        for probe in range(self.capacity):
+            slot = (start + probe) % self.capacity
+            slot_key = self._slot_key(slot)
+            if slot_key == key:
+                self._slots[session_id] = slot
+                return slot
+            if slot_key == self.TOMBSTONE:
+                if reusable is None:
+                    reusable = slot
+                continue
+            if slot_key == self.EMPTY:
+                return (reusable if reusable is not None else slot) if for_insert else None
+        return reusable if for_insert else None
+
+    # -- writes (flock-serialized across processes) --
+
+    def store(self, session_id: str, state: Sequence[float]) -> None:
+        if len(state) != self.hidden_size:
+            raise ValueError("State length does not match hidden_size")
+        if np is not None and isinstance(state, np.ndarray):
+            payload = state.astype("<" + self.typecode, copy=False).tobytes()
+        else:
+            values = array(self.typecode, state)
+            if sys.byteorder == "big":
+                values.byteswap()
+            payload = values.tobytes()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            slot = self._find(session_id, for_insert=True)
+            if slot is None:
+                raise ValueError("State store is full")
+            off = self._offset(slot)
+            seq = self._seq(slot)
+            struct.pack_into("<Q", self._mm, off + 16, seq + 1)
+            self._mm[off + self.SLOT_HEADER : off + self.SLOT_HEADER + len(payload)] = payload
+            self._mm[off : off + 16] = self._key(session_id)
+            struct.pack_into("<Q", self._mm, off + 16, seq + 2)
+            self._slots[session_id] = slot
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def delete(self, session_id: str) -> bool:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            slot = self._find(session_id)
+            if slot is None:
+                return False
+            off = self._offset(slot)
+            seq = self._seq(slot)
+            struct.pack_into("<Q", self._mm, off + 16, seq + 1)
+            self._mm[off : off + 16] = self.TOMBSTONE
+            struct.pack_into("<Q", self._mm, off + 16, seq + 2)
+            self._slots.pop(session_id, None)
+            return True
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    # -- reads (lock-free) --
+
+    def view(self, session_id: str):
+        """
+        Zero-copy view of a stored state (ndarray with NumPy, else memoryview).
+
+        The view aliases the mapping, so it reflects later writes and is not
+        protected against concurrent ones; use `load` for a consistent copy.
+        Release views before `close()`.
+        """
+        slot = self._find(session_id)
+        if slot is None:
+            return None
+        off = self._offset(slot) + self.SLOT_HEADER
+        if np is not None:
+            return np.frombuffer(
+                self._mm, dtype="<" + self.typecode, count=self.hidden_size, offset=off
+            )
+        nbytes = self.hidden_size * self._itemsize
+        return memoryview(self._mm)[off : off + nbytes].cast(self.typecode)
+
+    def load(self, session_id: str) -> Optional[array]:
+        """Consistent float64 copy of a stored state, or None if absent."""
+        for attempt in range(self.READ_RETRIES):
+            if attempt:
+                # Let a preempted writer finish; on one core spinning cannot.
+                os.sched_yield()
+            slot = self._find(session_id)
+            if slot is None:
+                return None
+            before = self._seq(slot)
+            if before % 2:
+                continue
+            off = self._offset(slot) + self.SLOT_HEADER
+            raw = self._mm[off : off + self.hidden_size * self._itemsize]
+            if self._seq(slot) == before and self._slot_key(slot) == self._key(session_id):
+                values = array(self.typecode)
+                values.frombytes(raw)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                return values if self.typecode == "d" else array("d", values)
+        raise RuntimeError(f"State for {session_id!r} kept changing during read")
+
+    def __contains__(self, session_id: str) -> bool:
+        return self._find(session_id) is not None
+
+    def flush(self) -> None:
+        if not self.readonly:
+            self._mm.flush()
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
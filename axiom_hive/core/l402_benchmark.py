@@ -0,0 +1,48 @@
+import time
+
+from core.hive_core import MonetizationManager
+
+# L402_Validation_Benchmark: stored-token lookup vs stateless HMAC tokens
+
+TOKENS = 10_000
+VALIDATIONS = 200_000
+
+
+# 1. Issue a pool of tokens with each strategy
+def _issue(manager, n):
+    return [manager.issue_l402_token(f"res_{i % 64}", ttl_seconds=3600) for i in range(n)]
+
+
+# 2. Validate round-robin over the pool and report validations per second
+def _validate_rate(manager, tokens, n):
+    start = time.perf_counter()
+    ok = 0
+    for i in range(n):
+        t = tokens[i % len(tokens)]
+        ok += manager.validate_l402_token(t.token, t.resource_id)
+    elapsed = time.perf_counter() - start
+    return n / elapsed, ok == n
+
+
+def run_benchmark(tokens=TOKENS, validations=VALIDATIONS):
+    rows = []
+    for label, stateless in (("dict store", False), ("stateless HMAC", True)):
+        manager = MonetizationManager(stateless_tokens=stateless, server_key=b"bench-key")
+        start = time.perf_counter()
+        pool = _issue(manager, tokens)
+        issue_rate = tokens / (time.perf_counter() - start)
+        rate, all_valid = _validate_rate(manager, pool, validations)
+        # Only stateless tokens validate in a fresh manager sharing the key
+        peer = MonetizationManager(server_key=b"bench-key")
+        portable = peer.validate_l402_token(pool[0].token, pool[0].resource_id)
+        rows.append((label, issue_rate, rate, all_valid, portable))
+    return rows
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    print(f"\n--- L402 Validation Benchmark ({VALIDATIONS:,} validations) ---")
+    print("| Strategy | Issued/s | Validations/s | All valid | Valid in peer process |")
+    print("|---|---|---|---|---|")
+    for label, issue_rate, rate, all_valid, portable in run_benchmark():
+        print(f"| {label} | {issue_rate:,.0f} | {rate:,.0f} | {all_valid} | {portable} |")
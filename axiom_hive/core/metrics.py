@@ -0,0 +1,441 @@
+import itertools
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Latency targets from PROJECT_ARCHITECTURE.md ("Performance Targets"), p99 in ms.
+TARGETS_MS = {
+    "omega.inference": 100.0,
+    "verifier.verify": 50.0,
+    "c0.sign": 10.0,
+}
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of non-negative integer values (ns).
+
+    Values below 2**significant_bits are counted exactly; larger values go
+    to one of 2**significant_bits linear sub-buckets of their power of two,
+    so any reported value is within 2**-significant_bits of the true one.
+    Each recording thread gets its own fixed-size bucket array, so
+    `record` takes no lock; readers merge the per-thread arrays, and the
+    arrays of threads that have exited are folded into one when a new
+    thread starts recording. With `sample_every` > 1 callers record only
+    when `sampled()` is true (one call in that many) and reported counts
+    and totals are scaled up.
+    """
+
+    def __init__(self, significant_bits: int = 5, sample_every: int = 1) -> None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.significant_bits = significant_bits
+        self.sample_every = sample_every
+        self._sub = 1 << significant_bits
+        self._size = (64 - significant_bits) * self._sub
+        self._local = threading.local()
+        # Per-thread (owner, bucket counts, [total, max]).
+        self._shards: List[Tuple[threading.Thread, List[int], List[int]]] = []
+        # Folded shards of exited threads.
+        self._retired: Tuple[List[int], List[int]] = ([0] * self._size, [0, 0])
+        self._lock = threading.Lock()
+        self.record = self._recorder()
+        # A C-level bound method, so asking costs no Python frame; next() on
+        # a C iterator is atomic under the GIL.
+        self.sampled: Callable[[], bool] = itertools.cycle((True,) + (False,) * (sample_every - 1)).__next__
+
+    def _index(self, value: int) -> int:
+        if value < self._sub:
+            return value
+        exp = value.bit_length() - self.significant_bits - 1
+        return (exp + 1) * self._sub + (value >> exp) - self._sub
+
+    def _lower(self, index: int) -> int:
+        if index < self._sub:
+            return index
+        exp = index // self._sub - 1
+        return (index % self._sub + self._sub) << exp
+
+    def _upper(self, index: int) -> int:
+        if index < self._sub:
+            return index
+        exp = index // self._sub - 1
+        return ((index % self._sub + self._sub + 1) << exp) - 1
+
+    def _new_shard(self) -> Tuple[List[int], List[int]]:
+        shard = ([0] * self._size, [0, 0])
+        with self._lock:
+            self._reclaim()
+            self._shards.append((threading.current_thread(),) + shard)
+        self._local.shard = shard
+        return shard
+
+    def _reclaim(self) -> None:
+        # Caller holds the lock. An exited thread no longer writes its shard.
+        retired_counts, retired_stats = self._retired
+        live = []
+        for thread, counts, stats in self._shards:
+            if thread.is_alive():
+                live.append((thread, counts, stats))
+                continue
+            for i, c in enumerate(counts):
+                if c:
+                    retired_counts[i] += c
+            retired_stats[0] += stats[0]
+            retired_stats[1] = max(retired_stats[1], stats[1])
+        self._shards = live
+
+    def _recorder(self) -> Callable[[int], None]:
+        # A closure over locals: attribute lookups are most of a call's cost.
+        local, new_shard = self._local, self._new_shard
+        sub, shift = self._sub, self.significant_bits + 1
+
+        def record(value: int) -> None:
+            try:
+                counts, stats = local.shard
+            except AttributeError:
+                counts, stats = new_shard()
+            if value < sub:
+                counts[value] += 1
+            else:
+                exp = value.bit_length() - shift
+                counts[(exp + 1) * sub + (value >> exp) - sub] += 1
+            stats[0] += value
+            if value > stats[1]:
+                stats[1] = value
+
+        return record
+
+    def _merged(self) -> Tuple[List[int], int, int, int, int]:
+        with self._lock:
+            shards = [self._retired] + [(counts, stats) for _, counts, stats in self._shards]
+        counts = [0] * self._size
+        total = high = 0
+        every = self.sample_every
+        for shard_counts, (t, mx) in shards:
+            for i, c in enumerate(shard_counts):
+                if c:
+                    counts[i] += c * every
+            total += t * every
+            high = max(high, mx)
+        count = sum(counts)
+        low = next((self._lower(i) for i, c in enumerate(counts) if c), 0)
+        return counts, count, total, high, low
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            recorded = sum(self._retired[0]) + sum(sum(counts) for _, counts, _ in self._shards)
+        return recorded * self.sample_every
+
+    def summary(self, quantiles: Tuple[float, ...] = (0.5, 0.9, 0.99)) -> Dict[str, Any]:
+        """count, total, min (bucket lower bound), max and the upper bucket bound of each quantile."""
+        counts, count, total, high, low = self._merged()
+        values = {}
+        for q in quantiles:
+            rank = max(1, int(q * count + 0.5))
+            seen = 0
+            values[q] = 0
+            if count:
+                for index, n in enumerate(counts):
+                    seen += n
+                    if seen >= rank:
+                        values[q] = min(self._upper(index), high)
+                        break
+        return {"count": count, "total": total, "min": low, "max": high, "quantiles": values}
+
+    def percentile(self, q: float) -> int:
+        return self.summary((q,))["quantiles"][q]
+
+    def cumulative(self, bounds: List[int]) -> Tuple[List[int], int, int]:
+        """(counts of values below each bound, count, total); bounds are ascending powers of two."""
+        counts, count, total, _high, _low = self._merged()
+        out = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            limit = self._index(bound)
+            while index < limit:
+                seen += counts[index]
+                index += 1
+            out.append(seen)
+        return out, count, total
+
+    def reset(self) -> None:
+        with self._lock:
+            for counts, stats in [self._retired] + [shard[1:] for shard in self._shards]:
+                counts[:] = [0] * self._size
+                stats[:] = [0, 0]
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a daemon thread samples every other thread's
+    stack each `interval_seconds` and counts the folded stacks
+    ("outer;...;inner" of file:function:line), the input format of
+    flamegraph tools. The sampled threads run uninstrumented.
+    """
+
+    def __init__(self, interval_seconds: float = 0.005, max_depth: int = 32) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_depth = max_depth
+        self.samples: "Counter[str]" = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_filename}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def top(self, n: int = 20) -> List[Tuple[str, int]]:
+        """Most frequently sampled innermost frames."""
+        leaves: "Counter[str]" = Counter()
+        for stack, count in list(self.samples.items()):
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.samples.items()))
+
+
+class MetricsRegistry:
+    """
+    Stage latency histograms and byte counters for the Axiom Hive pipeline.
+
+    Components take an optional `metrics` registry; with one, they replace
+    their stage methods on the instance with timed wrappers (`wrap`), and
+    without one nothing changes, so disabled metrics cost nothing. Timers
+    use the monotonic perf_counter_ns clock and, like counters, record
+    into per-thread shards without locking. `sample_every` times one call
+    in that many (counts are scaled back up), which keeps timer overhead
+    small on microsecond-scale operations. Counters stay exact, except
+    the bytes SecureService counts on its sampled calls, which are scaled
+    the same way. Export with `to_json` or `to_prometheus`.
+    """
+
+    def __init__(
+        self,
+        significant_bits: int = 5,
+        targets_ms: Optional[Dict[str, float]] = None,
+        sample_every: int = 1,
+    ) -> None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.significant_bits = significant_bits
+        self.targets_ms = dict(TARGETS_MS if targets_ms is None else targets_ms)
+        self.sample_every = sample_every
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.profiler: Optional[SamplingProfiler] = None
+        self._local = threading.local()
+        # Per-thread (owner, counters); shards of exited threads fold into _retired.
+        self._counter_shards: List[Tuple[threading.Thread, Dict[str, int]]] = []
+        self._retired: Dict[str, int] = {}
+        # Counters read at export time (e.g. bytes a log store has written).
+        self._collectors: List[Callable[[], Dict[str, int]]] = []
+        self._lock = threading.Lock()
+
+    # -- recording --
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        with self._lock:
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = LatencyHistogram(self.significant_bits, self.sample_every)
+            return hist
+
+    def observe_ns(self, stage: str, ns: int) -> None:
+        self.histogram(stage).record(ns)
+
+    def add(self, counter: str, n: int = 1) -> None:
+        try:
+            counts = self._local.counters
+        except AttributeError:
+            counts = self._local.counters = {}
+            with self._lock:
+                self._reclaim()
+                self._counter_shards.append((threading.current_thread(), counts))
+        counts[counter] = counts.get(counter, 0) + n
+
+    def _reclaim(self) -> None:
+        # Caller holds the lock.
+        live = []
+        for thread, counts in self._counter_shards:
+            if thread.is_alive():
+                live.append((thread, counts))
+                continue
+            for counter, n in counts.items():
+                self._retired[counter] = self._retired.get(counter, 0) + n
+        self._counter_shards = live
+
+    def collect(self, collector: Callable[[], Dict[str, int]]) -> None:
+        """Register `collector`, whose counters are added to every export."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            shards = [dict(self._retired)] + [dict(shard) for _, shard in self._counter_shards]
+            collectors = list(self._collectors)
+        totals: Dict[str, int] = {}
+        for shard in shards + [collector() for collector in collectors]:
+            for counter, n in shard.items():
+                totals[counter] = totals.get(counter, 0) + n
+        return totals
+
+    def wrap(self, stage: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """`fn` timed into the `stage` histogram (one call in `sample_every`)."""
+        hist = self.histogram(stage)
+        record, sampled = hist.record, hist.sampled
+        clock = time.perf_counter_ns
+
+        if self.sample_every == 1:
+
+            def timed(*args: Any, **kwargs: Any) -> Any:
+                start = clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    record(clock() - start)
+
+        else:
+
+            def timed(*args: Any, **kwargs: Any) -> Any:
+                if not sampled():
+                    return fn(*args, **kwargs)
+                start = clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    record(clock() - start)
+
+        timed.__wrapped__ = fn  # type: ignore[attr-defined]
+        return timed
+
+    def timer(self, stage: str) -> "_Timer":
+        return _Timer(self.histogram(stage))
+
+    # -- profiler hook --
+
+    def start_profiler(self, interval_seconds: float = 0.005) -> SamplingProfiler:
+        if self.profiler is None:
+            self.profiler = SamplingProfiler(interval_seconds)
+        self.profiler.start()
+        return self.profiler
+
+    def stop_profiler(self) -> None:
+        if self.profiler is not None:
+            self.profiler.stop()
+
+    # -- export --
+
+    def reset(self) -> None:
+        """Zero every histogram and recorded counter (collectors are live and unaffected)."""
+        with self._lock:
+            histograms = list(self.histograms.values())
+            self._retired.clear()
+            for _, shard in self._counter_shards:
+                shard.clear()
+        for hist in histograms:
+            hist.reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = dict(self.histograms)
+        stages = {}
+        for stage, hist in sorted(histograms.items()):
+            s = hist.summary()
+            if not s["count"]:
+                continue
+            stages[stage] = {
+                "count": s["count"],
+                "mean_ms": s["total"] / s["count"] / 1e6,
+                "p50_ms": s["quantiles"][0.5] / 1e6,
+                "p90_ms": s["quantiles"][0.9] / 1e6,
+                "p99_ms": s["quantiles"][0.99] / 1e6,
+                "max_ms": s["max"] / 1e6,
+            }
+        targets = {
+            stage: {
+                "target_p99_ms": target,
+                "p99_ms": stages[stage]["p99_ms"],
+                "ok": stages[stage]["p99_ms"] < target,
+            }
+            for stage, target in self.targets_ms.items()
+            if stage in stages
+        }
+        snap: Dict[str, Any] = {"stages": stages, "counters": self.counters, "targets": targets}
+        if self.profiler is not None:
+            snap["profile_top"] = self.profiler.top()
+        return snap
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.snapshot(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "axiom") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            histograms = dict(self.histograms)
+        # Power-of-two bounds from ~1 us to ~34 s; HDR buckets never straddle them.
+        bounds = [1 << k for k in range(10, 36)]
+        lines = [
+            f"# HELP {prefix}_stage_seconds Stage latency.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, hist in sorted(histograms.items()):
+            label = f'stage="{stage}"'
+            below, count, total = hist.cumulative(bounds)
+            if not count:
+                continue
+            for bound, n in zip(bounds, below):
+                lines.append(f'{prefix}_stage_seconds_bucket{{{label},le="{bound / 1e9:.9g}"}} {n}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{prefix}_stage_seconds_sum{{{label}}} {total / 1e9:.9g}")
+            lines.append(f"{prefix}_stage_seconds_count{{{label}}} {count}")
+        for counter, value in sorted(self.counters.items()):
+            name = f"{prefix}_{counter.replace('.', '_')}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class _Timer:
+    __slots__ = ("_hist", "_start")
+
+    def __init__(self, hist: LatencyHistogram) -> None:
+        self._hist = hist
+        self._start = -1
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter_ns() if self._hist.sampled() else -1
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._start >= 0:
+            self._hist.record(time.perf_counter_ns() - self._start)
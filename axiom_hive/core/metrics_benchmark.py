@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+from core.hive_core import CZeroLogger, SecureService
+from core.inference.engine import HybridSSMEngine
+from core.metrics import MetricsRegistry
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+
+# Metrics_Benchmark: instrumentation overhead, metrics off vs on vs on + sampling profiler
+
+REQUESTS = 3000
+ROUNDS = 5
+PAYLOAD_BYTES = 4096
+SAMPLE_EVERY = 16
+
+
+# 1. Workloads: OmegaSwarm verified-mode execute and SecureService.sensitive_transform
+def swarm_workload(metrics, n):
+    with tempfile.TemporaryDirectory() as log_dir:
+        swarm = OmegaSwarm(
+            HybridSSMEngine(128),
+            TLAVerifier(metrics=metrics),
+            C0Logger(log_dir, metrics=metrics),
+            LocalDeoxysCKKS(),
+            metrics=metrics,
+        )
+        start = time.perf_counter()
+        for i in range(n):
+            swarm.execute("verified", f"Verify: {i}+{i}={2 * i}", {"request": i})
+        elapsed = time.perf_counter() - start
+        snapshot = metrics.snapshot() if metrics is not None else None
+        swarm.c0.close()
+    return elapsed, snapshot
+
+
+def secure_workload(metrics, n):
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger = CZeroLogger(secret_key=b"bench", log_file=os.path.join(log_dir, "c0.jsonl"), buffered=True)
+        svc = SecureService(c0_logger=logger, metrics=metrics)
+        payload = bytes(range(256)) * (PAYLOAD_BYTES // 256)
+        start = time.perf_counter()
+        for i in range(n):
+            svc.sensitive_transform(payload, f"ctx-{i}", "res", None)
+        elapsed = time.perf_counter() - start
+        svc.close()
+        snapshot = metrics.snapshot() if metrics is not None else None
+    return elapsed, snapshot
+
+
+# 2. Best of ROUNDS interleaved runs per configuration (noise floor of a shared box)
+def measure(workload, n=REQUESTS, rounds=ROUNDS):
+    sampled = f"on, timers 1/{SAMPLE_EVERY}"
+    configs = ("off", "on", sampled, "on + profiler")
+    best = {c: float("inf") for c in configs}
+    last = None
+    for _ in range(rounds):
+        for config in configs:
+            if config == "off":
+                metrics = None
+            else:
+                metrics = MetricsRegistry(sample_every=SAMPLE_EVERY if config == sampled else 1)
+            if config == "on + profiler":
+                metrics.start_profiler(0.01)
+            elapsed, snapshot = workload(metrics, n)
+            best[config] = min(best[config], elapsed)
+            if metrics is not None:
+                metrics.stop_profiler()
+                last = snapshot
+    base = best["off"]
+    return [(c, n / best[c], (best[c] - base) / base * 100) for c in configs], last
+
+
+# 3. Per-call cost of the primitives (stable where whole-workload runs are noisy)
+def primitive_costs(calls=200_000):
+    metrics = MetricsRegistry()
+    bare = lambda x: x  # noqa: E731
+    timed = metrics.wrap("bench", bare)
+    sampled = MetricsRegistry(sample_every=SAMPLE_EVERY).wrap("bench", bare)
+    record = metrics.histogram("bench").record
+    rows = []
+    for label, stmt in (
+        ("bare call", lambda: bare(1)),
+        ("wrapped call", lambda: timed(1)),
+        (f"wrapped call, timed 1/{SAMPLE_EVERY}", lambda: sampled(1)),
+        ("histogram record", lambda: record(1000)),
+        ("counter add", lambda: metrics.add("bench", 1)),
+    ):
+        rows.append((label, min(timeit.repeat(stmt, number=calls, repeat=5)) / calls * 1e9))
+    return rows
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else REQUESTS
+    print("\n--- Metrics Benchmark: primitive cost per call ---")
+    print("| Operation | ns |")
+    print("|---|---|")
+    for label, ns in primitive_costs():
+        print(f"| {label} | {ns:.0f} |")
+    workloads = (
+        ("OmegaSwarm.execute (verified)", swarm_workload),
+        ("SecureService.sensitive_transform", secure_workload),
+    )
+    for label, workload in workloads:
+        rows, snapshot = measure(workload, n)
+        print(f"\n--- Metrics Benchmark: {label}, {n} calls, best of {ROUNDS} ---")
+        print("| Metrics | calls/s | Overhead |")
+        print("|---|---|---|")
+        for config, rate, overhead in rows:
+            print(f"| {config} | {rate:,.0f} | {overhead:+.2f}% |")
+        print("\n| Stage | count | p50 ms | p99 ms | max ms |")
+        print("|---|---|---|---|---|")
+        for stage, s in snapshot["stages"].items():
+            print(f"| {stage} | {s['count']} | {s['p50_ms']:.3f} | {s['p99_ms']:.3f} | {s['max_ms']:.3f} |")
+        print("counters:", snapshot["counters"])
+        if snapshot["targets"]:
+            print("p99 targets:", {stage: ("ok" if t["ok"] else "MISSED") for stage, t in snapshot["targets"].items()})
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import time
+
+from core.hive_core import MonetizationManager
+from monetization.store import SQLiteMonetizationBackend
+
+# Monetization_Store_Benchmark: create/settle/validate throughput per backend
+
+OPERATIONS = 20_000
+
+
+def _rate(fn, n):
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+# 1. Drive one manager through the full invoice and token lifecycle
+def _measure(manager, n):
+    invoices = []
+    tokens = []
+    create = _rate(lambda: invoices.extend(manager.create_invoice(1000, f"bench {i}") for i in range(n)), n)
+    settle = _rate(lambda: [manager.settle_invoice(inv.invoice_id) for inv in invoices], n)
+    check = _rate(lambda: [manager.is_invoice_settled(inv.invoice_id) for inv in invoices], n)
+    issue = _rate(lambda: tokens.extend(manager.issue_l402_token("res", 3600) for _ in range(n)), n)
+    validate = _rate(lambda: [manager.validate_l402_token(t.token, "res") for t in tokens], n)
+    return create, settle, check, issue, validate
+
+
+# 2. Cold validation: a fresh manager over the same database (cache misses)
+def _measure_cold(path, tokens_n):
+    warm = MonetizationManager(backend=SQLiteMonetizationBackend(path))
+    tokens = [warm.issue_l402_token("res", 3600) for _ in range(tokens_n)]
+    warm.close()
+    cold = MonetizationManager(backend=SQLiteMonetizationBackend(path))
+    rate = _rate(lambda: [cold.validate_l402_token(t.token, "res") for t in tokens], tokens_n)
+    cold.close()
+    return rate
+
+
+def run_benchmark(n=OPERATIONS):
+    rows = [("in-memory", *_measure(MonetizationManager(), n), None)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "monetization.db")
+        manager = MonetizationManager(backend=SQLiteMonetizationBackend(path))
+        measured = _measure(manager, n)
+        manager.close()
+        rows.append(("sqlite (WAL)", *measured, _measure_cold(path, n)))
+    return rows
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else OPERATIONS
+    print(f"\n--- Monetization Store Benchmark ({n:,} ops each, ops/s) ---")
+    print("| Backend | create | settle | is_settled | issue | validate | cold validate |")
+    print("|---|---|---|---|---|---|---|")
+    for label, create, settle, check, issue, validate, cold in run_benchmark(n):
+        cold_s = "-" if cold is None else f"{cold:,.0f}"
+        print(f"| {label} | {create:,.0f} | {settle:,.0f} | {check:,.0f} | {issue:,.0f} | {validate:,.0f} | {cold_s} |")
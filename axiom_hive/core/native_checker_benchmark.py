@@ -0,0 +1,62 @@
+import hashlib
+import sys
+import time
+
+from core.verify.native_checker import AxiomHiveCoreModel, ExplicitStateChecker
+from core.verify.verifier import TLAVerifier
+
+# Native_Checker_Benchmark: in-process invariant checking latency and state throughput
+
+DECISIONS = 2000
+REQUESTS = 20_000
+
+
+# 1. Per-decision checks through TLAVerifier(checker="native")
+def decisions_per_s(n=DECISIONS):
+    verifier = TLAVerifier(checker="native")
+    start = time.perf_counter()
+    for i in range(n):
+        assert verifier.verify_decision({"decision": i})["status"] == "PASS"
+    return n / (time.perf_counter() - start)
+
+
+# 2. A wide model: every request is a distinct, non-symmetric decision
+class WideModel(AxiomHiveCoreModel):
+    def complies(self, ctx, axiom):
+        return int(ctx[1:]) % 3 != 0
+
+    def hash_of(self, ctx):
+        return int(ctx[1:])
+
+    def invariant(self, name, s):
+        # Failing compliance trips the spec's RollbackIntegrity; check the rest.
+        return name == "RollbackIntegrity" or super().invariant(name, s)
+
+
+# 3. Same model with a costly compliance predicate (e.g. scanning a large decision)
+class CostlyPredicateModel(WideModel):
+    def complies(self, ctx, axiom):
+        digest = ctx.encode("utf-8")
+        for _ in range(200):
+            digest = hashlib.sha256(digest).digest()
+        return super().complies(ctx, axiom)
+
+
+def states_per_s(requests, workers, model_cls=WideModel, symmetry=False):
+    model = model_cls([f"r{i}" for i in range(requests)], ["ax1", "ax2"])
+    checker = ExplicitStateChecker(model, model.INVARIANTS, symmetry=symmetry, workers=workers)
+    report = checker.check()
+    return report["distinct_states"], report["states_generated"] / (report["elapsed_ms"] / 1000)
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else REQUESTS
+    print(f"\n--- Native Checker Benchmark ---")
+    print(f"Per-decision verify_decision: {decisions_per_s():,.0f} decisions/s")
+    print(f"\n| Model ({requests:,} requests) | Workers | distinct states | states/s |")
+    print("|---|---|---|---|")
+    for label, model_cls in (("cheap predicates", WideModel), ("costly predicates", CostlyPredicateModel)):
+        for workers in (1, 2, 4):
+            distinct, rate = states_per_s(requests, workers, model_cls)
+            print(f"| {label} | {workers} | {distinct:,} | {rate:,.0f} |")
@@ -0,0 +1,71 @@
+import asyncio
+import sys
+import tempfile
+import time
+
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+
+# Omega_Swarm_Benchmark: verified-mode throughput, sequential execute vs run_many
+
+REQUESTS = 100
+TLC_LATENCY_S = 0.2
+
+
+# 1. Verifier with a fixed model-checking latency (stands in for a tlc run)
+class FixedLatencyVerifier(TLAVerifier):
+    def __init__(self, latency_s):
+        super().__init__()
+        self.latency_s = latency_s
+
+    def verify_decision(self, context):
+        time.sleep(self.latency_s)
+        return {"status": "PASS", "exit_code": 0, "context_hash": self._hash_context(context)}
+
+
+def _swarm(log_dir, latency_s, workers):
+    return OmegaSwarm(
+        HybridSSMEngine(128),
+        FixedLatencyVerifier(latency_s),
+        C0Logger(log_dir, layout="segments"),
+        LocalDeoxysCKKS(),
+        verifier_workers=workers,
+    )
+
+
+def _run(label, n, latency_s, workers):
+    requests = [("verified", f"Verify: {i}+{i}={2 * i}", {"request": i}) for i in range(n)]
+    with tempfile.TemporaryDirectory() as log_dir:
+        swarm = _swarm(log_dir, latency_s, workers)
+        start = time.perf_counter()
+        if workers == 0:
+            results = [swarm.execute(*req) for req in requests]
+        else:
+            results = asyncio.run(swarm.run_many(requests))
+        elapsed = time.perf_counter() - start
+        swarm.close()
+        swarm.c0.close()
+    audit = [(r["tasks"], r["c0_signature"]) for r in results]
+    return label, n / elapsed, audit
+
+
+# 2. Compare schedulers and check the audit trail is identical
+def run_benchmark(n=REQUESTS, latency_s=TLC_LATENCY_S):
+    rows = [_run("sequential execute", n, latency_s, 0)]
+    for workers in (4, 8, 16):
+        rows.append(_run(f"run_many ({workers} verifiers)", n, latency_s, workers))
+    baseline = rows[0][2]
+    return [(label, qps, audit == baseline) for label, qps, audit in rows]
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else TLC_LATENCY_S
+    print(f"\n--- Omega Swarm Benchmark ({REQUESTS} verified requests, {latency * 1000:.0f} ms verifier) ---")
+    print("| Scheduler | queries/s | Audit identical |")
+    print("|---|---|---|")
+    for label, qps, same in run_benchmark(latency_s=latency):
+        print(f"| {label} | {qps:,.1f} | {same} |")
@@ -0,0 +1,67 @@
+import contextlib
+import sys
+import tempfile
+import time
+
+from core.canonical import CanonicalHashCache
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+
+# Pipeline_Hash_Benchmark: OmegaSwarm.execute with per-stage vs single-pass canonical encoding
+
+CALLS = 200
+CONTEXT_DOCS = 200
+
+
+# 1. Baseline: every stage encodes its own payload from scratch
+class PerStageHashCache(CanonicalHashCache):
+    def request_scope(self):
+        return contextlib.nullcontext()
+
+
+def _context(docs):
+    return {f"doc_{i}": {"text": "lorem ipsum " * 50, "tags": list(range(20))} for i in range(docs)}
+
+
+def _swarm(cache, log_dir):
+    return OmegaSwarm(
+        HybridSSMEngine(128, hash_cache=cache),
+        TLAVerifier(hash_cache=cache),
+        C0Logger(log_dir, layout="segments", hash_cache=cache),
+        LocalDeoxysCKKS(),
+        hash_cache=cache,
+    )
+
+
+# 2. Time execute() per scheme and check the recorded hashes are identical
+def run_benchmark(calls=CALLS, docs=CONTEXT_DOCS):
+    context = _context(docs)
+    rows = []
+    baseline_tasks = None
+    for label, cls in (("per-stage", PerStageHashCache), ("single-pass", CanonicalHashCache)):
+        # No text LRU reuse across calls: only in-request sharing is measured.
+        cache = cls(max_bytes=0)
+        with tempfile.TemporaryDirectory() as log_dir:
+            swarm = _swarm(cache, log_dir)
+            start = time.perf_counter()
+            results = [swarm.execute("hybrid", f"prompt {i}", context) for i in range(calls)]
+            elapsed = time.perf_counter() - start
+            swarm.c0.close()
+        tasks = [r["tasks"] for r in results]
+        if baseline_tasks is None:
+            baseline_tasks = tasks
+        rows.append((label, elapsed / calls * 1e3, calls / elapsed, tasks == baseline_tasks))
+    return rows
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    docs = int(sys.argv[1]) if len(sys.argv) > 1 else CONTEXT_DOCS
+    print(f"\n--- Pipeline Hash Benchmark ({CALLS} calls, {docs} context docs) ---")
+    print("| Scheme | ms/call | calls/s | Hashes identical |")
+    print("|---|---|---|---|")
+    for label, ms, rate, same in run_benchmark(docs=docs):
+        print(f"| {label} | {ms:.2f} | {rate:,.0f} | {same} |")
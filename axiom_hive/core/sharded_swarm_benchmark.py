@@ -0,0 +1,80 @@
+import functools
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+from orchestrator.sharded_swarm import ShardedOmegaSwarm
+
+# Sharded_Swarm_Benchmark: creative-mode throughput, one process vs consistent-hash shards
+
+REQUESTS = 4000
+SESSIONS = 64
+
+
+# 1. Requests from SESSIONS interleaved sessions
+def make_requests(n=REQUESTS, sessions=SESSIONS):
+    return [
+        ("creative", f"Summarize: step {i}", {"session_id": f"s{i % sessions}", "step": i})
+        for i in range(n)
+    ]
+
+
+def build_shard(log_dir, shard):
+    return OmegaSwarm(
+        HybridSSMEngine(128),
+        TLAVerifier(),
+        C0Logger(os.path.join(log_dir, f"shard-{shard}"), layout="segments"),
+        LocalDeoxysCKKS(),
+    )
+
+
+# A partial of a module-level function pickles, so it also works with forkserver/spawn.
+def _factory(log_dir):
+    return functools.partial(build_shard, log_dir)
+
+
+# 2. Run through a sharded swarm; `processes=False` is the in-process reference
+def _run(requests, shards, processes):
+    with tempfile.TemporaryDirectory() as log_dir:
+        runner = ShardedOmegaSwarm(_factory(log_dir), shards=shards, processes=processes)
+        runner.start()
+        start = time.perf_counter()
+        results = runner.run_many(requests)
+        elapsed = time.perf_counter() - start
+        runner.close()
+    return len(requests) / elapsed, [(r["tasks"], r["c0_signature"]) for r in results]
+
+
+# 3. Compare shard counts; each run must match its in-process reference
+def run_benchmark(n=REQUESTS, max_shards=None):
+    requests = make_requests(n)
+    max_shards = max_shards or max(4, multiprocessing.cpu_count())
+    baseline_qps, _ = _run(requests, 1, processes=False)
+    rows = [("in-process, 1 shard", baseline_qps, 1.0, True)]
+    shards = 1
+    while shards <= max_shards:
+        _, reference = _run(requests, shards, processes=False)
+        qps, audit = _run(requests, shards, processes=True)
+        rows.append((f"{shards} process shard(s)", qps, qps / baseline_qps, audit == reference))
+        shards *= 2
+    return rows
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else REQUESTS
+    print(
+        f"\n--- Sharded Swarm Benchmark ({n} creative requests, {SESSIONS} sessions, "
+        f"{multiprocessing.cpu_count()} CPUs) ---"
+    )
+    print("| Runner | queries/s | Speedup | Matches in-process shards |")
+    print("|---|---|---|---|")
+    for label, qps, speedup, same in run_benchmark(n):
+        print(f"| {label} | {qps:,.0f} | {speedup:.2f}x | {same} |")
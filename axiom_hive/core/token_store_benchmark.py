@@ -0,0 +1,75 @@
+import resource
+import sys
+import time
+
+from monetization.store import ExpiringTokenStore
+
+# L402_Token_Store_Benchmark: sustained issuance against a bounded expiry index
+
+TOTAL_TOKENS = 10_000_000
+CAPACITY = 1_000_000
+TTL_TICKS = 500_000  # tokens stay live for this many subsequent issues
+VALIDATIONS = 1_000_000
+
+
+# 1. Simulated clock: one tick per issued token keeps the run deterministic
+class TickClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# 2. Issue `total` tokens, then validate a mix of live and expired ones
+def run_benchmark(total=TOTAL_TOKENS, capacity=CAPACITY, ttl=TTL_TICKS, validations=VALIDATIONS):
+    clock = TickClock()
+    store = ExpiringTokenStore(capacity=capacity, clock=clock)
+    peak = 0
+
+    start = time.perf_counter()
+    for i in range(total):
+        clock.now = i
+        store.put(f"tok_{i}", i, i + ttl)
+        if i & 0xFFFF == 0:
+            peak = max(peak, len(store))
+    issue_s = time.perf_counter() - start
+    peak = max(peak, len(store))
+
+    hits = 0
+    start = time.perf_counter()
+    for j in range(validations):
+        # Half recent (live), half old (expired or evicted)
+        idx = total - 1 - (j % ttl) if j & 1 else j % max(total - ttl, 1)
+        if store.get(f"tok_{idx}") is not None:
+            hits += 1
+    validate_s = time.perf_counter() - start
+
+    return {
+        "issued": total,
+        "issue_per_s": total / issue_s,
+        "validate_per_s": validations / validate_s,
+        "hit_ratio": hits / validations,
+        "peak_live_tokens": peak,
+        "evicted_expired": store.evicted_expired,
+        "evicted_lru": store.evicted_lru,
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_TOKENS
+    result = run_benchmark(total=total)
+    print(f"\n--- Expiring Token Store Benchmark ({total:,} tokens, capacity {CAPACITY:,}) ---")
+    print("| Metric | Value |")
+    print("|---|---|")
+    for key, value in result.items():
+        shown = f"{value:,.2f}" if isinstance(value, float) else f"{value:,}"
+        print(f"| {key} | {shown} |")
@@ -4,4 +4,7 @@ Verification module for Axiom Hive.
 Contains:
 - AxiomHive_Core TLA+ specification and TLC configuration
 - TLAVerifier: a local wrapper around TLC for checking invariants
+- VerificationCache: persistent TLC result cache keyed by spec/cfg content
+- TLCWorkerPool: bounded pool of checker worker processes (protocol in tlc_worker.py)
+- ExplicitStateChecker: in-process BFS invariant checker for AxiomHive_Core
 """
\ No newline at end of file
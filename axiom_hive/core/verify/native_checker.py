@@ -0,0 +1,344 @@
+import hashlib
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# State of AxiomHive_Core:
+#   (state, auditTrail, currentContext, rollbackPoint.context, rollbackPoint.trail)
+State = Tuple[str, Tuple[int, ...], str, str, Tuple[int, ...]]
+
+STATES = ("Idle", "Processing", "Verifying", "Committed", "Rollback")
+EMPTY = "Empty"
+
+
+# =============================================================================
+# TLC CONFIG
+# =============================================================================
+
+
+@dataclass
+class TLCConfig:
+    constants: Dict[str, Any] = field(default_factory=dict)
+    init: Optional[str] = None
+    next: Optional[str] = None
+    invariants: List[str] = field(default_factory=list)
+    properties: List[str] = field(default_factory=list)
+
+
+def _parse_value(text: str) -> Any:
+    text = text.strip()
+    if text.startswith("{") and text.endswith("}"):
+        inner = text[1:-1].strip()
+        return frozenset(_parse_value(v) for v in inner.split(",")) if inner else frozenset()
+    if text.isdigit():
+        return int(text)
+    return text.strip('"')
+
+
+def parse_cfg(path: str) -> TLCConfig:
+    """Parse the subset of TLC .cfg syntax used by AxiomHive_Core."""
+    cfg = TLCConfig()
+    section = None
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.split("\\*", 1)[0].strip()
+            if not line:
+                continue
+            head, _, rest = line.partition(" ")
+            keyword = head.upper()
+            if keyword in ("CONSTANT", "CONSTANTS", "INVARIANT", "INVARIANTS", "PROPERTY", "PROPERTIES"):
+                section = keyword.rstrip("S")
+                line = rest.strip()
+                if not line:
+                    continue
+            elif keyword in ("INIT", "NEXT"):
+                setattr(cfg, keyword.lower(), rest.strip())
+                section = None
+                continue
+            if section == "CONSTANT":
+                name, _, value = line.partition("=")
+                cfg.constants[name.strip()] = _parse_value(value)
+            elif section == "INVARIANT":
+                cfg.invariants.extend(line.split())
+            elif section == "PROPERTY":
+                cfg.properties.extend(line.split())
+    return cfg
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+
+class AxiomHiveCoreModel:
+    """
+    AxiomHive_Core (core/verify/axiom_hive_core.tla) as an explicit-state model.
+
+    `complies`, `verified`, `claims`, `traceable` and `hash_of` mirror the
+    spec's uninterpreted operators and default to the spec's stub
+    definitions; subclasses override them to give the invariants
+    per-decision meaning. `contexts` maps request model values to the
+    decision contexts they stand for.
+    """
+
+    INVARIANTS = ("TypeOK", "SecureExecution", "RollbackIntegrity", "NoHallucination")
+
+    def __init__(
+        self,
+        requests: Iterable[str],
+        safety_axioms: Iterable[str],
+        contexts: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.requests = tuple(sorted(requests))
+        self.safety_axioms = tuple(sorted(safety_axioms))
+        self.contexts = contexts or {}
+        self._context_values = frozenset(self.requests) | {EMPTY}
+
+    # -- spec operators (stubs as in the spec) --
+
+    def complies(self, ctx: str, axiom: str) -> bool:
+        return True
+
+    def verified(self, ctx: str) -> bool:
+        return True
+
+    def claims(self, ctx: str) -> Iterable[Any]:
+        return ()
+
+    def traceable(self, claim: Any, base: Any) -> bool:
+        return True
+
+    def hash_of(self, ctx: str) -> int:
+        return 0
+
+    # -- transition system --
+
+    def init_states(self) -> List[State]:
+        return [("Idle", (), EMPTY, EMPTY, ())]
+
+    def successors(self, s: State) -> Iterable[Tuple[str, State]]:
+        pc, trail, ctx, rb_ctx, rb_trail = s
+        if pc == "Idle":
+            for r in self.requests:
+                yield f"ReceiveInput({r})", ("Processing", trail, r, ctx, trail)
+        elif pc == "Processing":
+            ok = all(self.complies(ctx, a) for a in self.safety_axioms)
+            yield "VerifyLogic", ("Verifying" if ok else "Rollback", trail, ctx, rb_ctx, rb_trail)
+        elif pc == "Verifying":
+            if all(self.complies(ctx, a) for a in self.safety_axioms):
+                yield "CommitAction", ("Committed", trail + (self.hash_of(ctx),), ctx, rb_ctx, rb_trail)
+        elif pc == "Rollback":
+            yield "ExecuteRollback", ("Idle", rb_trail, rb_ctx, rb_ctx, rb_trail)
+
+    # -- invariants --
+
+    def invariant(self, name: str, s: State) -> bool:
+        pc, trail, ctx, rb_ctx, rb_trail = s
+        if name == "TypeOK":
+            return (
+                pc in STATES
+                and all(isinstance(x, int) and x >= 0 for x in trail + rb_trail)
+                and ctx in self._context_values
+                and rb_ctx in self._context_values
+            )
+        if name == "SecureExecution":
+            return pc != "Committed" or self.verified(ctx)
+        if name == "RollbackIntegrity":
+            return pc != "Rollback" or ctx == rb_ctx
+        if name == "NoHallucination":
+            if pc != "Verifying":
+                return True
+            return all(
+                self.traceable(c, self.safety_axioms) or self.traceable(c, trail)
+                for c in self.claims(ctx)
+            )
+        raise KeyError(name)
+
+    def canonical(self, s: State) -> State:
+        """
+        Symmetry reduction: rename requests in order of first appearance.
+
+        Only sound when the operators above treat all requests alike.
+        """
+        pc, trail, ctx, rb_ctx, rb_trail = s
+        names: Dict[str, str] = {}
+        for value in (ctx, rb_ctx):
+            if value != EMPTY and value not in names:
+                names[value] = self.requests[len(names)]
+        return (pc, trail, names.get(ctx, ctx), names.get(rb_ctx, rb_ctx), rb_trail)
+
+
+# =============================================================================
+# CHECKER
+# =============================================================================
+
+
+def fingerprint(s: State) -> int:
+    # 64-bit, stable across processes (unlike hash() of str).
+    return int.from_bytes(hashlib.blake2b(repr(s).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+_WORKER_MODEL: Optional[Tuple[Any, Sequence[str], bool]] = None
+
+
+def _init_worker(model: Any, invariants: Sequence[str], symmetry: bool) -> None:
+    global _WORKER_MODEL
+    _WORKER_MODEL = (model, invariants, symmetry)
+
+
+def _expand(model: Any, invariants: Sequence[str], symmetry: bool, frontier: Sequence[Tuple[int, State]]):
+    out = []
+    for parent_fp, s in frontier:
+        for _action, nxt in model.successors(s):
+            if symmetry:
+                nxt = model.canonical(nxt)
+            violated = next((inv for inv in invariants if not model.invariant(inv, nxt)), None)
+            out.append((fingerprint(nxt), parent_fp, nxt, violated))
+    return out
+
+
+def _expand_in_worker(frontier: Sequence[Tuple[int, State]]):
+    model, invariants, symmetry = _WORKER_MODEL
+    return _expand(model, invariants, symmetry, frontier)
+
+
+class ExplicitStateChecker:
+    """
+    Breadth-first explicit-state invariant checker.
+
+    Visited states are kept only as 64-bit fingerprints (plus a parent
+    fingerprint for counterexample reconstruction, as TLC does), optionally
+    after symmetry reduction. With `workers > 1`, frontiers of at least
+    `parallel_threshold` states are expanded across forked processes; the
+    merge is in frontier order, so results and traces do not depend on the
+    worker count.
+
+    The model needs `init_states()`, `successors(state)` yielding
+    (action, state), `invariant(name, state)` and, for symmetry,
+    `canonical(state)`.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        invariants: Sequence[str],
+        symmetry: bool = False,
+        workers: int = 1,
+        parallel_threshold: int = 2048,
+        max_states: int = 10_000_000,
+    ) -> None:
+        self.model = model
+        self.invariants = tuple(invariants)
+        self.symmetry = symmetry
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.max_states = max_states
+
+    def check(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        parents: Dict[int, Optional[int]] = {}
+        frontier: List[Tuple[int, State]] = []
+        generated = 0
+        violation: Optional[Tuple[str, int]] = None
+
+        for s in self.model.init_states():
+            if self.symmetry:
+                s = self.model.canonical(s)
+            generated += 1
+            fp = fingerprint(s)
+            if fp in parents:
+                continue
+            parents[fp] = None
+            frontier.append((fp, s))
+            bad = next((inv for inv in self.invariants if not self.model.invariant(inv, s)), None)
+            if bad is not None:
+                violation = (bad, fp)
+                break
+
+        depth = 0
+        pool = None
+        try:
+            while frontier and violation is None:
+                if len(parents) > self.max_states:
+                    raise RuntimeError(f"state space exceeds max_states={self.max_states}")
+                depth += 1
+                if self.workers > 1 and len(frontier) >= self.parallel_threshold:
+                    if pool is None:
+                        # fork: the model (and any closures it holds) is inherited, not pickled.
+                        pool = multiprocessing.get_context("fork").Pool(
+                            self.workers, _init_worker, (self.model, self.invariants, self.symmetry)
+                        )
+                    size = -(-len(frontier) // (self.workers * 4))
+                    chunks = [frontier[i : i + size] for i in range(0, len(frontier), size)]
+                    expanded = [item for part in pool.map(_expand_in_worker, chunks) for item in part]
+                else:
+                    expanded = _expand(self.model, self.invariants, self.symmetry, frontier)
+
+                frontier = []
+                for fp, parent_fp, s, bad in expanded:
+                    generated += 1
+                    if fp in parents:
+                        continue
+                    parents[fp] = parent_fp
+                    if bad is not None:
+                        violation = (bad, fp)
+                        break
+                    frontier.append((fp, s))
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        result: Dict[str, Any] = {
+            "status": "PASS" if violation is None else "FAIL",
+            "invariants": list(self.invariants),
+            "states_generated": generated,
+            "distinct_states": len(parents),
+            "depth": depth,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
+        if violation is not None:
+            result["violated"] = violation[0]
+            result["trace"] = self._trace(parents, violation[1])
+        return result
+
+    def _trace(self, parents: Dict[int, Optional[int]], fp: int) -> List[Dict[str, Any]]:
+        # Rebuild the path from fingerprints by re-expanding from the initial states.
+        chain: List[int] = []
+        cur: Optional[int] = fp
+        while cur is not None:
+            chain.append(cur)
+            cur = parents[cur]
+        chain.reverse()
+
+        def norm(s: State) -> State:
+            return self.model.canonical(s) if self.symmetry else s
+
+        state = next(norm(s) for s in self.model.init_states() if fingerprint(norm(s)) == chain[0])
+        trace = [{"action": "Init", "state": list(state)}]
+        for target in chain[1:]:
+            action, state = next(
+                (a, norm(n)) for a, n in self.model.successors(state) if fingerprint(norm(n)) == target
+            )
+            trace.append({"action": action, "state": list(state)})
+        return trace
+
+
+def supported_invariants(cfg: TLCConfig, model_cls: type = AxiomHiveCoreModel) -> Tuple[List[str], List[str]]:
+    """Split the cfg's invariants and properties into (natively checkable, needs TLC)."""
+    native = [inv for inv in cfg.invariants if inv in model_cls.INVARIANTS]
+    rest = [inv for inv in cfg.invariants if inv not in model_cls.INVARIANTS] + list(cfg.properties)
+    return native, rest
+
+
+def model_from_cfg(
+    cfg: TLCConfig,
+    model_cls: Callable[..., AxiomHiveCoreModel] = AxiomHiveCoreModel,
+    requests: Optional[Iterable[str]] = None,
+    contexts: Optional[Dict[str, Any]] = None,
+) -> AxiomHiveCoreModel:
+    """Model over the cfg's constants; `requests` overrides the Requests set."""
+    if requests is None:
+        requests = sorted(str(r) for r in cfg.constants.get("Requests", ()))
+    axioms = sorted(str(a) for a in cfg.constants.get("SafetyAxioms", ()))
+    return model_cls(requests, axioms, contexts)
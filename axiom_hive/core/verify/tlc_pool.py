@@ -0,0 +1,220 @@
+import json
+import os
+import queue
+import selectors
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# The worker module has no package imports, so it runs as a script from any cwd.
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tlc_worker.py")
+
+
+class TLCWorkerError(RuntimeError):
+    """A pool worker died or broke the protocol; the job can be retried elsewhere."""
+
+
+class TLCJobTimeout(TimeoutError):
+    pass
+
+
+class _Worker:
+    def __init__(self, command: List[str], startup_timeout: float, cwd: Optional[str]) -> None:
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+            # Own process group, so a kill also reaches the checker (e.g. a
+            # tlc JVM) the worker has started.
+            start_new_session=True,
+        )
+        self.jobs = 0
+        self._buf = bytearray()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.proc.stdout, selectors.EVENT_READ)
+        try:
+            hello = self.read_message(time.monotonic() + startup_timeout)
+        except TLCJobTimeout:
+            self.kill()
+            raise TLCWorkerError("worker did not become ready") from None
+        if not hello.get("ready"):
+            self.kill()
+            raise TLCWorkerError(f"unexpected worker greeting: {hello!r}")
+
+    def send(self, message: Dict[str, Any]) -> None:
+        try:
+            self.proc.stdin.write(json.dumps(message).encode("utf-8") + b"\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, ValueError) as exc:
+            raise TLCWorkerError("worker stdin closed") from exc
+
+    def read_message(self, deadline: float) -> Dict[str, Any]:
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(remaining):
+                raise TLCJobTimeout()
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise TLCWorkerError(f"worker exited with code {self.proc.poll()}")
+            self._buf += chunk
+        line, _, rest = bytes(self._buf).partition(b"\n")
+        self._buf = bytearray(rest)
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            raise TLCWorkerError("malformed worker response") from exc
+
+    def close(self, grace: float = 1.0) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=grace)
+        except (OSError, subprocess.TimeoutExpired):
+            self._kill_group()
+            self.proc.wait()
+        self._release_pipes()
+
+    def kill(self) -> None:
+        self._kill_group()
+        self.proc.wait()
+        self._release_pipes()
+
+    def _kill_group(self) -> None:
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def _release_pipes(self) -> None:
+        self._selector.close()
+        for pipe in (self.proc.stdin, self.proc.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
+class TLCWorkerPool:
+    """
+    Pool of long-lived model-checker workers.
+
+    Each worker is a process speaking the JSON-lines protocol described in
+    core/verify/tlc_worker.py. With the default "tlc" checker every job
+    still runs a fresh `tlc` process; the pool bounds how many run at once
+    and contains timeouts and crashes per worker. Jobs are handed to idle
+    workers; callers block while all `size` workers are busy. A job that
+    exceeds its timeout costs only that worker, which is killed and
+    replaced on demand, and each worker is recycled after
+    `max_jobs_per_worker` jobs to bound leaks in long-running checkers.
+    """
+
+    def __init__(
+        self,
+        command: Optional[List[str]] = None,
+        size: int = 2,
+        max_jobs_per_worker: int = 100,
+        timeout_seconds: float = 5.0,
+        startup_timeout_seconds: float = 30.0,
+        cwd: Optional[str] = None,
+    ) -> None:
+        self.command = command or [sys.executable, WORKER_SCRIPT]
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.timeout_seconds = timeout_seconds
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.cwd = cwd
+        # Idle slots hold a live worker, or None for a slot to be (re)spawned.
+        self._idle: "queue.LifoQueue[Optional[_Worker]]" = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._closed = False
+        self.stats = {"jobs": 0, "spawned": 0, "recycled": 0, "timeouts": 0, "crashed": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _spawn(self) -> _Worker:
+        try:
+            worker = _Worker(self.command, self.startup_timeout_seconds, self.cwd)
+        except OSError as exc:
+            raise TLCWorkerError(f"cannot start worker: {exc}") from exc
+        self._count("spawned")
+        return worker
+
+    def warm_up(self) -> None:
+        """Start every worker now instead of on first use."""
+        slots = [self._idle.get() for _ in range(self.size)]
+        try:
+            slots = [w if w is not None else self._spawn() for w in slots]
+        finally:
+            for w in slots:
+                self._idle.put(w)
+
+    def run(self, spec_path: str, cfg_path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Check one spec; returns {"exit_code", "stdout", "stderr"}."""
+        if self._closed:
+            raise TLCWorkerError("pool is closed")
+        timeout = self.timeout_seconds if timeout is None else timeout
+        with self._lock:
+            self._next_id += 1
+            job_id = self._next_id
+        worker = self._idle.get()
+        try:
+            if worker is None:
+                worker = self._spawn()
+            worker.send(
+                {
+                    "id": job_id,
+                    "spec": os.path.abspath(spec_path),
+                    "cfg": os.path.abspath(cfg_path),
+                    "timeout": timeout,
+                }
+            )
+            response = worker.read_message(time.monotonic() + timeout)
+            if response.get("id") != job_id:
+                raise TLCWorkerError(f"response for job {response.get('id')} while waiting for {job_id}")
+        except TLCJobTimeout:
+            # The worker is mid-job and cannot be interrupted; replace it.
+            worker.kill()
+            worker = None
+            self._count("timeouts")
+            raise
+        except TLCWorkerError:
+            if worker is not None:
+                worker.kill()
+                worker = None
+            self._count("crashed")
+            raise
+        finally:
+            self._release(worker)
+        self._count("jobs")
+        return {
+            "exit_code": response["exit_code"],
+            "stdout": response.get("stdout", ""),
+            "stderr": response.get("stderr", ""),
+        }
+
+    def _release(self, worker: Optional[_Worker]) -> None:
+        if worker is not None:
+            worker.jobs += 1
+            if self._closed or worker.jobs >= self.max_jobs_per_worker:
+                worker.close()
+                worker = None
+                if not self._closed:
+                    self._count("recycled")
+        self._idle.put(worker)
+
+    def close(self) -> None:
+        self._closed = True
+        for _ in range(self.size):
+            worker = self._idle.get()
+            if worker is not None:
+                worker.close()
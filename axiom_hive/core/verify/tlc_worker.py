@@ -0,0 +1,98 @@
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+# Worker side of the TLCWorkerPool protocol (JSON lines over stdin/stdout):
+#   worker -> pool   {"ready": true}                         once, after startup
+#   pool -> worker   {"id": n, "spec": path, "cfg": path, "timeout": seconds}
+#   worker -> pool   {"id": n, "exit_code": int, "stdout": str, "stderr": str}
+#
+# Two checkers ship here:
+# - "tlc": runs the `tlc` command per job. Each job still starts its own JVM;
+#   the pool only bounds concurrency, enforces per-job timeouts and isolates
+#   crashes. tlc has no resident job mode, so no checker here keeps it loaded.
+# - "standin": mimics tlc exit codes and timing without a JVM, for tests.
+#   Directives in the spec file control it:
+#   `\* STANDIN_EXIT=<code>` and `\* STANDIN_CHECK_MS=<ms>`.
+
+_DIRECTIVE = re.compile(r"STANDIN_(EXIT|CHECK_MS)=(\d+)")
+
+
+def check_with_tlc(spec: str, cfg: str, timeout: Optional[float]) -> Dict[str, Any]:
+    proc = subprocess.run(
+        ["tlc", "-config", cfg, spec],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=timeout,
+        check=False,
+        text=True,
+    )
+    return {"exit_code": proc.returncode, "stdout": proc.stdout, "stderr": proc.stderr}
+
+
+def make_standin_checker(check_ms: float) -> Callable[[str, str, Optional[float]], Dict[str, Any]]:
+    def check(spec: str, cfg: str, timeout: Optional[float]) -> Dict[str, Any]:
+        with open(spec, "r", encoding="utf-8") as f:
+            directives = dict(_DIRECTIVE.findall(f.read()))
+        time.sleep(int(directives.get("CHECK_MS", check_ms)) / 1000)
+        exit_code = int(directives.get("EXIT", 0))
+        if exit_code == 0:
+            stdout = "Model checking completed. No error has been found.\n"
+        else:
+            stdout = f"Error: Invariant is violated.\nExit code {exit_code}\n"
+        return {"exit_code": exit_code, "stdout": stdout, "stderr": ""}
+
+    return check
+
+
+def serve(
+    checker: Callable[[str, str, Optional[float]], Dict[str, Any]],
+    stdin: TextIO,
+    stdout: TextIO,
+) -> None:
+    stdout.write(json.dumps({"ready": True}) + "\n")
+    stdout.flush()
+    for line in stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            result = checker(job["spec"], job["cfg"], job.get("timeout"))
+        except subprocess.TimeoutExpired:
+            result = {"exit_code": -1, "stdout": "", "stderr": "timeout"}
+        except OSError as exc:
+            result = {"exit_code": -1, "stdout": "", "stderr": str(exc)}
+        result["id"] = job["id"]
+        stdout.write(json.dumps(result) + "\n")
+        stdout.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TLC worker for TLCWorkerPool.")
+    parser.add_argument("--checker", choices=("tlc", "standin"), default="tlc")
+    parser.add_argument("--check-ms", type=float, default=20.0, help="Default per-job time (standin).")
+    parser.add_argument("-config", dest="config", help="One-shot mode: check SPEC like `tlc -config CFG SPEC`.")
+    parser.add_argument("spec", nargs="?")
+    args = parser.parse_args(argv)
+
+    if args.checker == "standin":
+        checker = make_standin_checker(args.check_ms)
+    else:
+        checker = check_with_tlc
+
+    if args.spec is not None:
+        result = checker(args.spec, args.config, None)
+        sys.stdout.write(result["stdout"])
+        sys.stderr.write(result["stderr"])
+        return result["exit_code"]
+    serve(checker, sys.stdin, sys.stdout)
+    return 0
+
+
+# EXECUTION PHASE
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,156 @@ import hashlib
 import json
 import os
 import subprocess
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from core.canonical import DEFAULT_HASH_CACHE, CanonicalHashCache
+from core.metrics import MetricsRegistry
+from core.verify.native_checker import (
+    AxiomHiveCoreModel,
+    ExplicitStateChecker,
+    TLCConfig,
+    model_from_cfg,
+    parse_cfg,
+    supported_invariants,
+)
+from core.verify.tlc_pool import TLCJobTimeout, TLCWorkerError, TLCWorkerPool
+
+
+class VerificationCache:
+    """
+    Cache of TLC results keyed by spec/cfg content hashes (and optionally a
+    context hash).
+
+    File digests are recomputed only when a file's (mtime_ns, size, inode)
+    changes, or on every lookup with check="hash". When the spec or cfg
+    content changes, entries for the old content are dropped, including
+    entries reloaded from a previous run on the first lookup. With `path`
+    set, entries are appended to a JSONL file and reloaded on startup; the
+    file is rewritten without stale entries on invalidation.
+    """
+
+    CHECKS = ("mtime", "hash")
+    # Misses serialize per key on one of a fixed set of striped locks.
+    KEY_LOCK_STRIPES = 64
+
+    def __init__(self, path: Optional[str] = None, check: str = "mtime") -> None:
+        if check not in self.CHECKS:
+            raise ValueError(f"Unsupported cache check: {check}")
+        self.path = path
+        self.check = check
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._current: Optional[Tuple[str, str]] = None
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(self.KEY_LOCK_STRIPES)]
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        if path is not None:
+            self._load()
+
+    # -- persistence --
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    self._entries[rec["key"]] = rec["result"]
+                except (ValueError, KeyError, TypeError):
+                    # A torn final line from an interrupted append.
+                    continue
+
+    def _append(self, key: str, result: Dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "result": result}, sort_keys=True) + "\n")
+
+    def _rewrite(self) -> None:
+        if self.path is None:
+            return
+        tmp = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for key, result in self._entries.items():
+                f.write(json.dumps({"key": key, "result": result}, sort_keys=True) + "\n")
+        os.replace(tmp, self.path)
+
+    # -- keys --
+
+    def file_digest(self, path: str) -> str:
+        st = os.stat(path)
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        known = self._files.get(path)
+        if self.check == "mtime" and known is not None and known[0] == sig:
+            return known[1]
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._files[path] = (sig, digest)
+        return digest
+
+    def key(self, spec_path: str, cfg_path: str, ctx_hash: Optional[str] = None) -> str:
+        with self._lock:
+            current = (self.file_digest(spec_path), self.file_digest(cfg_path))
+            # The first lookup also drops what a previous run left for other content.
+            if current != self._current:
+                self._invalidate_locked(current)
+            self._current = current
+        key = f"{current[0]}:{current[1]}"
+        return f"{key}:{ctx_hash}" if ctx_hash is not None else key
+
+    def _invalidate_locked(self, current: Tuple[str, str]) -> None:
+        prefix = f"{current[0]}:{current[1]}"
+        stale = [k for k in self._entries if not k.startswith(prefix)]
+        for k in stale:
+            del self._entries[k]
+        if stale:
+            self.invalidations += len(stale)
+            self._rewrite()
+
+    # -- lookups --
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Lock for `key`, so concurrent misses for one key run TLC once."""
+        return self._key_locks[hash(key) % self.KEY_LOCK_STRIPES]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(result)
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            return None if result is None else dict(result)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._append(key, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rewrite()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
 
 
 class TLAVerifier:
@@ -11,21 +160,80 @@ class TLAVerifier:
 
     If `tlc` is present on PATH, it is used to check AxiomHive_Core.
     If not present, a structured SKIPPED result is returned.
+
+    PASS/FAIL results are cached per spec/cfg content (see
+    VerificationCache), since they do not depend on the decision context;
+    set `cache_by_context` to key on the context hash as well. Pass
+    `cache_path` to keep results across restarts, or `use_cache=False` to
+    run TLC for every decision.
+
+    With a `worker_pool` (TLCWorkerPool), uncached checks go to the pool's
+    workers; if the pool fails, the check falls back to a one-off `tlc`
+    subprocess.
+
+    `checker` selects the backend:
+    - "tlc": model-check the full spec with TLC (default)
+    - "native": check the cfg's invariants in-process with
+      ExplicitStateChecker, over a model whose only request is this
+      decision; temporal properties are reported as unchecked
+    - "auto": native first; its result is final, with temporal properties
+      reported as unchecked as under "native". TLC runs only when the cfg
+      lists invariants the native model lacks (the native result stands if
+      TLC is unavailable)
     """
 
+    CHECKERS = ("tlc", "native", "auto")
+
     def __init__(
         self,
         spec_path: str = "core/verify/axiom_hive_core.tla",
         cfg_path: str = "core/verify/axiom_hive_core.cfg",
         timeout_seconds: int = 5,
+        hash_cache: Optional[CanonicalHashCache] = None,
+        use_cache: bool = True,
+        cache_path: Optional[str] = None,
+        cache_by_context: bool = False,
+        cache_check: str = "mtime",
+        worker_pool: Optional[TLCWorkerPool] = None,
+        checker: str = "tlc",
+        native_model_cls: type = AxiomHiveCoreModel,
+        native_workers: int = 1,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
+        if checker not in self.CHECKERS:
+            raise ValueError(f"Unsupported checker: {checker}")
         self.spec_path = spec_path
         self.cfg_path = cfg_path
         self.timeout_seconds = timeout_seconds
+        self._hash_cache = hash_cache or DEFAULT_HASH_CACHE
+        self.cache: Optional[VerificationCache] = (
+            VerificationCache(cache_path, check=cache_check) if use_cache else None
+        )
+        self.cache_by_context = cache_by_context
+        self.worker_pool = worker_pool
+        self.checker = checker
+        self.native_model_cls = native_model_cls
+        self.native_workers = native_workers
+        self._cfg: Optional[Tuple[Tuple[int, int], TLCConfig]] = None
+        if metrics is not None:
+            self._instrument(metrics)
+
+    def _instrument(self, metrics: MetricsRegistry) -> None:
+        # Timed wrappers shadow the methods on this instance only.
+        hash_json = self._hash_cache.json
+
+        def hash_context(context: Dict[str, Any]) -> str:
+            data, digest = hash_json(context)
+            metrics.add("bytes_hashed", len(data))
+            return digest.hex()
+
+        self._hash_context = hash_context
+        self.verify_decision = metrics.wrap("verifier.verify", self.verify_decision)
+        self._check_native = metrics.wrap("verifier.native", self._check_native)
+        self._verify_full = metrics.wrap("verifier.tlc", self._verify_full)
 
     def _hash_context(self, context: Dict[str, Any]) -> str:
-        enc = json.dumps(context, sort_keys=True).encode("utf-8")
-        return hashlib.sha256(enc).hexdigest()
+        return self._hash_cache.json_hexdigest(context)
 
     def verify_decision(self, context: Dict[str, Any]) -> Dict[str, Any]:
         ctx_hash = self._hash_context(context)
@@ -37,6 +245,79 @@ class TLAVerifier:
                 "context_hash": ctx_hash,
             }
 
+        if self.checker != "tlc" and os.path.exists(self.cfg_path):
+            native = self._check_native(context, ctx_hash)
+            if native["status"] == "FAIL" or self.checker == "native":
+                return native
+            # Temporal properties span runs, not one decision; only
+            # invariants the native model cannot evaluate need TLC.
+            properties = self._load_cfg().properties
+            if all(name in properties for name in native["unchecked"]):
+                return native
+            full = self._verify_full(ctx_hash)
+            return native if full["status"] == "SKIPPED" else full
+
+        return self._verify_full(ctx_hash)
+
+    def _load_cfg(self) -> TLCConfig:
+        st = os.stat(self.cfg_path)
+        sig = (st.st_mtime_ns, st.st_size)
+        if self._cfg is None or self._cfg[0] != sig:
+            self._cfg = (sig, parse_cfg(self.cfg_path))
+        return self._cfg[1]
+
+    def _check_native(self, context: Dict[str, Any], ctx_hash: str) -> Dict[str, Any]:
+        cfg = self._load_cfg()
+        invariants, unchecked = supported_invariants(cfg, self.native_model_cls)
+        request = f"decision_{ctx_hash[:16]}"
+        model = model_from_cfg(cfg, self.native_model_cls, [request], {request: context})
+        report = ExplicitStateChecker(model, invariants, workers=self.native_workers).check()
+        result: Dict[str, Any] = {
+            "status": report["status"],
+            "checker": "native",
+            "invariants": report["invariants"],
+            "unchecked": unchecked,
+            "distinct_states": report["distinct_states"],
+            "depth": report["depth"],
+        }
+        if report["status"] == "FAIL":
+            result["violated"] = report["violated"]
+            result["trace"] = report["trace"]
+        result["context_hash"] = ctx_hash
+        return result
+
+    def _verify_full(self, ctx_hash: str) -> Dict[str, Any]:
+        if self.cache is None or not os.path.exists(self.cfg_path):
+            return self._run_tlc(ctx_hash)
+
+        key = self.cache.key(
+            self.spec_path, self.cfg_path, ctx_hash if self.cache_by_context else None
+        )
+        result = self.cache.get(key)
+        if result is None:
+            with self.cache.key_lock(key):
+                # Another thread may have run TLC for this key while we waited.
+                result = self.cache.peek(key)
+                if result is None:
+                    result = self._run_tlc(ctx_hash)
+                    if result["status"] in ("PASS", "FAIL"):
+                        cached = dict(result)
+                        del cached["context_hash"]
+                        self.cache.put(key, cached)
+                    return result
+        result["context_hash"] = ctx_hash
+        return result
+
+    def _run_tlc(self, ctx_hash: str) -> Dict[str, Any]:
+        if self.worker_pool is not None:
+            try:
+                outcome = self.worker_pool.run(self.spec_path, self.cfg_path, self.timeout_seconds)
+                return self._tlc_result(outcome["exit_code"], outcome["stdout"], outcome["stderr"], ctx_hash)
+            except TLCJobTimeout:
+                return self._timeout_result(ctx_hash)
+            except TLCWorkerError:
+                pass
+
         cmd = [
             "tlc",
             "-config",
@@ -53,14 +334,7 @@ class TLAVerifier:
                 check=False,
                 text=True,
             )
-            passed = proc.returncode == 0
-            return {
-                "status": "PASS" if passed else "FAIL",
-                "exit_code": proc.returncode,
-                "stdout": proc.stdout,
-                "stderr": proc.stderr,
-                "context_hash": ctx_hash,
-            }
+            return self._tlc_result(proc.returncode, proc.stdout, proc.stderr, ctx_hash)
         except FileNotFoundError:
             return {
                 "status": "SKIPPED",
@@ -68,8 +342,23 @@ class TLAVerifier:
                 "context_hash": ctx_hash,
             }
         except subprocess.TimeoutExpired:
-            return {
-                "status": "TIMEOUT",
-                "reason": "tlc_timeout",
-                "context_hash": ctx_hash,
-            }
\ No newline at end of file
+            return self._timeout_result(ctx_hash)
+
+    @staticmethod
+    def _tlc_result(exit_code: int, stdout: str, stderr: str, ctx_hash: str) -> Dict[str, Any]:
+        passed = exit_code == 0
+        return {
+            "status": "PASS" if passed else "FAIL",
+            "exit_code": exit_code,
+            "stdout": stdout,
+            "stderr": stderr,
+            "context_hash": ctx_hash,
+        }
+
+    @staticmethod
+    def _timeout_result(ctx_hash: str) -> Dict[str, Any]:
+        return {
+            "status": "TIMEOUT",
+            "reason": "tlc_timeout",
+            "context_hash": ctx_hash,
+        }
\ No newline at end of file
@@ -3,5 +3,7 @@ Cryptographic components for Axiom Hive.
 
 Includes:
 - C=0-style signature logging
+- Indexed append-only C=0 log store (lookup by hash/label, time scans)
+- Merkle-chained, segmented audit log with inclusion proofs
 - Local homomorphic-style encryption interface
 """
\ No newline at end of file
@@ -2,7 +2,12 @@ import hashlib
 import hmac
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.canonical import DEFAULT_HASH_CACHE, CanonicalHashCache
+from core.metrics import MetricsRegistry
+from crypto.c0_store import C0LogStore
+from crypto.merkle_log import MerkleAuditLog
 
 
 class C0Logger:
@@ -11,31 +16,127 @@ class C0Logger:
 
     Uses HMAC-SHA256 over normalized JSON payloads and writes entries
     to a log directory for audit and replay by external systems.
+
+    Layouts:
+    - "store": append-only data file plus a fixed-record index via
+      C0LogStore, with lookup by hash/label and time-range scans (default)
+    - "files": one pretty-printed JSON file per entry (legacy; a store can
+      be exported to it with `export_files`)
+    - "segments": append-only Merkle-chained segments via MerkleAuditLog,
+      with inclusion proofs and signed checkpoints
     """
 
-    def __init__(self, log_dir: str = "logs/c0", secret_key: bytes = b"axiom_c0_secret") -> None:
+    LAYOUTS = ("store", "files", "segments")
+
+    def __init__(
+        self,
+        log_dir: str = "logs/c0",
+        secret_key: bytes = b"axiom_c0_secret",
+        layout: str = "store",
+        segment_max_entries: int = 65536,
+        checkpoint_interval: int = 1024,
+        hash_cache: Optional[CanonicalHashCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unsupported C0 log layout: {layout}")
         self.log_dir = log_dir
         self.secret_key = secret_key
+        self.layout = layout
+        self._hash_cache = hash_cache or DEFAULT_HASH_CACHE
         os.makedirs(self.log_dir, exist_ok=True)
+        self.audit_log: Optional[MerkleAuditLog] = None
+        self.store: Optional[C0LogStore] = None
+        if layout == "store":
+            self.store = C0LogStore(self.log_dir)
+        if layout == "segments":
+            self.audit_log = MerkleAuditLog(
+                self.log_dir,
+                self.secret_key,
+                segment_max_entries=segment_max_entries,
+                checkpoint_interval=checkpoint_interval,
+            )
+        if metrics is not None:
+            self._instrument(metrics)
+
+    def _instrument(self, metrics: MetricsRegistry) -> None:
+        # Timed wrappers shadow the methods on this instance only.
+        hash_json = self._hash_cache.json
+        sign_and_log = metrics.wrap("c0.sign", self.sign_and_log)
+
+        def payload_hash(payload: Dict[str, Any]) -> str:
+            data, digest = hash_json(payload)
+            metrics.add("bytes_hashed", len(data))
+            return digest.hex()
+
+        self._payload_hash = payload_hash
+        if self.store is not None:
+            # The indexed store knows its size; read it at export time.
+            store, base = self.store, self.store.size_bytes
+            metrics.collect(lambda: {"bytes_logged": store.size_bytes - base})
+            self.sign_and_log = sign_and_log
+            return
+
+        # "files" writes the entry as indented JSON; a "segments" record also
+        # carries its chain fields, so there this counts the entry alone.
+        indent = 2 if self.layout == "files" else None
+
+        def logged(label: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+            entry = sign_and_log(label, payload)
+            metrics.add("bytes_logged", len(json.dumps(entry, indent=indent)))
+            return entry
+
+        self.sign_and_log = logged
 
     def _payload_hash(self, payload: Dict[str, Any]) -> str:
-        enc = json.dumps(payload, sort_keys=True).encode("utf-8")
-        return hashlib.sha256(enc).hexdigest()
+        return self._hash_cache.json_hexdigest(payload)
 
     def _sign(self, payload_hash: str) -> str:
         sig = hmac.new(self.secret_key, payload_hash.encode("utf-8"), hashlib.sha256).hexdigest()
         return sig
 
-    def sign_and_log(self, label: str, payload: Dict[str, Any]) -> Dict[str, str]:
+    def sign_and_log(self, label: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         h = self._payload_hash(payload)
         s = self._sign(h)
-        entry = {
+        entry: Dict[str, Any] = {
             "label": label,
             "hash": h,
             "signature": s,
         }
+        if self.audit_log is not None:
+            # Entry position lets callers request an inclusion proof later.
+            entry["seq"] = self.audit_log.append(entry)["seq"]
+            return entry
+        if self.store is not None:
+            self.store.append(entry)
+            return entry
         filename = f"{label}_{h[:12]}.json"
         path = os.path.join(self.log_dir, filename)
         with open(path, "w", encoding="utf-8") as f:
             json.dump(entry, f, indent=2)
-        return entry
\ No newline at end of file
+        return entry
+
+    def _require_store(self) -> C0LogStore:
+        if self.store is None:
+            raise ValueError(f"Not available with the {self.layout!r} layout")
+        return self.store
+
+    def lookup(self, payload_hash: str) -> List[Dict[str, Any]]:
+        return self._require_store().lookup(payload_hash)
+
+    def scan(
+        self,
+        start_ns: int = 0,
+        end_ns: Optional[int] = None,
+        label: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        return self._require_store().scan(start_ns, end_ns, label)
+
+    def export_files(self, out_dir: str) -> int:
+        return self._require_store().export_files(out_dir)
+
+    def close(self) -> None:
+        if self.audit_log is not None:
+            self.audit_log.close()
+        if self.store is not None:
+            self.store.close()
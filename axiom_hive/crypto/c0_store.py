@@ -0,0 +1,240 @@
+import bisect
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class C0LogStore:
+    """
+    Append-only C=0 entry store: one data file plus one fixed-record index.
+
+    - c0_data.jsonl: one compact JSON entry per line, never rewritten
+    - c0_index.bin: a 64-byte record per entry, in append order:
+      payload hash (32), label key (8), ts_ns (8), data offset (8),
+      data length (4), pad (4)
+    - c0.lock: empty; flocked by writers
+
+    Every entry is kept, including repeats of the same payload. The index is
+    read on open and hashed into memory, so lookups by hash or label are
+    O(1) dict probes plus one read of the data file; timestamps are
+    non-decreasing in index order, so time ranges are a binary search over
+    the index. An append is two buffered writes to already-open
+    files instead of a file creation per entry.
+
+    Several stores (threads or processes) may share a directory, as the
+    one-file-per-entry layout allowed. Appends serialize on an flock of
+    c0.lock, take the data offset from the file itself and first index the
+    records other writers appended; reads pick those up under a shared
+    lock. A torn tail left by a crashed writer is only truncated while
+    holding the exclusive lock, when no other writer can be mid-append.
+    """
+
+    DATA_FILE = "c0_data.jsonl"
+    INDEX_FILE = "c0_index.bin"
+    LOCK_FILE = "c0.lock"
+    RECORD_SIZE = 64
+
+    def __init__(self, log_dir: str, fsync: bool = False) -> None:
+        self.log_dir = log_dir
+        self.fsync = fsync
+        os.makedirs(log_dir, exist_ok=True)
+        self._data_path = os.path.join(log_dir, self.DATA_FILE)
+        self._index_path = os.path.join(log_dir, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        self._lock_fd = os.open(os.path.join(log_dir, self.LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        self._by_hash: Dict[bytes, List[int]] = {}
+        self._by_label: Dict[bytes, List[int]] = {}
+        self._ts: List[int] = []
+        self._offsets: List[int] = []
+        self._lengths: List[int] = []
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            self._data = open(self._data_path, "ab")
+            self._index = open(self._index_path, "ab")
+            self._reader = open(self._data_path, "rb")
+            self._index_reader = open(self._index_path, "rb")
+            self._catch_up(repair=True)
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    # -- index records --
+
+    @staticmethod
+    def _label_key(label: str) -> bytes:
+        return hashlib.blake2b(label.encode("utf-8"), digest_size=8).digest()
+
+    def _add(self, digest: bytes, label_key: bytes, ts_ns: int, offset: int, length: int) -> None:
+        n = len(self._ts)
+        self._by_hash.setdefault(digest, []).append(n)
+        self._by_label.setdefault(label_key, []).append(n)
+        self._ts.append(ts_ns)
+        self._offsets.append(offset)
+        self._lengths.append(length)
+
+    def _catch_up(self, repair: bool) -> None:
+        """
+        Index the records appended since this store last looked.
+
+        Called under the directory flock. With `repair` (exclusive lock
+        held) a torn index record and data past the last indexed entry are
+        truncated; under a shared lock they are left for the writer.
+        """
+        data_size = os.fstat(self._data.fileno()).st_size
+        index_size = os.fstat(self._index.fileno()).st_size
+        known = len(self._ts) * self.RECORD_SIZE
+        whole = index_size - index_size % self.RECORD_SIZE
+        if whole > known:
+            self._index_reader.seek(known)
+            chunk = self._index_reader.read(whole - known)
+            for pos in range(0, len(chunk), self.RECORD_SIZE):
+                rec = chunk[pos : pos + self.RECORD_SIZE]
+                offset = int.from_bytes(rec[48:56], "little")
+                length = int.from_bytes(rec[56:60], "little")
+                if offset + length > data_size:
+                    # Index written ahead of data that never reached disk.
+                    whole = known + pos
+                    break
+                self._add(rec[:32], rec[32:40], int.from_bytes(rec[40:48], "little"), offset, length)
+        if not repair:
+            return
+        # Drop a torn index record and any data appended after the last indexed entry.
+        if whole != index_size:
+            os.truncate(self._index_path, whole)
+        end = self.size_bytes
+        if data_size > end:
+            os.truncate(self._data_path, end)
+
+    def _refresh(self) -> None:
+        # Cheap check first: only lock when another writer has appended.
+        if os.fstat(self._index.fileno()).st_size >= (len(self._ts) + 1) * self.RECORD_SIZE:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_SH)
+            try:
+                self._catch_up(repair=False)
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    # -- writes --
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        """Append a signed entry ({"label", "hash", ...}); returns its record number."""
+        with self._lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                self._catch_up(repair=True)
+                ts_ns = max(time.time_ns(), self._ts[-1] if self._ts else 0)
+                record = dict(entry)
+                record["ts_ns"] = ts_ns
+                line = (json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
+                offset = os.fstat(self._data.fileno()).st_size
+                digest = bytes.fromhex(entry["hash"])
+                label_key = self._label_key(entry["label"])
+                self._data.write(line)
+                self._data.flush()
+                self._index.write(
+                    digest
+                    + label_key
+                    + ts_ns.to_bytes(8, "little")
+                    + offset.to_bytes(8, "little")
+                    + len(line).to_bytes(4, "little")
+                    + bytes(4)
+                )
+                self._index.flush()
+                if self.fsync:
+                    os.fsync(self._data.fileno())
+                    os.fsync(self._index.fileno())
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            self._add(digest, label_key, ts_ns, offset, len(line))
+            return len(self._ts) - 1
+
+    # -- reads --
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ts)
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes in the data file."""
+        return self._offsets[-1] + self._lengths[-1] if self._ts else 0
+
+    def _read(self, n: int) -> Dict[str, Any]:
+        self._reader.seek(self._offsets[n])
+        return json.loads(self._reader.read(self._lengths[n]))
+
+    def get(self, n: int) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return self._read(n)
+
+    def lookup(self, payload_hash: str) -> List[Dict[str, Any]]:
+        """All entries with this payload hash, oldest first."""
+        with self._lock:
+            self._refresh()
+            return [self._read(n) for n in self._by_hash.get(bytes.fromhex(payload_hash), ())]
+
+    def latest(self, payload_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            hits = self._by_hash.get(bytes.fromhex(payload_hash))
+            return self._read(hits[-1]) if hits else None
+
+    def by_label(self, label: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            hits = self._by_label.get(self._label_key(label), ())
+            # Label keys are 64-bit digests; confirm against the stored label.
+            return [e for e in (self._read(n) for n in hits) if e["label"] == label]
+
+    def scan(
+        self,
+        start_ns: int = 0,
+        end_ns: Optional[int] = None,
+        label: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Entries with start_ns <= ts_ns < end_ns, in append order."""
+        with self._lock:
+            self._refresh()
+            lo = bisect.bisect_left(self._ts, start_ns)
+            hi = len(self._ts) if end_ns is None else bisect.bisect_left(self._ts, end_ns)
+        for n in range(lo, hi):
+            entry = self.get(n)
+            if label is None or entry["label"] == label:
+                yield entry
+
+    def export_files(self, out_dir: str) -> int:
+        """
+        Write the legacy one-file-per-entry layout ({label}_{hash[:12]}.json).
+
+        As with the old layout, a later entry with the same label and hash
+        prefix replaces an earlier one. Returns the number of files written.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        latest: Dict[str, Dict[str, Any]] = {}
+        for entry in self.scan():
+            legacy = {k: entry[k] for k in ("label", "hash", "signature")}
+            latest[f"{entry['label']}_{entry['hash'][:12]}.json"] = legacy
+        for filename, legacy in latest.items():
+            with open(os.path.join(out_dir, filename), "w", encoding="utf-8") as f:
+                json.dump(legacy, f, indent=2)
+        return len(latest)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._data.flush()
+            self._index.flush()
+            os.fsync(self._data.fileno())
+            os.fsync(self._index.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            for f in (self._data, self._index, self._reader, self._index_reader):
+                f.close()
+            if self._lock_fd >= 0:
+                os.close(self._lock_fd)
+                self._lock_fd = -1
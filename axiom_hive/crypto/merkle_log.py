@@ -0,0 +1,364 @@
+import glob
+import hashlib
+import hmac
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def _canonical(obj: Dict[str, Any]) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+class MerkleAccumulator:
+    """
+    Incremental Merkle tree (RFC 6962 hashing).
+
+    Every complete subtree node is kept per level, so appending a leaf costs
+    O(log n) hashes amortized and an inclusion proof is O(log n) lookups.
+    The root bags the perfect-subtree peaks right to left, which matches the
+    RFC 6962 Merkle Tree Hash for any tree size.
+    """
+
+    def __init__(self) -> None:
+        self._levels: List[List[bytes]] = [[]]
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    def leaf(self, index: int) -> bytes:
+        return self._levels[0][index]
+
+    def append(self, leaf: bytes) -> int:
+        index = len(self._levels[0])
+        self._levels[0].append(leaf)
+        level, idx = 0, index
+        while idx % 2 == 1:
+            parent = node_hash(self._levels[level][idx - 1], self._levels[level][idx])
+            level += 1
+            if level == len(self._levels):
+                self._levels.append([])
+            self._levels[level].append(parent)
+            idx //= 2
+        return index
+
+    def _peaks(self) -> List[Tuple[int, int]]:
+        # (level, index) of each perfect-subtree peak, left to right.
+        return [
+            (level, len(nodes) - 1)
+            for level, nodes in reversed(list(enumerate(self._levels)))
+            if len(nodes) % 2 == 1
+        ]
+
+    @staticmethod
+    def _bag(hashes: List[bytes]) -> bytes:
+        acc = hashes[-1]
+        for h in reversed(hashes[:-1]):
+            acc = node_hash(h, acc)
+        return acc
+
+    def root(self) -> bytes:
+        if not self._levels[0]:
+            return hashlib.sha256(b"").digest()
+        return self._bag([self._levels[lv][ix] for lv, ix in self._peaks()])
+
+    def proof(self, index: int) -> Dict[str, Any]:
+        if not 0 <= index < len(self):
+            raise IndexError("leaf index out of range")
+        path: List[List[str]] = []
+        level, idx = 0, index
+        while True:
+            sibling = idx ^ 1
+            if sibling >= len(self._levels[level]):
+                break
+            side = "L" if sibling < idx else "R"
+            path.append([side, self._levels[level][sibling].hex()])
+            level, idx = level + 1, idx // 2
+        peaks = self._peaks()
+        pos = peaks.index((level, idx))
+        left = [self._levels[lv][ix].hex() for lv, ix in peaks[:pos]]
+        right_peaks = [self._levels[lv][ix] for lv, ix in peaks[pos + 1 :]]
+        return {
+            "leaf_index": index,
+            "tree_size": len(self),
+            "path": path,
+            "left_peaks": left,
+            "right_bag": self._bag(right_peaks).hex() if right_peaks else None,
+        }
+
+    @staticmethod
+    def verify_proof(leaf: bytes, proof: Dict[str, Any], root: bytes) -> bool:
+        h = leaf
+        for side, sibling_hex in proof["path"]:
+            sibling = bytes.fromhex(sibling_hex)
+            h = node_hash(sibling, h) if side == "L" else node_hash(h, sibling)
+        if proof["right_bag"] is not None:
+            h = node_hash(h, bytes.fromhex(proof["right_bag"]))
+        for peak_hex in reversed(proof["left_peaks"]):
+            h = node_hash(bytes.fromhex(peak_hex), h)
+        return hmac.compare_digest(h, root)
+
+
+class MerkleAuditLog:
+    """
+    Append-only, segmented, hash-chained audit log.
+
+    Each segment is a JSONL file that starts with a header line, followed by
+    entry lines and checkpoint lines. Every entry is hashed into a running
+    chain (chain_i = H(chain_{i-1} || leaf_i), continued across segments)
+    and into the segment's MerkleAccumulator. A signed checkpoint with the
+    current Merkle root and chain head is written every
+    `checkpoint_interval` entries and when the segment is sealed on
+    rotation. Verifying a segment is one sequential read.
+    """
+
+    GENESIS = b"\x00" * 32
+
+    def __init__(
+        self,
+        log_dir: str,
+        secret_key: bytes,
+        segment_max_entries: int = 65536,
+        checkpoint_interval: int = 1024,
+    ) -> None:
+        if segment_max_entries < 1 or checkpoint_interval < 1:
+            raise ValueError("segment_max_entries and checkpoint_interval must be >= 1")
+        self.log_dir = log_dir
+        self.secret_key = secret_key
+        self.segment_max_entries = segment_max_entries
+        self.checkpoint_interval = checkpoint_interval
+        os.makedirs(self.log_dir, exist_ok=True)
+        # (first_seq, segment_index) for every segment on disk, in order.
+        self._segments: List[Tuple[int, int]] = []
+        self._acc = MerkleAccumulator()
+        self._chain = self.GENESIS
+        self._next_seq = 0
+        self._fh = None
+        self._cached_segment: Optional[Tuple[int, MerkleAccumulator]] = None
+        self._recover()
+
+    # -- paths and signing --
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.log_dir, f"segment_{index:06d}.jsonl")
+
+    def _sign(self, body: Dict[str, Any]) -> str:
+        return hmac.new(self.secret_key, _canonical(body), hashlib.sha256).hexdigest()
+
+    # -- recovery --
+
+    @staticmethod
+    def _truncate_torn_line(path: str) -> int:
+        """Cut a trailing line without its newline (a write cut short by a crash); returns the new size."""
+        with open(path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            while pos > 0:
+                step = min(pos, 65536)
+                f.seek(pos - step)
+                block = f.read(step)
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    pos = pos - step + newline + 1
+                    break
+                pos -= step
+            if pos != end:
+                f.truncate(pos)
+        return pos
+
+    def _recover(self) -> None:
+        paths = sorted(glob.glob(os.path.join(self.log_dir, "segment_*.jsonl")))
+        # Only the active (last) segment can hold a torn write; sealed ones are verified as-is.
+        if paths and self._truncate_torn_line(paths[-1]) == 0:
+            os.remove(paths.pop())
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+            self._segments.append((header["first_seq"], header["segment"]))
+        if not self._segments:
+            self._open_segment(0)
+            return
+        index = self._segments[-1][1]
+        report = self.verify_segment(index)
+        if not report["valid"]:
+            raise ValueError(f"Audit segment {index} failed verification: {report['error']}")
+        self._chain = bytes.fromhex(report["chain"])
+        self._next_seq = report["first_seq"] + report["entries"]
+        if report["sealed"]:
+            self._open_segment(index + 1)
+        else:
+            self._acc = self._load_accumulator(index)
+            self._fh = open(self._segment_path(index), "a", encoding="utf-8")
+
+    def _open_segment(self, index: int) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self._acc = MerkleAccumulator()
+        header = {
+            "type": "segment",
+            "segment": index,
+            "first_seq": self._next_seq,
+            "prev_chain": self._chain.hex(),
+            "created_ns": time.time_ns(),
+        }
+        self._fh = open(self._segment_path(index), "a", encoding="utf-8")
+        self._write_line(header)
+        if not self._segments or self._segments[-1][1] != index:
+            self._segments.append((self._next_seq, index))
+
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps(record, sort_keys=True) + "\n")
+        self._fh.flush()
+
+    # -- appends --
+
+    def append(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Append `entry` (JSON-serializable) and return it with its log position."""
+        record = dict(entry)
+        record["seq"] = self._next_seq
+        record["ts_ns"] = time.time_ns()
+        leaf = leaf_hash(_canonical(record))
+        self._chain = hashlib.sha256(self._chain + leaf).digest()
+        self._acc.append(leaf)
+        line = dict(record)
+        line["type"] = "entry"
+        line["leaf"] = leaf.hex()
+        line["chain"] = self._chain.hex()
+        self._write_line(line)
+        self._next_seq += 1
+
+        size = len(self._acc)
+        if size >= self.segment_max_entries:
+            self.rotate()
+        elif size % self.checkpoint_interval == 0:
+            self.checkpoint()
+        return record
+
+    def checkpoint(self, final: bool = False) -> Dict[str, Any]:
+        body = {
+            "segment": self._segments[-1][1],
+            "size": len(self._acc),
+            "root": self._acc.root().hex(),
+            "chain": self._chain.hex(),
+            "ts_ns": time.time_ns(),
+            "final": final,
+        }
+        line = dict(body)
+        line["type"] = "checkpoint"
+        line["signature"] = self._sign(body)
+        self._write_line(line)
+        return line
+
+    def rotate(self) -> None:
+        """Seal the active segment with a final checkpoint and start the next one."""
+        self.checkpoint(final=True)
+        self._open_segment(self._segments[-1][1] + 1)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    # -- reads, proofs and verification --
+
+    def _iter_segment(self, index: int) -> Iterator[Dict[str, Any]]:
+        with open(self._segment_path(index), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _load_accumulator(self, index: int) -> MerkleAccumulator:
+        acc = MerkleAccumulator()
+        for rec in self._iter_segment(index):
+            if rec.get("type") == "entry":
+                acc.append(bytes.fromhex(rec["leaf"]))
+        return acc
+
+    def _locate(self, seq: int) -> Tuple[int, int]:
+        if not 0 <= seq < self._next_seq:
+            raise IndexError("sequence number not in log")
+        for first_seq, index in reversed(self._segments):
+            if seq >= first_seq:
+                return index, seq - first_seq
+        raise IndexError("sequence number not in log")
+
+    def root(self) -> str:
+        return self._acc.root().hex()
+
+    def prove(self, seq: int) -> Dict[str, Any]:
+        """Inclusion proof for entry `seq` against its segment's current root."""
+        index, leaf_index = self._locate(seq)
+        if index == self._segments[-1][1]:
+            acc = self._acc
+        else:
+            if self._cached_segment is None or self._cached_segment[0] != index:
+                self._cached_segment = (index, self._load_accumulator(index))
+            acc = self._cached_segment[1]
+        proof = acc.proof(leaf_index)
+        proof["segment"] = index
+        proof["leaf"] = acc.leaf(leaf_index).hex()
+        proof["root"] = acc.root().hex()
+        return proof
+
+    def verify_segment(self, index: int) -> Dict[str, Any]:
+        """Recompute leaves, chain, Merkle roots and checkpoint MACs in one pass."""
+        acc = MerkleAccumulator()
+        chain = b""
+        first_seq = 0
+        sealed = False
+        checkpoints = 0
+        try:
+            for n, rec in enumerate(self._iter_segment(index)):
+                kind = rec.get("type")
+                if n == 0:
+                    if kind != "segment" or rec["segment"] != index:
+                        raise ValueError("missing segment header")
+                    chain = bytes.fromhex(rec["prev_chain"])
+                    first_seq = rec["first_seq"]
+                    continue
+                if sealed:
+                    raise ValueError("records after final checkpoint")
+                if kind == "entry":
+                    body = {k: v for k, v in rec.items() if k not in ("type", "leaf", "chain")}
+                    if body["seq"] != first_seq + len(acc):
+                        raise ValueError(f"sequence gap at {body['seq']}")
+                    leaf = leaf_hash(_canonical(body))
+                    if leaf.hex() != rec["leaf"]:
+                        raise ValueError(f"leaf mismatch at {body['seq']}")
+                    chain = hashlib.sha256(chain + leaf).digest()
+                    if chain.hex() != rec["chain"]:
+                        raise ValueError(f"chain mismatch at {body['seq']}")
+                    acc.append(leaf)
+                elif kind == "checkpoint":
+                    body = {k: v for k, v in rec.items() if k not in ("type", "signature")}
+                    if not hmac.compare_digest(self._sign(body), rec["signature"]):
+                        raise ValueError("bad checkpoint signature")
+                    if body["size"] != len(acc) or body["root"] != acc.root().hex():
+                        raise ValueError("checkpoint root mismatch")
+                    if body["chain"] != chain.hex():
+                        raise ValueError("checkpoint chain mismatch")
+                    checkpoints += 1
+                    sealed = bool(body["final"])
+                else:
+                    raise ValueError(f"unknown record type {kind!r}")
+        except (ValueError, KeyError, TypeError) as exc:
+            return {"segment": index, "valid": False, "error": str(exc)}
+        return {
+            "segment": index,
+            "valid": True,
+            "first_seq": first_seq,
+            "entries": len(acc),
+            "checkpoints": checkpoints,
+            "sealed": sealed,
+            "root": acc.root().hex(),
+            "chain": chain.hex(),
+        }
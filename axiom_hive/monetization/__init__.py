@@ -1,5 +1,7 @@
 """
 Monetization and access control for Axiom Hive.
 
-Implements a local L402-style gate with invoice and token handling.
+Implements a local L402-style gate with invoice and token handling, on
+shared invoice/token types, an expiring token store and persistence
+backends (store.py).
 """
\ No newline at end of file
@@ -1,6 +1,8 @@
 import time
 from typing import Dict, Optional
 
+from monetization.store import ExpiringTokenStore, Invoice, L402Token, MonetizationBackend
+
 
 class L402Gate:
     """
@@ -9,36 +11,88 @@ class L402Gate:
     - Creates invoices for specific purposes
     - Issues tokens bound to invoice IDs
     - Verifies tokens for gating high-value operations
+
+    Tokens expire after `token_ttl_seconds` and are held in a bounded
+    expiry-indexed store of at most `token_capacity` entries. An optional
+    `backend` (e.g. SQLiteMonetizationBackend) persists invoices and tokens;
+    the in-memory maps then act as a write-through cache.
     """
 
-    def __init__(self, sats_per_call: int = 1000) -> None:
+    def __init__(
+        self,
+        sats_per_call: int = 1000,
+        token_ttl_seconds: int = 3600,
+        token_capacity: int = 1_000_000,
+        backend: Optional[MonetizationBackend] = None,
+    ) -> None:
         self.sats_per_call = sats_per_call
+        self.token_ttl_seconds = token_ttl_seconds
+        self._backend = backend or MonetizationBackend()
         self._invoices: Dict[str, Dict[str, str]] = {}
-        self._tokens: Dict[str, Dict[str, str]] = {}
+        self._invoice_seq = self._backend.count_invoices()
+        self._tokens = ExpiringTokenStore(capacity=token_capacity)
 
     def _now(self) -> int:
         return int(time.time())
 
-    def create_invoice(self, purpose: str) -> Dict[str, str]:
-        invoice_id = f"inv_{self._now()}_{len(self._invoices)+1}"
-        invoice = {
+    @staticmethod
+    def _invoice_dict(invoice_id: str, amount_sats: int, purpose: str) -> Dict[str, str]:
+        return {
             "id": invoice_id,
-            "amount_sats": str(self.sats_per_call),
+            "amount_sats": str(amount_sats),
             "purpose": purpose,
             "bolt11": f"ln_stub_{invoice_id}",
         }
+
+    def create_invoice(self, purpose: str) -> Dict[str, str]:
+        # Sequence continues from persisted invoices so IDs stay unique across restarts.
+        self._invoice_seq += 1
+        invoice_id = f"inv_{self._now()}_{self._invoice_seq}"
+        invoice = self._invoice_dict(invoice_id, self.sats_per_call, purpose)
         self._invoices[invoice_id] = invoice
+        self._backend.add_invoices(
+            [Invoice(invoice_id=invoice_id, amount_sats=self.sats_per_call, description=purpose)]
+        )
         return invoice
 
-    def issue_token(self, invoice_id: str) -> Optional[str]:
-        if invoice_id not in self._invoices:
-            return None
-        token = f"tok_{invoice_id}_{self._now()}"
-        self._tokens[token] = {
+    def _has_invoice(self, invoice_id: str) -> bool:
+        if invoice_id in self._invoices:
+            return True
+        stored = self._backend.get_invoice(invoice_id)
+        if stored is None:
+            return False
+        self._invoices[invoice_id] = self._invoice_dict(
+            stored.invoice_id, stored.amount_sats, stored.description
+        )
+        return True
+
+    def _token_info(self, invoice_id: str, expires_at_ns: int) -> Dict[str, str]:
+        expires_at = expires_at_ns // 1_000_000_000
+        return {
             "invoice_id": invoice_id,
-            "issued_at": str(self._now()),
+            "issued_at": str(expires_at - self.token_ttl_seconds),
+            "expires_at": str(expires_at),
         }
+
+    def issue_token(self, invoice_id: str) -> Optional[str]:
+        if not self._has_invoice(invoice_id):
+            return None
+        # Expiry is kept in ns, the unit shared with MonetizationManager tokens.
+        issued_at_ns = time.time_ns()
+        expires_at_ns = issued_at_ns + self.token_ttl_seconds * 1_000_000_000
+        token = f"tok_{invoice_id}_{issued_at_ns // 1_000_000_000}"
+        self._tokens.put(token, self._token_info(invoice_id, expires_at_ns), expires_at_ns)
+        self._backend.add_token(L402Token(token=token, resource_id=invoice_id, expires_at_ns=expires_at_ns))
         return token
 
     def verify_token(self, token: str) -> bool:
-        return token in self._tokens
\ No newline at end of file
+        if self._tokens.get(token) is not None:
+            return True
+        stored = self._backend.get_token(token)
+        if stored is None or time.time_ns() > stored.expires_at_ns:
+            return False
+        self._tokens.put(token, self._token_info(stored.resource_id, stored.expires_at_ns), stored.expires_at_ns)
+        return True
+
+    def close(self) -> None:
+        self._backend.close()
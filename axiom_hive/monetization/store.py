@@ -0,0 +1,267 @@
+import heapq
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class Invoice:
+    invoice_id: str
+    amount_sats: int
+    description: str
+    settled: bool = False
+
+
+@dataclass
+class L402Token:
+    token: str
+    resource_id: str
+    expires_at_ns: int
+
+
+class ExpiringTokenStore:
+    """
+    Bounded token map with a time-ordered expiry index.
+
+    Lookups are O(1) dict hits in an LRU-ordered map. Expiry times live in a
+    min-heap; expired entries are dropped lazily on lookup, in small batches
+    on insert, and optionally by a background sweeper thread. When the store
+    is full after evicting expired entries, the least recently used token is
+    evicted. Expiry is strict: an entry is valid while `clock() <= expires_at`.
+    """
+
+    # Expired heap entries reclaimed per insert (amortized lazy eviction).
+    EVICT_BUDGET = 4
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        clock: Callable[[], int] = time.time_ns,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+        self.evicted_expired = 0
+        self.evicted_lru = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, token: str, value: Any, expires_at: int) -> None:
+        with self._lock:
+            self._entries[token] = (value, expires_at)
+            self._entries.move_to_end(token)
+            heapq.heappush(self._expiry_heap, (expires_at, token))
+            self._evict_expired_locked(self._clock(), self.EVICT_BUDGET)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evicted_lru += 1
+            # Stale heap entries (overwritten or LRU-evicted) are compacted
+            # once they dominate, keeping the index O(live tokens).
+            if len(self._expiry_heap) > 2 * len(self._entries) + 1024:
+                self._expiry_heap = [
+                    (exp, tok) for tok, (_, exp) in self._entries.items()
+                ]
+                heapq.heapify(self._expiry_heap)
+
+    def get(self, token: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if self._clock() > expires_at:
+                del self._entries[token]
+                self.evicted_expired += 1
+                return None
+            self._entries.move_to_end(token)
+            return value
+
+    def evict_expired(self, budget: Optional[int] = None) -> int:
+        with self._lock:
+            return self._evict_expired_locked(self._clock(), budget)
+
+    def _evict_expired_locked(self, now: int, budget: Optional[int]) -> int:
+        heap = self._expiry_heap
+        evicted = 0
+        while heap and heap[0][0] < now and (budget is None or evicted < budget):
+            expires_at, token = heapq.heappop(heap)
+            entry = self._entries.get(token)
+            # Skip stale index entries whose token was re-issued or evicted.
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[token]
+                evicted += 1
+        self.evicted_expired += evicted
+        return evicted
+
+    def start_sweeper(self, interval_seconds: float = 1.0) -> None:
+        if self._sweeper is not None:
+            return
+        self._stop_sweeper.clear()
+
+        def _sweep() -> None:
+            while not self._stop_sweeper.wait(interval_seconds):
+                self.evict_expired()
+
+        self._sweeper = threading.Thread(target=_sweep, name="l402-token-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._stop_sweeper.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+
+class MonetizationBackend:
+    """
+    Persistence interface for invoices and stored L402 tokens.
+
+    The base class keeps nothing, which is the historical in-memory
+    behaviour: the manager's own maps are the only copy. Token expiry
+    (`L402Token.expires_at_ns`) is always ns since the epoch.
+    """
+
+    def add_invoices(self, invoices: Sequence[Invoice]) -> None:
+        pass
+
+    def get_invoice(self, invoice_id: str) -> Optional[Invoice]:
+        return None
+
+    def mark_settled(self, invoice_id: str) -> bool:
+        return False
+
+    def count_invoices(self) -> int:
+        return 0
+
+    def add_token(self, token: L402Token) -> None:
+        pass
+
+    def get_token(self, token_value: str) -> Optional[L402Token]:
+        return None
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteMonetizationBackend(MonetizationBackend):
+    """
+    Crash-safe local SQLite store.
+
+    Runs in WAL mode with one connection guarded by a lock. By default
+    every invoice is committed before `create_invoice` returns. A larger
+    `invoice_batch_size` buffers new invoices and inserts them that many at
+    a time in one transaction, trading up to `invoice_batch_size - 1`
+    invoices lost on a crash for fewer commits; any read, settlement or
+    `flush()` drains the buffer first. Tokens and settlements are always
+    written immediately. SQL text is fixed so sqlite3's statement cache
+    reuses prepared statements.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS invoices ("
+        " invoice_id TEXT PRIMARY KEY, amount_sats INTEGER NOT NULL,"
+        " description TEXT NOT NULL, settled INTEGER NOT NULL DEFAULT 0)",
+        "CREATE TABLE IF NOT EXISTS tokens ("
+        " token TEXT PRIMARY KEY, resource_id TEXT NOT NULL, expires_at INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS tokens_expires_at ON tokens (expires_at)",
+    )
+    _INSERT_INVOICE = (
+        "INSERT OR REPLACE INTO invoices (invoice_id, amount_sats, description, settled)"
+        " VALUES (?, ?, ?, ?)"
+    )
+    _SELECT_INVOICE = (
+        "SELECT invoice_id, amount_sats, description, settled FROM invoices WHERE invoice_id = ?"
+    )
+    _SETTLE_INVOICE = "UPDATE invoices SET settled = 1 WHERE invoice_id = ?"
+    _COUNT_INVOICES = "SELECT COUNT(*) FROM invoices"
+    _INSERT_TOKEN = "INSERT OR REPLACE INTO tokens (token, resource_id, expires_at) VALUES (?, ?, ?)"
+    _SELECT_TOKEN = "SELECT token, resource_id, expires_at FROM tokens WHERE token = ?"
+    _PURGE_TOKENS = "DELETE FROM tokens WHERE expires_at < ?"
+
+    def __init__(self, path: str, invoice_batch_size: int = 1) -> None:
+        self.path = path
+        self.invoice_batch_size = invoice_batch_size
+        self._lock = threading.Lock()
+        self._pending: List[Invoice] = []
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in self._SCHEMA:
+            self._conn.execute(stmt)
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        rows = [
+            (inv.invoice_id, inv.amount_sats, inv.description, int(inv.settled))
+            for inv in self._pending
+        ]
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(self._INSERT_INVOICE, rows)
+        self._pending = []
+
+    def add_invoices(self, invoices: Sequence[Invoice]) -> None:
+        with self._lock:
+            self._pending.extend(invoices)
+            if len(self._pending) >= self.invoice_batch_size:
+                self._flush_locked()
+
+    def get_invoice(self, invoice_id: str) -> Optional[Invoice]:
+        with self._lock:
+            self._flush_locked()
+            row = self._conn.execute(self._SELECT_INVOICE, (invoice_id,)).fetchone()
+        if row is None:
+            return None
+        return Invoice(invoice_id=row[0], amount_sats=row[1], description=row[2], settled=bool(row[3]))
+
+    def mark_settled(self, invoice_id: str) -> bool:
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(self._SETTLE_INVOICE, (invoice_id,)).rowcount > 0
+
+    def count_invoices(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(self._COUNT_INVOICES).fetchone()[0]
+
+    def add_token(self, token: L402Token) -> None:
+        with self._lock:
+            self._conn.execute(
+                self._INSERT_TOKEN, (token.token, token.resource_id, token.expires_at_ns)
+            )
+
+    def get_token(self, token_value: str) -> Optional[L402Token]:
+        with self._lock:
+            row = self._conn.execute(self._SELECT_TOKEN, (token_value,)).fetchone()
+        if row is None:
+            return None
+        return L402Token(token=row[0], resource_id=row[1], expires_at_ns=row[2])
+
+    def purge_expired_tokens(self, now_ns: int) -> int:
+        """Delete tokens that expired before `now_ns` (ns since the epoch)."""
+        with self._lock:
+            return self._conn.execute(self._PURGE_TOKENS, (now_ns,)).rowcount
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
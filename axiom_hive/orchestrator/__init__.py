@@ -6,4 +6,7 @@ Coordinates:
 - TLAVerifier checks
 - C0Logger signature generation
 - Optional homomorphic wrapper
+- Concurrent execution (execute_async, run_many)
+- Pipeline as a dependency graph (execute_dag)
+- Multi-process sharding by session (sharded_swarm.ShardedOmegaSwarm)
 """
\ No newline at end of file
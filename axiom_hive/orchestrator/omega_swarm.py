@@ -1,7 +1,12 @@
-import hashlib
-import json
-from typing import Any, Dict, List
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+from core.agent_orchestration import DAGManager, DAGRun
+from core.canonical import DEFAULT_HASH_CACHE, CanonicalHashCache
+from core.metrics import MetricsRegistry
 from core.inference.engine import HybridSSMEngine
 from core.verify.verifier import TLAVerifier
 from crypto.c0_signatures import C0Logger
@@ -18,6 +23,10 @@ class OmegaSwarm:
     - C=0 signature logging
 
     Produces an ordered task list and hashes for audit.
+
+    `execute_async` and `run_many` pipeline independent requests: while one
+    request waits on its verifier subprocess, later requests run inference
+    and earlier ones are signed.
     """
 
     def __init__(
@@ -26,15 +35,36 @@ class OmegaSwarm:
         verifier: TLAVerifier,
         c0_logger: C0Logger,
         fhe_layer: LocalDeoxysCKKS,
+        hash_cache: Optional[CanonicalHashCache] = None,
+        verifier_workers: int = 8,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
         self.engine = engine
         self.verifier = verifier
         self.c0 = c0_logger
         self.fhe = fhe_layer
+        self._hash_cache = hash_cache or DEFAULT_HASH_CACHE
+        # Worker pools for execute_async/run_many, created on first use.
+        self.verifier_workers = verifier_workers
+        self._pool_lock = threading.Lock()
+        self._infer_pool: Optional[ThreadPoolExecutor] = None
+        self._verify_pool: Optional[ThreadPoolExecutor] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._sign_tail: Optional["asyncio.Future[None]"] = None
+        self.metrics = metrics
+        if metrics is not None:
+            self._instrument(metrics)
+
+    def _instrument(self, metrics: MetricsRegistry) -> None:
+        # Timed wrappers shadow the stage methods on this instance only, so
+        # execute, execute_async and execute_dag are all covered.
+        self.execute = metrics.wrap("omega.execute", self.execute)
+        self._infer = metrics.wrap("omega.inference", self._infer)
+        self._verify = metrics.wrap("omega.verification", self._verify)
+        self._sign = metrics.wrap("omega.signature", self._sign)
 
     def _hash_task_payload(self, payload: Dict[str, Any]) -> str:
-        enc = json.dumps(payload, sort_keys=True).encode("utf-8")
-        return hashlib.sha256(enc).hexdigest()
+        return self._hash_cache.json_hexdigest(payload)
 
     def execute(
         self,
@@ -42,6 +72,64 @@ class OmegaSwarm:
         prompt: str,
         context: Dict[str, Any],
     ) -> Dict[str, Any]:
+        # Objects hashed by several stages are canonicalized once per request.
+        with self._hash_cache.request_scope():
+            tasks, inference_output = self._infer(mode, prompt, context)
+            verification_result = self._verify(mode, inference_output, tasks)
+            signature_entry = self._sign(mode, prompt, context, inference_output, verification_result, tasks)
+        return self._result(mode, tasks, inference_output, verification_result, signature_entry)
+
+    def pipeline_dag(self) -> DAGManager:
+        """The inference -> verification -> signature chain as a DAG over (mode, prompt, context)."""
+        dag = DAGManager(max_workers=1)
+        # Stages update engine state or the C=0 log, so none is memoized.
+        dag.add(
+            "inference",
+            self._infer,
+            ("mode", "prompt", "context"),
+            ("tasks", "inference_output"),
+            executor="inline",
+            pure=False,
+        )
+        dag.add(
+            "verification",
+            self._verify,
+            ("mode", "inference_output", "tasks"),
+            ("verification_result",),
+            executor="inline",
+            pure=False,
+        )
+        dag.add(
+            "signature",
+            self._sign,
+            ("mode", "prompt", "context", "inference_output", "verification_result", "tasks"),
+            ("signature_entry",),
+            executor="inline",
+            pure=False,
+        )
+        return dag
+
+    def execute_dag(
+        self,
+        mode: str,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> Tuple[Dict[str, Any], DAGRun]:
+        """`execute` through `pipeline_dag`; also returns the run (timings, critical path)."""
+        with self._hash_cache.request_scope():
+            run = self.pipeline_dag().run({"mode": mode, "prompt": prompt, "context": context})
+        v = run.values
+        result = self._result(mode, v["tasks"], v["inference_output"], v["verification_result"], v["signature_entry"])
+        return result, run
+
+    # -- pipeline stages --
+
+    def _infer(
+        self,
+        mode: str,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         tasks: List[Dict[str, Any]] = []
 
         # Task 1: Inference
@@ -56,7 +144,14 @@ class OmegaSwarm:
             "payload_hash": self._hash_task_payload(inference_payload),
         }
         tasks.append(t1)
+        return tasks, inference_output
 
+    def _verify(
+        self,
+        mode: str,
+        inference_output: Dict[str, Any],
+        tasks: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         # Task 2: Verification (verified/hybrid)
         verification_result: Dict[str, Any] = {"status": "SKIPPED"}
         if mode in ("verified", "hybrid"):
@@ -66,7 +161,17 @@ class OmegaSwarm:
                 "payload_hash": self._hash_task_payload(verification_result),
             }
             tasks.append(t2)
+        return verification_result
 
+    def _sign(
+        self,
+        mode: str,
+        prompt: str,
+        context: Dict[str, Any],
+        inference_output: Dict[str, Any],
+        verification_result: Dict[str, Any],
+        tasks: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         # Task 3: C=0 Signature
         pipeline_payload = {
             "mode": mode,
@@ -81,11 +186,137 @@ class OmegaSwarm:
             "payload_hash": self._hash_task_payload(signature_entry),
         }
         tasks.append(t3)
+        return signature_entry
 
+    @staticmethod
+    def _result(
+        mode: str,
+        tasks: List[Dict[str, Any]],
+        inference_output: Dict[str, Any],
+        verification_result: Dict[str, Any],
+        signature_entry: Dict[str, Any],
+    ) -> Dict[str, Any]:
         return {
             "mode": mode,
             "tasks": tasks,
             "inference_output": inference_output,
             "verification": verification_result,
             "c0_signature": signature_entry,
-        }
\ No newline at end of file
+        }
+
+    # -- concurrent execution --
+
+    def _pools(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor, ThreadPoolExecutor]:
+        with self._pool_lock:
+            if self._verify_pool is None:
+                # Single-thread pools run their stage strictly in admission order:
+                # inference (the engine state is sequential) and C0 signing.
+                self._infer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="omega-infer")
+                self._verify_pool = ThreadPoolExecutor(
+                    max_workers=self.verifier_workers, thread_name_prefix="omega-verify"
+                )
+                self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="omega-io")
+            return self._infer_pool, self._verify_pool, self._io_pool
+
+    @staticmethod
+    def _submit(pool: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        # Submitted now (not on first await) with the caller's context, so the
+        # request's hash scope follows it into the pool.
+        ctx = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(pool, ctx.run, fn, *args)
+
+    async def execute_async(
+        self,
+        mode: str,
+        prompt: str,
+        context: Dict[str, Any],
+        on_task: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Asynchronous `execute`: same stages, tasks and hashes.
+
+        Inference is queued on the ordered inference thread before the first
+        await, so engine state advances in call order while the event loop
+        stays free. Verification runs on the bounded verifier pool and C=0
+        signing on the I/O thread; signatures are committed in call order,
+        so the audit log is independent of which verification finishes
+        first. `on_task` is called on the event loop with each task record
+        as its stage completes.
+        """
+        infer_pool, verify_pool, io_pool = self._pools()
+        previous = self._sign_tail
+        turn = asyncio.get_running_loop().create_future()
+        self._sign_tail = turn
+        try:
+            with self._hash_cache.request_scope():
+                tasks, inference_output = await self._submit(
+                    infer_pool, self._infer, mode, prompt, context
+                )
+                if on_task is not None:
+                    on_task(tasks[-1])
+                verification_result = await self._submit(
+                    verify_pool, self._verify, mode, inference_output, tasks
+                )
+                if on_task is not None and len(tasks) > 1:
+                    on_task(tasks[-1])
+                if previous is not None and not previous.done():
+                    await asyncio.shield(previous)
+                signature_entry = await self._submit(
+                    io_pool,
+                    self._sign,
+                    mode,
+                    prompt,
+                    context,
+                    inference_output,
+                    verification_result,
+                    tasks,
+                )
+                if on_task is not None:
+                    on_task(tasks[-1])
+        finally:
+            # A turn that failed before signing still holds its slot until
+            # every earlier turn has signed, so later turns keep log order.
+            if previous is None or previous.done():
+                turn.set_result(None)
+            else:
+                previous.add_done_callback(lambda _: turn.set_result(None))
+        return self._result(mode, tasks, inference_output, verification_result, signature_entry)
+
+    async def run_many(
+        self,
+        requests: Iterable[Tuple[str, str, Dict[str, Any]]],
+        max_in_flight: int = 32,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute (mode, prompt, context) requests concurrently; results in input order.
+
+        At most `max_in_flight` requests are admitted at once and `requests`
+        is consumed lazily, so a long or unbounded producer is throttled
+        instead of being buffered in memory.
+        """
+        slots = asyncio.Semaphore(max_in_flight)
+        pending: List["asyncio.Task[Dict[str, Any]]"] = []
+
+        async def admitted(mode: str, prompt: str, context: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return await self.execute_async(mode, prompt, context)
+            finally:
+                slots.release()
+
+        try:
+            for mode, prompt, context in requests:
+                await slots.acquire()
+                # Tasks start in creation order, so inference is queued in input order.
+                pending.append(asyncio.ensure_future(admitted(mode, prompt, context)))
+            return list(await asyncio.gather(*pending))
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+    def close(self) -> None:
+        with self._pool_lock:
+            for pool in (self._infer_pool, self._verify_pool, self._io_pool):
+                if pool is not None:
+                    pool.shutdown(wait=True)
+            self._infer_pool = self._verify_pool = self._io_pool = None
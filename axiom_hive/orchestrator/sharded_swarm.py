@@ -0,0 +1,232 @@
+import json
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.agent_orchestration import ShardingManager
+from core.canonical import DEFAULT_HASH_CACHE
+from orchestrator.omega_swarm import OmegaSwarm
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+def session_key(request: Request) -> str:
+    """Shard key: the context's session id, else the canonical context hash."""
+    _mode, _prompt, context = request
+    session = context.get("session_id")
+    if session is not None:
+        return str(session)
+    return DEFAULT_HASH_CACHE.json_hexdigest(context)
+
+
+# -- shared-memory transport --
+# A batch crosses the process boundary as one compact JSON document in a
+# shared-memory block; the pipe only carries the block name and size. The
+# receiver reads the block and unlinks it.
+
+
+def _put(obj: Any) -> Tuple[str, int]:
+    data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    shm = SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[: len(data)] = data
+    name = shm.name
+    shm.close()
+    return name, len(data)
+
+
+def _take(name: str, size: int) -> Any:
+    shm = SharedMemory(name=name)
+    try:
+        return json.loads(bytes(shm.buf[:size]))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _discard(name: str) -> None:
+    # Unlink a block whose receiver died before taking it.
+    try:
+        shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _shard_worker(factory: Callable[[int], OmegaSwarm], shard: int, conn: Connection) -> None:
+    swarm = factory(shard)
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == "close":
+                break
+            try:
+                batch = _take(message[1], message[2])
+                results = [[seq, swarm.execute(mode, prompt, context)] for seq, mode, prompt, context in batch]
+                conn.send(("done",) + _put(results))
+            except Exception as exc:  # reported to the parent, which raises it
+                conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        swarm.c0.close()
+        conn.close()
+
+
+class ShardedOmegaSwarm:
+    """
+    OmegaSwarm pipeline sharded across worker processes.
+
+    `factory(shard)` builds the OmegaSwarm owned by one shard, with its own
+    engine and its own C=0 log directory. Requests are assigned to shards by
+    consistent hashing of `key(request)` (session id by default), so a
+    session's engine state lives in exactly one process and its requests
+    run there in input order. Each shard's work is sent as batches of up to
+    `batch_size` requests over shared memory, and results are reassembled
+    in input order.
+
+    Results depend only on the inputs and the shard count: a run equals
+    running each shard's requests, in order, through its own OmegaSwarm.
+    `processes=False` does exactly that in-process (reference and 1-core
+    fallback).
+
+    Workers are started with `start_method` ("fork" by default, so any
+    factory works, closures included). A forked child inherits only the
+    calling thread, so with "fork" the parent must not be running other
+    threads (executors, loggers, servers) when the workers start: a lock
+    held by one of them at fork time stays locked in every worker. Parents
+    that already run threads should pass "forkserver" or "spawn" together
+    with a picklable factory (a module-level function or a
+    `functools.partial` of one). A worker that dies mid-run makes `run_many`
+    raise `RuntimeError("shard N died")`; close and rebuild the runner.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], OmegaSwarm],
+        shards: Optional[int] = None,
+        key: Callable[[Request], str] = session_key,
+        batch_size: int = 256,
+        processes: bool = True,
+        start_method: str = "fork",
+    ) -> None:
+        self.factory = factory
+        self.shards = shards or multiprocessing.cpu_count()
+        self.key = key
+        self.batch_size = batch_size
+        self.processes = processes
+        self.start_method = start_method
+        self.sharding = ShardingManager(self.shards)
+        self._conns: List[Connection] = []
+        self._procs: List[multiprocessing.Process] = []
+        self._local: Dict[int, OmegaSwarm] = {}
+
+    def start(self) -> None:
+        if not self.processes or self._procs:
+            return
+        # Workers must share the parent's tracker, or each would report the
+        # blocks it created (and the parent unlinked) as leaked.
+        resource_tracker.ensure_running()
+        # fork: the factory (and any closures it holds) is inherited, not
+        # pickled; forkserver/spawn pickle it instead.
+        ctx = multiprocessing.get_context(self.start_method)
+        for shard in range(self.shards):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_shard_worker, args=(self.factory, shard, child), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def run_many(self, requests: Sequence[Request]) -> List[Dict[str, Any]]:
+        """Execute requests; results are in input order."""
+        parts = self.sharding.partition(requests, self.key)
+        if not self.processes:
+            return self._run_local(parts, len(requests))
+        self.start()
+        queues = {
+            shard: [
+                [[seq, mode, prompt, context] for seq, (mode, prompt, context) in part[i : i + self.batch_size]]
+                for i in range(0, len(part), self.batch_size)
+            ]
+            for shard, part in parts.items()
+        }
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        busy: Dict[Connection, int] = {}
+        # Block sent to each busy shard; the worker unlinks it once taken.
+        blocks: Dict[int, str] = {}
+        error: Optional[RuntimeError] = None
+
+        def died(shard: int) -> None:
+            nonlocal error
+            _discard(blocks.pop(shard))
+            error = error or RuntimeError(f"shard {shard} died")
+
+        def send_next(shard: int) -> None:
+            if queues[shard]:
+                name, size = _put(queues[shard].pop(0))
+                blocks[shard] = name
+                try:
+                    self._conns[shard].send(("batch", name, size))
+                except OSError:
+                    died(shard)
+                    return
+                busy[self._conns[shard]] = shard
+
+        for shard in queues:
+            if error is None:
+                send_next(shard)
+        while busy:
+            for conn in wait(list(busy)):
+                shard = busy.pop(conn)
+                try:
+                    reply = conn.recv()
+                except (EOFError, OSError):
+                    died(shard)
+                    continue
+                del blocks[shard]
+                if reply[0] == "error":
+                    error = error or RuntimeError(f"shard {shard}: {reply[1]}")
+                    continue
+                for seq, result in _take(reply[1], reply[2]):
+                    results[seq] = result
+                if error is None:
+                    send_next(shard)
+        if error is not None:
+            raise error
+        return results
+
+    def _run_local(self, parts: Dict[int, List[Tuple[int, Request]]], n: int) -> List[Dict[str, Any]]:
+        results: List[Optional[Dict[str, Any]]] = [None] * n
+        for shard, part in parts.items():
+            if shard not in self._local:
+                self._local[shard] = self.factory(shard)
+            swarm = self._local[shard]
+            for seq, (mode, prompt, context) in part:
+                # Same JSON round trip as the process transport.
+                results[seq] = json.loads(json.dumps(swarm.execute(mode, prompt, context)))
+        return results
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("close",))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.kill()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._procs = [], []
+        for swarm in self._local.values():
+            swarm.c0.close()
+        self._local = {}
+
+    def __enter__(self) -> "ShardedOmegaSwarm":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
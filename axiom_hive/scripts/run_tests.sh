@@ -10,6 +10,36 @@ from core.inference.engine import run_engine_example
 run_engine_example()
 EOF
 
+echo "[Axiom Hive] Array engine bit-exact reproducibility test"
+python3 - << 'EOF'
+from core.inference.engine import ArrayHybridSSMEngine, HybridSSMEngine
+for hidden_size in (1, 31, 128, 4096):
+    ref = HybridSSMEngine(hidden_size)
+    arr = ArrayHybridSSMEngine(hidden_size)
+    for i in range(8):
+        ctx = {"step": i, "task": "math-check"}
+        assert ref.generate(f"Verify: {i}+{i}", ctx) == arr.generate(f"Verify: {i}+{i}", ctx)
+    assert list(ref._state) == list(arr._state), hidden_size
+raw_a = ArrayHybridSSMEngine(4096, digest_mode="raw")
+raw_b = ArrayHybridSSMEngine(4096, digest_mode="raw")
+assert raw_a.generate("Verify: 2+2=4") == raw_b.generate("Verify: 2+2=4")
+print("compat digests identical, raw digests reproducible")
+EOF
+
+echo "[Axiom Hive] Batched engine equivalence test"
+python3 - << 'EOF'
+from core.inference.engine import BatchedHybridSSMEngine, HybridSSMEngine
+batched = BatchedHybridSSMEngine(128, initial_sessions=2)
+handles = [batched.open_session() for _ in range(3)]
+sequential = {h: HybridSSMEngine(128) for h in handles}
+requests = [(handles[i % 3], f"prompt {i}", {"turn": i}) for i in range(7)]
+requests.append((handles[0], "repeat session", None))
+outputs = batched.generate_batch(requests)
+expected = [sequential[h].generate(p, c) for h, p, c in requests]
+assert outputs == expected
+print("batch == sequential:", outputs == expected)
+EOF
+
 echo "[Axiom Hive] Verification wrapper test"
 python3 - << 'EOF'
 from core.verify.verifier import TLAVerifier
@@ -18,24 +48,886 @@ res = v.verify_decision({"example": "decision"})
 print(res)
 EOF
 
+echo "[Axiom Hive] Verification cache test"
+python3 - << 'EOF'
+import os, tempfile
+from core.verify.verifier import TLAVerifier, VerificationCache
+with tempfile.TemporaryDirectory() as d:
+    tlc = os.path.join(d, "tlc")
+    with open(tlc, "w") as f:
+        f.write("#!/bin/sh\necho checked \"$4\" >> \"$(dirname \"$0\")/runs\"\necho 'Model checking completed. No error has been found.'\n")
+    os.chmod(tlc, 0o755)
+    os.environ["PATH"] = d + os.pathsep + os.environ["PATH"]
+    spec, cfg, db = (os.path.join(d, n) for n in ("spec.tla", "spec.cfg", "cache.jsonl"))
+    open(spec, "w").write("---- MODULE spec ----\n====\n"); open(cfg, "w").write("INIT Init\n")
+    v = TLAVerifier(spec, cfg, cache_path=db)
+    first = v.verify_decision({"a": 1}); second = v.verify_decision({"a": 2})
+    assert first["status"] == "PASS" and second["stdout"] == first["stdout"]
+    assert second["context_hash"] != first["context_hash"]
+    assert v.cache.stats()["hits"] == 1
+    warm = TLAVerifier(spec, cfg, cache_path=db)
+    warm.verify_decision({"a": 3})
+    assert warm.cache.stats()["hits"] == 1
+    open(spec, "a").write("\\* changed\n")
+    warm.verify_decision({"a": 3})
+    stats = warm.cache.stats()
+    assert stats["misses"] == 1 and stats["invalidations"] == 1, stats
+    assert len(open(os.path.join(d, "runs")).readlines()) == 2
+    open(spec, "a").write("\\* changed again\n")
+    fresh = VerificationCache(db)
+    assert fresh.stats()["entries"] == 1
+    fresh.key(spec, cfg)
+    assert fresh.stats()["entries"] == 0 and os.path.getsize(db) == 0
+    locks = {id(fresh.key_lock(f"k{i}")) for i in range(1000)}
+    assert len(locks) <= VerificationCache.KEY_LOCK_STRIPES and fresh.key_lock("k1") is fresh.key_lock("k1")
+    print("tlc runs: 2, cache:", stats)
+EOF
+
+echo "[Axiom Hive] TLC worker pool test"
+python3 - << 'EOF'
+import os, sys, tempfile, time
+from core.verify.tlc_pool import WORKER_SCRIPT, TLCWorkerPool
+from core.verify.verifier import TLAVerifier
+with tempfile.TemporaryDirectory() as d:
+    ok, slow, cfg = (os.path.join(d, n) for n in ("ok.tla", "slow.tla", "ok.cfg"))
+    open(ok, "w").write("\\* STANDIN_EXIT=0\n"); open(slow, "w").write("\\* STANDIN_CHECK_MS=5000\n"); open(cfg, "w").write("INIT Init\n")
+    pool = TLCWorkerPool([sys.executable, WORKER_SCRIPT, "--checker", "standin", "--check-ms", "1"], size=2, max_jobs_per_worker=3)
+    v = TLAVerifier(ok, cfg, use_cache=False, worker_pool=pool)
+    assert all(v.verify_decision({"i": i})["status"] == "PASS" for i in range(7))
+    assert TLAVerifier(slow, cfg, use_cache=False, worker_pool=pool, timeout_seconds=0.2).verify_decision({})["status"] == "TIMEOUT"
+    open(ok, "w").write("\\* STANDIN_EXIT=12\n")
+    failed = v.verify_decision({})
+    assert (failed["status"], failed["exit_code"]) == ("FAIL", 12)
+    assert pool.stats["recycled"] == 2 and pool.stats["timeouts"] == 1, pool.stats
+    pool.close()
+    # A stand-in `tlc` on PATH: the fallback must run it, and a timed-out
+    # worker must take it down too.
+    bin_dir, pid_file = os.path.join(d, "bin"), os.path.join(d, "tlc.pid")
+    os.mkdir(bin_dir)
+    fake = os.path.join(bin_dir, "tlc")
+    open(fake, "w").write(f"#!/bin/sh\necho $$ > {pid_file}\n[ -n \"$TLC_SLEEP\" ] && exec sleep $TLC_SLEEP\necho fallback-tlc\n")
+    os.chmod(fake, 0o755)
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+    fallback = TLAVerifier(ok, cfg, use_cache=False, worker_pool=TLCWorkerPool(["/nonexistent/tlc-worker"]))
+    result = fallback.verify_decision({})
+    assert result["status"] == "PASS" and "fallback-tlc" in result["stdout"], result
+    os.environ["TLC_SLEEP"] = "30"
+    tlc_pool = TLCWorkerPool([sys.executable, WORKER_SCRIPT], size=1)
+    assert TLAVerifier(ok, cfg, use_cache=False, worker_pool=tlc_pool, timeout_seconds=0.5).verify_decision({})["status"] == "TIMEOUT"
+    tlc_pool.close()
+    pid = int(open(pid_file).read())
+    for _ in range(100):
+        try:
+            state = open(f"/proc/{pid}/stat").read().rsplit(")", 1)[1].split()[0]
+        except FileNotFoundError:
+            state = "gone"
+        if state in ("Z", "X", "gone"):
+            break
+        time.sleep(0.02)
+    assert state in ("Z", "X", "gone"), f"checker {pid} outlived its worker ({state})"
+    print("pool:", pool.stats)
+EOF
+
+echo "[Axiom Hive] Native invariant checker test"
+python3 - << 'EOF'
+import os, tempfile
+from core.verify.native_checker import AxiomHiveCoreModel, ExplicitStateChecker, model_from_cfg, parse_cfg
+from core.verify.verifier import TLAVerifier
+cfg = parse_cfg("core/verify/axiom_hive_core.cfg")
+assert cfg.invariants == ["TypeOK", "SecureExecution", "RollbackIntegrity", "NoHallucination"]
+assert cfg.properties == ["Liveness"] and cfg.constants["MaxSteps"] == 10
+res = TLAVerifier(checker="auto").verify_decision({"example": "decision"})
+assert res["status"] == "PASS" and res["unchecked"] == ["Liveness"], res
+with tempfile.TemporaryDirectory() as d:
+    # A `tlc` on PATH that records each run: "auto" must not call it for
+    # the shipped cfg, whose only non-native entry is the Liveness property.
+    runs = os.path.join(d, "runs")
+    fake = os.path.join(d, "tlc")
+    open(fake, "w").write(f"#!/bin/sh\necho run >> {runs}\necho tlc-ran\n")
+    os.chmod(fake, 0o755)
+    path = os.environ["PATH"]
+    os.environ["PATH"] = d + os.pathsep + path
+    try:
+        auto = TLAVerifier(checker="auto", use_cache=False)
+        for i in range(3):
+            res = auto.verify_decision({"example": i})
+            assert (res["checker"], res["status"], res["unchecked"]) == ("native", "PASS", ["Liveness"]), res
+        assert not os.path.exists(runs)
+        assert "tlc-ran" in TLAVerifier(use_cache=False).verify_decision({})["stdout"]
+        extra = os.path.join(d, "extra.cfg")
+        open(extra, "w").write(open("core/verify/axiom_hive_core.cfg").read().replace("NoHallucination", "NoHallucination\n  Unmodelled"))
+        full = TLAVerifier(cfg_path=extra, checker="auto", use_cache=False).verify_decision({})
+        assert full["status"] == "PASS" and "tlc-ran" in full["stdout"], full
+        assert len(open(runs).readlines()) == 2
+    finally:
+        os.environ["PATH"] = path
+class Strict(AxiomHiveCoreModel):
+    def complies(self, ctx, axiom):
+        return self.contexts[ctx].get("safe", True)
+bad = TLAVerifier(checker="native", native_model_cls=Strict).verify_decision({"safe": False})
+assert bad["violated"] == "RollbackIntegrity" and [s["action"] for s in bad["trace"]][-1] == "VerifyLogic"
+model = model_from_cfg(cfg)
+reports = [ExplicitStateChecker(model, cfg.invariants, workers=w, parallel_threshold=1).check() for w in (1, 2)]
+assert reports[0]["distinct_states"] == reports[1]["distinct_states"] == 7
+assert ExplicitStateChecker(model, cfg.invariants, symmetry=True).check()["distinct_states"] == 4
+print("native:", res["status"], "strict:", bad["status"], bad["violated"])
+EOF
+
+echo "[Axiom Hive] C=0 group commit test"
+python3 - << 'EOF'
+import os, tempfile, time
+from core.hive_core import CZeroSignature, GroupCommitWriter, SecureService
+def lines(path):
+    with open(path) as f:
+        return len(f.readlines())
+def wait_for(cond):
+    deadline = time.monotonic() + 5
+    while not cond():
+        assert time.monotonic() < deadline, "flush did not happen"
+        time.sleep(0.01)
+record = CZeroSignature(signature="s", context="c", timestamp_ns=0)
+with tempfile.TemporaryDirectory() as d:
+    by_size = os.path.join(d, "size.jsonl")
+    writer = GroupCommitWriter(by_size, flush_interval=60, flush_size=4, max_pending=8)
+    for _ in range(3):
+        writer.submit(record)
+    time.sleep(0.1)
+    assert lines(by_size) == 0
+    writer.submit(record)
+    wait_for(lambda: lines(by_size) == 4)
+    writer.close()
+    by_time = os.path.join(d, "time.jsonl")
+    writer = GroupCommitWriter(by_time, flush_interval=0.02, flush_size=1000, max_pending=1000)
+    writer.submit(record)
+    wait_for(lambda: lines(by_time) == 1)
+    writer.close()
+    on_close = os.path.join(d, "close.jsonl")
+    writer = GroupCommitWriter(on_close, flush_interval=60, flush_size=100, max_pending=100)
+    writer.submit_many([record] * 5)
+    writer.close()
+    assert lines(on_close) == 5
+    try:
+        writer.submit(record)
+        raise AssertionError("submit after close accepted")
+    except ValueError:
+        pass
+assert SecureService().c0_logger._writer is None
+print("group commit: flush on size, on interval and on close")
+EOF
+
 echo "[Axiom Hive] C=0 signature test"
 python3 - << 'EOF'
+import tempfile
 from crypto.c0_signatures import C0Logger
-logger = C0Logger()
-entry = logger.sign_and_log("test_entry", {"field": "value"})
+with tempfile.TemporaryDirectory() as d:
+    logger = C0Logger(d)
+    entry = logger.sign_and_log("test_entry", {"field": "value"})
+    logger.close()
 print(entry)
 EOF
 
+echo "[Axiom Hive] C=0 indexed store test"
+python3 - << 'EOF'
+import os, tempfile, time
+from crypto.c0_signatures import C0Logger
+from crypto.c0_store import C0LogStore
+with tempfile.TemporaryDirectory() as d:
+    lg = C0Logger(d)
+    t0 = time.time_ns()
+    a = lg.sign_and_log("x", {"v": 1}); b = lg.sign_and_log("x", {"v": 1}); c = lg.sign_and_log("y", {"v": 2})
+    t1 = time.time_ns()
+    assert len(lg.lookup(a["hash"])) == 2
+    assert [e["label"] for e in lg.scan(t0, t1 + 1)] == ["x", "x", "y"]
+    assert [e["hash"] for e in lg.scan(label="y")] == [c["hash"]]
+    lg.close()
+    with open(os.path.join(d, "c0_data.jsonl"), "ab") as f: f.write(b'{"torn"')
+    with open(os.path.join(d, "c0_index.bin"), "ab") as f: f.write(b"\x00" * 10)
+    lg = C0Logger(d)
+    assert len(lg.store) == 3 and lg.store.by_label("y")[0]["signature"] == c["signature"]
+    lg.sign_and_log("z", {"v": 3}); assert len(lg.store) == 4
+    out = os.path.join(d, "export")
+    assert lg.export_files(out) == 3
+    legacy = C0Logger(os.path.join(d, "legacy"), layout="files")
+    legacy.sign_and_log("y", {"v": 2})
+    name = f"y_{c['hash'][:12]}.json"
+    assert open(os.path.join(out, name)).read() == open(os.path.join(d, "legacy", name)).read()
+    lg.close()
+    shared = os.path.join(d, "shared")
+    s1, s2 = C0LogStore(shared), C0LogStore(shared)
+    s1.append({"label": "a", "hash": "00" * 32, "signature": "s"})
+    s2.append({"label": "b", "hash": "11" * 32, "signature": "s"})
+    if os.fork() == 0:
+        child = C0LogStore(shared)
+        for i in range(20):
+            child.append({"label": f"c{i}", "hash": "22" * 32, "signature": "s"})
+        os._exit(0)
+    for i in range(20):
+        s1.append({"label": f"p{i}", "hash": "33" * 32, "signature": "s"})
+    os.wait()
+    assert len(s2) == 42 and s2.lookup("00" * 32)[0]["label"] == "a"
+    s1.close(); s2.close()
+    reopened = C0LogStore(shared)
+    assert len(reopened) == 42 and len(list(reopened.scan())) == 42
+    print("store ok", sorted(os.listdir(out)), "shared writers:", len(reopened))
+EOF
+
+echo "[Axiom Hive] Merkle audit log test"
+python3 - << 'EOF'
+import glob, os, tempfile
+from crypto.merkle_log import MerkleAccumulator, MerkleAuditLog
+with tempfile.TemporaryDirectory() as d:
+    log = MerkleAuditLog(d, b"k", segment_max_entries=8, checkpoint_interval=3)
+    for i in range(20):
+        log.append({"i": i})
+    proof = log.prove(5)
+    assert MerkleAccumulator.verify_proof(bytes.fromhex(proof["leaf"]), proof, bytes.fromhex(proof["root"]))
+    assert all(log.verify_segment(n)["valid"] for n in range(3))
+    log.close()
+    active = sorted(glob.glob(os.path.join(d, "segment_*.jsonl")))[-1]
+    with open(active, "a") as f:
+        f.write('{"torn":')
+    log = MerkleAuditLog(d, b"k", segment_max_entries=8, checkpoint_interval=3)
+    assert log.append({"i": 20})["seq"] == 20 and log.verify_segment(2)["valid"]
+    log.close()
+    try:
+        MerkleAuditLog(d, b"k", checkpoint_interval=0)
+        raise AssertionError("checkpoint_interval=0 accepted")
+    except ValueError:
+        pass
+print("torn tail recovered, proofs verify")
+EOF
+
+echo "[Axiom Hive] Mmap state store test"
+python3 - << 'EOF'
+import multiprocessing, os, tempfile
+from core.inference.engine import HybridSSMEngine
+from core.inference.state_store import MmapStateStore
+def writer(path, rounds):
+    store = MmapStateStore(path, hidden_size=64, capacity=16)
+    for i in range(rounds):
+        store.store("s", [float(i)] * 64)
+    store.close()
+with tempfile.TemporaryDirectory() as d:
+    path = os.path.join(d, "states.bin")
+    store = MmapStateStore(path, hidden_size=64, capacity=16)
+    engine = HybridSSMEngine(64)
+    engine.generate("hello", {"k": 1})
+    engine.snapshot(store, "a")
+    store.close()
+    for kwargs in ({"capacity": 32}, {"dtype": "float32"}, {"hidden_size": 32}):
+        try:
+            MmapStateStore(path, **dict({"hidden_size": 64, "capacity": 16}, **kwargs))
+            raise AssertionError(f"reopen with {kwargs} accepted")
+        except ValueError:
+            pass
+    reopened = MmapStateStore(path, hidden_size=64, capacity=16, readonly=True)
+    restored = HybridSSMEngine(64)
+    assert restored.restore(reopened, "a") and restored._state == engine._state
+    proc = multiprocessing.get_context("fork").Process(target=writer, args=(path, 2000))
+    proc.start()
+    reads = 0
+    while proc.is_alive() or reads == 0:
+        state = reopened.load("s")
+        if state is not None:
+            # A torn read would mix two writes' values.
+            assert len(set(state)) == 1, set(state)
+            reads += 1
+    proc.join()
+    assert proc.exitcode == 0 and list(reopened.load("s")) == [1999.0] * 64
+    reopened.close()
+print("state store reopen checks geometry; concurrent reads never torn:", reads > 0)
+EOF
+
+echo "[Axiom Hive] Canonical hash cache test"
+python3 - << 'EOF'
+import hashlib, json
+from core.canonical import CanonicalHashCache
+cache = CanonicalHashCache(max_bytes=100)
+for i in range(10):
+    cache.text_digest(f"prompt {i:02d}" * 2)
+assert cache.stats()["bytes"] <= 100 and cache.stats()["entries"] == 2
+cache.text_digest("x" * 200)
+assert cache.stats()["bytes"] <= 100
+ctx = {"b": [1, 2], "a": "x"}
+expected = hashlib.sha256(json.dumps(ctx, sort_keys=True).encode("utf-8")).hexdigest()
+with cache.request_scope():
+    assert cache.json_hexdigest(ctx) == expected
+    assert cache.json_hexdigest(ctx) == expected
+assert cache.json_hexdigest(dict(ctx)) == expected
+assert cache.text_digest("p") == hashlib.sha256(b"p").digest()
+nested = {"payload": {"context": ctx, "n": 1.5, "é": None}, "ids": [3, 1], "by_id": {2: ctx, 1: "k"}}
+with cache.request_scope():
+    cache.json(ctx)
+    composed = cache.json({"context": ctx, "nested": {"payload": {"context": ctx}}})[0]
+    assert composed == json.dumps({"context": ctx, "nested": {"payload": {"context": ctx}}}, sort_keys=True).encode()
+    assert cache.json(nested)[0] == json.dumps(nested, sort_keys=True).encode()
+# Across requests: equal content in a fresh object hits, without the same id.
+cache = CanonicalHashCache()
+system = "You are a careful assistant. " * 200
+def canonical(obj):
+    return json.dumps(obj, sort_keys=True).encode("utf-8")
+for i in range(3):
+    request = {"system": system, "user": {"turn": 1, "tags": ["a", "b"]}}
+    assert cache.json(request)[0] == canonical(request)
+assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+# Mutation changes the fingerprint; scalars that compare equal in Python stay apart.
+request["user"]["turn"] = 2
+assert cache.json(request)[0] == canonical(request)
+for value in (1, 1.0, True, "1", [1], {"1": 1}, None, "null"):
+    assert cache.json({"v": value})[0] == canonical({"v": value}), value
+assert cache.json({"system": system})[1] == hashlib.sha256(canonical({"system": system})).digest()
+print(cache.stats())
+EOF
+
+echo "[Axiom Hive] Omega Swarm concurrent execution test"
+python3 - << 'EOF'
+import asyncio, os, tempfile
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+requests = [("verified" if i % 2 else "fast", f"prompt {i}", {"i": i}) for i in range(12)]
+audits = []
+for concurrent in (False, True):
+    with tempfile.TemporaryDirectory() as d:
+        swarm = OmegaSwarm(HybridSSMEngine(32), TLAVerifier(), C0Logger(d, layout="segments"), LocalDeoxysCKKS(os.path.join(d, "keys")), verifier_workers=3)
+        if concurrent:
+            results = asyncio.run(swarm.run_many(requests, max_in_flight=4))
+        else:
+            results = [swarm.execute(*r) for r in requests]
+        swarm.close()
+        audits.append([(r["tasks"], r["c0_signature"]) for r in results])
+assert audits[0] == audits[1]
+print("run_many == sequential:", audits[0] == audits[1])
+EOF
+
+echo "[Axiom Hive] Omega Swarm failed inference ordering test"
+python3 - << 'EOF'
+import asyncio, os, tempfile, threading, time
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+class FlakyEngine(HybridSSMEngine):
+    def generate(self, prompt, context):
+        if prompt == "fail":
+            raise RuntimeError("inference failed")
+        return super().generate(prompt, context)
+class FirstCallSlow(TLAVerifier):
+    calls = 0
+    lock = threading.Lock()
+    def verify_decision(self, context):
+        with self.lock:
+            FirstCallSlow.calls += 1
+            first = FirstCallSlow.calls == 1
+        if first:
+            time.sleep(0.3)
+        return super().verify_decision(context)
+with tempfile.TemporaryDirectory() as d:
+    swarm = OmegaSwarm(FlakyEngine(32), FirstCallSlow(), C0Logger(d, layout="segments"), LocalDeoxysCKKS(os.path.join(d, "keys")), verifier_workers=2)
+    signed = []
+    sign = swarm._sign
+    def recording_sign(mode, prompt, *args):
+        signed.append(prompt)
+        return sign(mode, prompt, *args)
+    swarm._sign = recording_sign
+    async def batch():
+        # The failed turn sits between a slow and a fast verification.
+        calls = [swarm.execute_async("verified", p, {"p": p}) for p in ("slow", "fail", "fast")]
+        return await asyncio.gather(*calls, return_exceptions=True)
+    results = asyncio.run(batch())
+    swarm.close()
+    assert isinstance(results[1], RuntimeError) and not isinstance(results[2], BaseException)
+    assert signed == ["slow", "fast"], signed
+print("a failed turn keeps later signatures behind earlier ones:", signed)
+EOF
+
+echo "[Axiom Hive] Sharded swarm test"
+python3 - << 'EOF'
+import os, tempfile
+from core.agent_orchestration import ConsistentHashRing
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+from orchestrator.sharded_swarm import ShardedOmegaSwarm
+keys = [f"s{i}" for i in range(1000)]
+before = {k: ConsistentHashRing(range(4)).node_for(k) for k in keys}
+after = {k: ConsistentHashRing(range(5)).node_for(k) for k in keys}
+moved = sum(before[k] != after[k] for k in keys)
+assert all(after[k] == 4 for k in keys if before[k] != after[k]) and moved < 400, moved
+requests = [("creative", f"step {i}", {"session_id": f"s{i % 7}", "i": i}) for i in range(60)]
+audits = []
+for processes in (False, True):
+    with tempfile.TemporaryDirectory() as d:
+        fhe = LocalDeoxysCKKS(os.path.join(d, "keys"))
+        factory = lambda shard: OmegaSwarm(HybridSSMEngine(32), TLAVerifier(), C0Logger(os.path.join(d, str(shard))), fhe)
+        with ShardedOmegaSwarm(factory, shards=3, batch_size=8, processes=processes) as runner:
+            audits.append([(r["tasks"], r["c0_signature"]) for r in runner.run_many(requests)])
+assert audits[0] == audits[1]
+print("ring keys moved on resize:", moved, "/ 1000; processes == in-process:", audits[0] == audits[1])
+EOF
+
+echo "[Axiom Hive] Sharded swarm worker death test"
+python3 - << 'EOF'
+import glob, os, tempfile
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+from orchestrator.sharded_swarm import ShardedOmegaSwarm
+requests = [("creative", f"step {i}", {"session_id": f"s{i % 7}", "i": i}) for i in range(60)]
+blocks = set(glob.glob("/dev/shm/psm_*"))
+with tempfile.TemporaryDirectory() as d:
+    def factory(shard):
+        swarm = OmegaSwarm(HybridSSMEngine(32), TLAVerifier(), C0Logger(os.path.join(d, str(shard))), LocalDeoxysCKKS(os.path.join(d, "keys")))
+        execute = swarm.execute
+        swarm.execute = lambda mode, prompt, context: os._exit(1) if prompt == "step 30" else execute(mode, prompt, context)
+        return swarm
+    for kill_first in (False, True):
+        with ShardedOmegaSwarm(factory, shards=3, batch_size=8) as runner:
+            if kill_first:
+                for proc in runner._procs:
+                    proc.kill()
+                    proc.join()
+            try:
+                runner.run_many(requests)
+                raise AssertionError("dead shard not reported")
+            except RuntimeError as exc:
+                assert str(exc).startswith("shard ") and str(exc).endswith(" died"), exc
+    assert set(glob.glob("/dev/shm/psm_*")) == blocks
+print("dead shard raises RuntimeError and leaks no shared memory")
+EOF
+
+echo "[Axiom Hive] Adaptive sharding test"
+python3 - << 'EOF'
+import time
+from core.agent_orchestration import AdaptiveChunkSizer, ShardingManager
+sizer = AdaptiveChunkSizer(target_seconds=0.01)
+sizer.record(1000, 0.001)
+assert sizer.size() == 10000 and sizer.size(workers=4, total=800) == 50
+sizer.record(10, 0.01)
+assert sizer.size() < 1000
+manager = ShardingManager(4)
+assert [len(c) for c in manager.iter_shards(iter(range(25)), 10)] == [10, 10, 5]
+slow = lambda i: (time.sleep(0.002) if i < 40 else None, i * i)[1]
+assert list(manager.map(slow, iter(range(3000)))) == [i * i for i in range(3000)]
+stats = dict(manager.stats)
+def fail(i):
+    if i == 1234:
+        raise ValueError(i)
+    return i
+try:
+    list(manager.map(fail, range(5000)))
+    raise AssertionError("error not raised")
+except ValueError:
+    pass
+def source(n, fail_at):
+    for i in range(n):
+        if i == fail_at:
+            raise RuntimeError("input failed")
+        yield i
+for workers in (1, 4):
+    out = []
+    try:
+        for value in ShardingManager(workers).map(lambda i: i, source(2000, 500)):
+            out.append(value)
+        raise AssertionError("input error not raised")
+    except RuntimeError:
+        assert out == list(range(500)), len(out)
+print("ordered results with skewed cost:", stats)
+EOF
+
+echo "[Axiom Hive] DAG scheduler test"
+python3 - << 'EOF'
+import os
+import tempfile
+from core.agent_orchestration import DAGCycleError, DAGManager
+from core.inference.engine import HybridSSMEngine
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+calls = []
+def op(name, fn):
+    def run(*args):
+        calls.append(name)
+        return fn(*args)
+    return run
+dag = DAGManager()
+dag.add("total", op("total", lambda a, b: a + b), ("double", "square"))
+dag.add("double", op("double", lambda x: 2 * x), ("x",))
+dag.add("square", op("square", lambda y: y * y), ("y",))
+assert dag.topological_order() == ["double", "square", "total"]
+assert dag.run({"x": 3, "y": 4}).values["total"] == 22
+calls.clear()
+run = dag.run({"x": 5, "y": 4})
+assert run.values["total"] == 26 and sorted(calls) == ["double", "total"] and run.cached == ["square"]
+shared = DAGManager(memo_size=2)
+shared.add("items", lambda n: [n], ("n",))
+shared.run({"n": 1}).values["items"].append("mutated")
+mutated = shared.run({"n": 1})
+mutated.values["items"].append("again")
+assert shared.run({"n": 1}).values["items"] == [1] and mutated.cached == ["items"]
+for n in range(2, 6):
+    shared.run({"n": n})
+assert len(shared._memo) == 2 and shared.run({"n": 1}).cached == []
+cyclic = DAGManager()
+cyclic.add("a", lambda b: b, ("b",))
+cyclic.add("b", lambda a: a, ("a",))
+try:
+    cyclic.topological_order()
+    raise AssertionError("cycle not detected")
+except DAGCycleError as exc:
+    assert exc.nodes == ["a", "b"]
+audits = []
+for use_dag in (False, True):
+    with tempfile.TemporaryDirectory() as d:
+        swarm = OmegaSwarm(HybridSSMEngine(32), TLAVerifier(), C0Logger(d), LocalDeoxysCKKS(os.path.join(d, "keys")))
+        requests = [("verified", f"prompt {i}", {"i": i}) for i in range(4)]
+        results = [swarm.execute_dag(*r)[0] if use_dag else swarm.execute(*r) for r in requests]
+        audits.append([(r["tasks"], r["c0_signature"]) for r in results])
+        swarm.c0.close()
+assert audits[0] == audits[1]
+print("recomputed:", calls, "execute_dag == execute:", audits[0] == audits[1])
+EOF
+
+echo "[Axiom Hive] HTTP API test"
+python3 - << 'EOF'
+import asyncio, json, os, tempfile, threading
+from api.server import AxiomHiveServer, build_swarm
+from monetization.l402_gate import L402Gate
+
+class ThreadGate(L402Gate):
+    threads = []
+    def create_invoice(self, purpose):
+        self.threads.append(threading.current_thread().name)
+        return super().create_invoice(purpose)
+    def issue_token(self, invoice_id):
+        self.threads.append(threading.current_thread().name)
+        return super().issue_token(invoice_id)
+    def verify_token(self, token):
+        self.threads.append(threading.current_thread().name)
+        return super().verify_token(token)
+
+def req(method, path, body=None, headers=""):
+    data = json.dumps(body).encode() if body is not None else b""
+    return f"{method} {path} HTTP/1.1\r\nHost: x\r\n{headers}Content-Length: {len(data)}\r\n\r\n".encode() + data
+
+async def read_response(reader):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    status = int(head.split(" ")[1])
+    headers = dict(l.split(": ", 1) for l in head.split("\r\n")[1:] if l)
+    if headers.get("Transfer-Encoding") == "chunked":
+        body = b""
+        while True:
+            size = int(await reader.readuntil(b"\r\n"), 16)
+            chunk = await reader.readexactly(size + 2)
+            if not size:
+                break
+            body += chunk[:-2]
+        return status, headers, [json.loads(l) for l in body.splitlines()]
+    return status, headers, json.loads(await reader.readexactly(int(headers["Content-Length"])))
+
+async def main(log_dir):
+    server = AxiomHiveServer(build_swarm(log_dir, 2, key_dir=os.path.join(log_dir, "keys")), ThreadGate(), port=0)
+    await server.start()
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    # Keep-alive: several requests on one connection.
+    writer.write(req("GET", "/health"))
+    assert (await read_response(reader))[0] == 200
+    writer.write(req("POST", "/axiom/creative", {"prompt": "p-1", "context": {"i": -1}}))
+    status, _, result = await read_response(reader)
+    assert status == 200 and result["mode"] == "creative"
+    # Pipelining: responses come back in request order.
+    writer.write(b"".join(req("POST", "/axiom/creative", {"prompt": f"p{i}", "context": {"i": i}}) for i in range(5)))
+    piped = [await read_response(reader) for _ in range(5)]
+    with tempfile.TemporaryDirectory() as d:
+        reference = build_swarm(d, 1, key_dir=os.path.join(d, "keys"))
+        expected = [reference.execute("creative", f"p{i}", {"i": i}) for i in range(-1, 5)]
+        reference.c0.close()
+    served = [result] + [r[2] for r in piped]
+    assert [(r["tasks"], r["c0_signature"]) for r in served] == [(e["tasks"], e["c0_signature"]) for e in expected]
+    # L402: 402 with invoice, then token unlocks verified mode.
+    writer.write(req("POST", "/axiom/verified", {"prompt": "v", "context": {}}))
+    status, headers, body = await read_response(reader)
+    assert status == 402 and headers["WWW-Authenticate"].startswith("L402")
+    writer.write(req("POST", "/monetization/issue_token", {"invoice_id": body["invoice"]["id"]}))
+    token = (await read_response(reader))[2]["token"]
+    writer.write(req("POST", "/axiom/verified", {"prompt": "v", "context": {}},
+                     f"X-L402-Token: {token}\r\nAccept: application/x-ndjson\r\n"))
+    status, headers, events = await read_response(reader)
+    assert status == 200 and [e["event"] for e in events] == ["task", "task", "task", "result"]
+    assert [e["task"] for e in events[:3]] == [t["task"] for t in events[-1]["result"]["tasks"]]
+    # Gate calls (possibly SQLite writes) never run on the event loop thread.
+    assert len(ThreadGate.threads) == 4 and all(t.startswith("omega-io") for t in ThreadGate.threads), ThreadGate.threads
+    writer.write(req("GET", "/nope") + req("GET", "/axiom/creative"))
+    assert [(await read_response(reader))[0] for _ in range(2)] == [404, 405]
+    writer.write(req("GET", "/health", headers="Connection: close\r\n"))
+    assert (await read_response(reader))[1]["Connection"] == "close"
+    assert await reader.read() == b""
+    print("keep-alive, pipelining, L402 and ndjson streaming: ok", server.stats)
+    writer.close()
+    await server.close()
+    server.swarm.close()
+    server.swarm.c0.close()
+
+with tempfile.TemporaryDirectory() as d:
+    asyncio.run(main(d))
+EOF
+
+echo "[Axiom Hive] Metrics test"
+python3 - << 'EOF'
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+from core.hive_core import CZeroLogger, FHEEngine, SecureService
+from core.inference.engine import HybridSSMEngine
+from core.metrics import LatencyHistogram, MetricsRegistry
+from core.verify.verifier import TLAVerifier
+from crypto.c0_signatures import C0Logger
+from crypto.fhe_local import LocalDeoxysCKKS
+from orchestrator.omega_swarm import OmegaSwarm
+hist = LatencyHistogram()
+values = [random.randint(1, 10**9) for _ in range(10000)]
+for v in values:
+    hist.record(v)
+values.sort()
+for q in (0.5, 0.99):
+    true = values[int(q * len(values) + 0.5) - 1]
+    assert abs(hist.percentile(q) - true) / true < 1 / 32
+with tempfile.TemporaryDirectory() as d:
+    metrics = MetricsRegistry()
+    swarm = OmegaSwarm(HybridSSMEngine(32), TLAVerifier(metrics=metrics), C0Logger(d, metrics=metrics), LocalDeoxysCKKS(os.path.join(d, "keys")), metrics=metrics)
+    plain = OmegaSwarm(HybridSSMEngine(32), TLAVerifier(), C0Logger(os.path.join(d, "plain")), LocalDeoxysCKKS(os.path.join(d, "keys")))
+    assert "execute" not in vars(plain) and "verify_decision" not in vars(plain.verifier)
+    for i in range(5):
+        a = swarm.execute("verified", f"prompt {i}", {"i": i})
+        b = plain.execute("verified", f"prompt {i}", {"i": i})
+        assert a["c0_signature"] == b["c0_signature"]
+    snap = json.loads(metrics.to_json())
+    assert snap["stages"]["omega.inference"]["count"] == 5 and snap["targets"]["c0.sign"]["ok"]
+    assert snap["counters"]["bytes_logged"] == swarm.c0.store.size_bytes
+    text = metrics.to_prometheus()
+    assert 'axiom_stage_seconds_count{stage="verifier.verify"} 5' in text and "axiom_bytes_hashed_total" in text
+    swarm.c0.close(); plain.c0.close()
+    metrics = MetricsRegistry()
+    log_file = os.path.join(d, "c0.jsonl")
+    shared = CZeroLogger(secret_key=b"k", log_file=log_file, metrics=metrics)
+    svc = SecureService(c0_logger=shared, fhe_engine=FHEEngine(metrics=metrics), metrics=metrics)
+    svc.sensitive_transform(b"x" * 100, "ctx", "res", None)
+    svc.sensitive_transform_batch([{"payload": b"y" * 50, "context": "c", "resource_id": "r"}] * 2)
+    svc.sensitive_transform_stream(io.BytesIO(b"s" * 30), "ctx", "res", None, chunk_size=8)
+    counters = metrics.counters
+    assert counters["bytes_encrypted"] == 230 and counters["bytes_hashed"] == 460
+    assert counters["bytes_logged"] == os.path.getsize(log_file)
+    stages = metrics.snapshot()["stages"]
+    assert stages["secure.c0_log"]["count"] == 3 and stages["secure.fhe_encrypt"]["count"] == 6
+    svc.close()
+    # Service metrics patch nothing, not even the service's logger or engine.
+    metrics = MetricsRegistry(sample_every=4)
+    svc = SecureService(c0_logger=CZeroLogger(secret_key=b"k"), metrics=metrics)
+    assert not {"sensitive_transform", "log", "encrypt"} & (set(vars(svc)) | set(vars(svc.c0_logger)) | set(vars(svc.fhe_engine)))
+    for _ in range(8):
+        svc.sensitive_add_encrypted(b"a" * 3, b"b" * 7, "ctx", "res", None)
+    # Two sampled calls of ten bytes, each standing for four.
+    assert metrics.counters["bytes_encrypted"] == 80 and metrics.histogram("secure.sensitive_add_encrypted").count == 8
+    class Boom(Exception):
+        pass
+    def boom(plaintext):
+        raise Boom()
+    metrics = MetricsRegistry(sample_every=4)
+    svc = SecureService(c0_logger=CZeroLogger(secret_key=b"k", log_file=os.path.join(d, "failed.jsonl")), metrics=metrics)
+    svc.fhe_engine.encrypt = boom
+    try:
+        svc.sensitive_transform(b"z" * 10, "ctx", "res", None)
+        raise AssertionError("failure swallowed")
+    except Boom:
+        pass
+    assert "bytes_encrypted" not in metrics.counters
+    svc.close()
+sampled = MetricsRegistry(sample_every=4)
+timed = sampled.wrap("s", lambda: None)
+for _ in range(10):
+    timed()
+assert sampled.histogram("s").count == 12
+hist = LatencyHistogram()
+def work():
+    hist.record(1000)
+    sampled.add("threads")
+for _ in range(5):
+    t = threading.Thread(target=work)
+    t.start()
+    t.join()
+assert len(hist._shards) == 1 and hist.count == 5 and hist.summary()["total"] == 5000
+assert len(sampled._counter_shards) == 1 and sampled.counters["threads"] == 5
+print("stages:", sorted(snap["stages"]), "counters:", counters)
+EOF
+
+echo "[Axiom Hive] FHE bulk kernel test"
+python3 - << 'EOF'
+import os
+from core.hive_core import BULK_BACKENDS, FHECiphertext, FHEEngine, _mul_bytes, _xor_bytes, np
+backends = [b for b in BULK_BACKENDS if b != "numpy" or np is not None]
+for n in (0, 1, 7, 31, 33, 255, 1001):
+    a, b = os.urandom(n), os.urandom(n)
+    xor_ref = bytes(x ^ y for x, y in zip(a, b))
+    mul_ref = bytes((x * y) & 0xFF for x, y in zip(a, b))
+    for backend in backends:
+        assert _xor_bytes(a, b, backend) == xor_ref, (backend, n)
+        assert _mul_bytes(a, b, backend) == mul_ref, (backend, n)
+        engine = FHEEngine(backend=backend)
+        ca, cb = FHECiphertext(raw=a, scheme=engine.scheme), FHECiphertext(raw=b + b"x", scheme=engine.scheme)
+        assert engine.eval_add(ca, cb).raw == xor_ref and engine.eval_mul(ca, cb).raw == mul_ref
+        assert engine.decrypt(engine.encrypt(a)) == a
+print("bulk kernels match the reference at odd lengths:", backends)
+EOF
+
+echo "[Axiom Hive] FHE key rotation test"
+python3 - << 'EOF'
+import hashlib, os
+from core.hive_core import FHEEngine
+def reference(engine, data, offset=0):
+    mask = hashlib.sha256(engine.get_keyset().key_id.encode("utf-8")).digest()
+    return bytes(b ^ mask[(offset + i) % len(mask)] for i, b in enumerate(data))
+data = os.urandom(1000)
+for cap in (1 << 24, 64):
+    engine = FHEEngine(keystream_cap=cap)
+    before = engine.encrypt(data).raw
+    assert before == reference(engine, data)
+    old_id = engine.get_keyset().key_id
+    engine.rotate_keys()
+    assert engine.get_keyset().key_id != old_id
+    after = engine.encrypt(data).raw
+    assert after != before and after == reference(engine, data)
+    assert engine.encrypt_chunk(data[100:300], 100) == reference(engine, data[100:300], 100)
+    assert [c.raw for c in engine.encrypt_many([data[:5], data])] == [reference(engine, data[:5]), after]
+    assert engine.decrypt(engine.encrypt(data)) == data
+print("rotated keys invalidate the cached mask and keystream")
+EOF
+
 echo "[Axiom Hive] FHE local test"
 python3 - << 'EOF'
+import tempfile
 from crypto.fhe_local import LocalDeoxysCKKS
-fhe = LocalDeoxysCKKS()
-c1 = fhe.encrypt(3)
-c2 = fhe.encrypt(4)
-c3 = fhe.add(c1, c2)
-c4 = fhe.mul(c1, c2)
-print("3+4 =", fhe.decrypt(c3))
-print("3*4 =", fhe.decrypt(c4))
+with tempfile.TemporaryDirectory() as d:
+    fhe = LocalDeoxysCKKS(d)
+    c1 = fhe.encrypt(3)
+    c2 = fhe.encrypt(4)
+    c3 = fhe.add(c1, c2)
+    c4 = fhe.mul(c1, c2)
+    print("3+4 =", fhe.decrypt(c3))
+    print("3*4 =", fhe.decrypt(c4))
+EOF
+
+echo "[Axiom Hive] Expiring token store test"
+python3 - << 'EOF'
+import time
+from monetization.store import ExpiringTokenStore
+now = [0]
+store = ExpiringTokenStore(capacity=3, clock=lambda: now[0])
+for tok in "abc":
+    store.put(tok, tok.upper(), expires_at=100)
+assert store.get("a") == "A"
+store.put("d", "D", expires_at=100)
+assert store.get("b") is None and [store.get(t) for t in "acd"] == ["A", "C", "D"] and store.evicted_lru == 1
+now[0] = 100
+assert store.get("a") == "A"
+now[0] = 101
+assert store.get("a") is None and store.evicted_expired == 1
+store = ExpiringTokenStore(capacity=100, clock=lambda: now[0])
+now[0] = 0
+for i in range(10):
+    store.put(f"old{i}", i, expires_at=5)
+now[0] = 10
+store.put("new", 0, expires_at=50)
+assert len(store) == 11 - ExpiringTokenStore.EVICT_BUDGET
+assert store.evict_expired(budget=2) == 2 and store.evict_expired() == 10 - ExpiringTokenStore.EVICT_BUDGET - 2
+assert len(store) == 1
+store.put("gone", 0, expires_at=11)
+now[0] = 20
+store.start_sweeper(interval_seconds=0.01)
+deadline = time.monotonic() + 5
+while len(store) > 1:
+    assert time.monotonic() < deadline, "sweeper did not evict"
+    time.sleep(0.01)
+store.stop_sweeper()
+assert store.get("new") == 0
+print("token store: LRU, expiry, eviction budget and sweeper")
+EOF
+
+echo "[Axiom Hive] Stateless L402 token test"
+python3 - << 'EOF'
+import contextlib, io, os, tempfile
+from core.hive_core import MonetizationManager, StatelessTokenCodec, main
+key = b"shared-key"
+issuer = MonetizationManager(stateless_tokens=True, server_key=key)
+other = MonetizationManager(stateless_tokens=True, server_key=key)
+token = issuer.issue_l402_token("res", ttl_seconds=60).token
+assert token.startswith(StatelessTokenCodec.PREFIX) and other.validate_l402_token(token, "res")
+assert not other.validate_l402_token(token, "other-res")
+assert not MonetizationManager(server_key=b"another-key").validate_l402_token(token, "res")
+expired = issuer.issue_l402_token("res", ttl_seconds=-1).token
+assert not other.validate_l402_token(expired, "res")
+# A non-ASCII character used to be dropped before the MAC check, so this still verified.
+head, body_mac = token[: len(StatelessTokenCodec.PREFIX)], token[len(StatelessTokenCodec.PREFIX):]
+smuggled = head + body_mac[:5] + "é" + body_mac[5:]
+assert StatelessTokenCodec(key).decode(smuggled) is None and not other.validate_l402_token(smuggled, "res")
+try:
+    StatelessTokenCodec(b"")
+    raise AssertionError("empty server key accepted")
+except ValueError:
+    pass
+with tempfile.TemporaryDirectory() as d:
+    empty = os.path.join(d, "empty.key")
+    open(empty, "wb").close()
+    err = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(err):
+            main(["--stateless-l402", "--l402-key-file", empty, "show-log"])
+        raise AssertionError("empty key file accepted")
+    except SystemExit as exc:
+        assert exc.code == 2 and "is empty" in err.getvalue()
+    err = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(err):
+            main(["--connect", os.path.join(d, "none.sock"), "--l402-key-file", empty, "show-log"])
+    except OSError:
+        pass
+    assert "warning: --l402-key-file ignored with --connect" in err.getvalue()
+print("stateless tokens verify across managers; non-ASCII and empty keys rejected")
+EOF
+
+echo "[Axiom Hive] Monetization persistence test"
+python3 - << 'EOF'
+import os, tempfile, time
+from core.hive_core import L402Token, MonetizationManager, SQLiteMonetizationBackend
+from monetization.l402_gate import L402Gate
+with tempfile.TemporaryDirectory() as d:
+    db = os.path.join(d, "state.db")
+    manager = MonetizationManager(backend=SQLiteMonetizationBackend(db))
+    invoice = manager.create_invoice(1000, "persisted")
+    # No flush or close: a second connection stands in for the process after a crash.
+    assert SQLiteMonetizationBackend(db).get_invoice(invoice.invoice_id) is not None
+    gate = L402Gate(token_ttl_seconds=60, backend=SQLiteMonetizationBackend(db))
+    gate_token = gate.issue_token(gate.create_invoice("api")["id"])
+    store_token = manager.issue_l402_token("res", ttl_seconds=60)
+    backend = SQLiteMonetizationBackend(db)
+    now_ns = time.time_ns()
+    for token in (gate_token, store_token.token):
+        assert now_ns < backend.get_token(token).expires_at_ns <= now_ns + 61 * 10**9
+    backend.add_token(L402Token(token="old", resource_id="res", expires_at_ns=now_ns - 1))
+    assert backend.purge_expired_tokens(now_ns) == 1
+    assert L402Gate(backend=SQLiteMonetizationBackend(db)).verify_token(gate_token)
+    assert MonetizationManager(backend=SQLiteMonetizationBackend(db)).validate_l402_token(store_token.token, "res")
+print("invoices committed before return; token expiry in ns for gate and manager")
 EOF
 
 echo "[Axiom Hive] L402 gate test"
@@ -48,4 +940,125 @@ token = g.issue_token(inv["id"])
 print("token", token, "valid:", g.verify_token(token))
 EOF
 
+echo "[Axiom Hive] Secure service streaming test"
+python3 - << 'EOF'
+import contextlib, io, os, tempfile
+from core.hive_core import CZeroLogger, SecureService, build_parser
+svc = SecureService(c0_logger=CZeroLogger(secret_key=b"test"))
+data = bytes(range(256)) * 41
+full = svc.sensitive_transform(data, "ctx", "res", None)
+sink = io.BytesIO()
+streamed = svc.sensitive_transform_stream(io.BytesIO(data), "ctx", "res", None, sink=sink, chunk_size=1000)
+full.pop("c0_timestamp_ns")
+streamed.pop("c0_timestamp_ns")
+assert full == streamed, (full, streamed)
+assert sink.getvalue() == svc.fhe_engine.encrypt(data).raw
+for bad in (0, -1):
+    try:
+        svc.sensitive_transform_stream(io.BytesIO(data), "ctx", "res", None, chunk_size=bad)
+        raise AssertionError("chunk_size accepted")
+    except ValueError:
+        pass
+parser = build_parser()
+try:
+    with contextlib.redirect_stderr(io.StringIO()):
+        parser.parse_args(["sensitive-transform", "--input", "x", "--stream", "--chunk-size", "0"])
+    raise AssertionError("--chunk-size 0 accepted")
+except SystemExit:
+    pass
+with tempfile.TemporaryDirectory() as d:
+    src, out = os.path.join(d, "in.bin"), os.path.join(d, "ct.bin")
+    open(src, "wb").write(data)
+    args = parser.parse_args(["sensitive-transform", "--input", src, "--context", "c", "--resource-id", "r", "--ciphertext-out", out])
+    args.out = io.StringIO()
+    args.func(args, svc)
+    assert open(out, "rb").read() == svc.fhe_engine.encrypt(data).raw
+print("stream == full:", full == streamed)
+EOF
+
+echo "[Axiom Hive] Secure service batch CLI test"
+python3 - << 'EOF'
+import base64, contextlib, io, json, os, tempfile
+from core.hive_core import CZeroLogger, SecureService, main
+with tempfile.TemporaryDirectory() as d:
+    batch = os.path.join(d, "batch.jsonl")
+    with open(batch, "w") as f:
+        f.write(json.dumps({"payload": "alpha", "context": "c1", "resource_id": "r1"}) + "\n\n")
+        f.write(json.dumps({"payload_b64": base64.b64encode(b"\x00\xffbeta").decode()}) + "\n")
+        f.write(json.dumps({"payload": "gamma", "resource_id": "r3"}) + "\n")
+    pairs = os.path.join(d, "pairs.jsonl")
+    with open(pairs, "w") as f:
+        f.write(json.dumps({"a": "1", "b_b64": base64.b64encode(b"\x02").decode(), "context": "c", "resource_id": "r"}) + "\n")
+    cwd = os.getcwd()
+    os.chdir(d)  # main() writes its C=0 log to the working directory
+    try:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            main(["sensitive-transform", "--batch", batch, "--batch-size", "2", "--context", "flag-ctx", "--resource-id", "flag-res"])
+            main(["sensitive-add", "--batch", pairs])
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        with open("c0_log.jsonl") as f:
+            contexts = [json.loads(line)["context"] for line in f]
+        for argv in (["sensitive-transform", "--batch", batch], ["sensitive-transform", "--input", batch, "--context", "c"]):
+            err = io.StringIO()
+            try:
+                with contextlib.redirect_stderr(err):
+                    main(argv)
+                raise AssertionError(f"accepted {argv}")
+            except (SystemExit, ValueError) as exc:
+                # A record without context and no --context flag; a single call without --resource-id.
+                assert isinstance(exc, ValueError) or "--resource-id" in err.getvalue(), exc
+    finally:
+        os.chdir(cwd)
+svc = SecureService(c0_logger=CZeroLogger(secret_key=b"k"))
+expected = [
+    svc.sensitive_transform(b"alpha", "c1", "r1", None),
+    svc.sensitive_transform(b"\x00\xffbeta", "flag-ctx", "flag-res", None),
+    svc.sensitive_transform(b"gamma", "flag-ctx", "r3", None),
+]
+assert len(lines) == 4 and contexts == ["c1", "flag-ctx", "flag-ctx", "c"]
+for got, want in zip(lines, expected):
+    assert (got["digest_sha256"], got["resource_id"]) == (want["digest_sha256"], want["resource_id"])
+assert lines[3]["resource_id"] == "r"
+print("batch JSONL: per-record fields override the --context/--resource-id defaults")
+EOF
+
+echo "[Axiom Hive] Daemon round-trip test"
+python3 - << 'EOF'
+import contextlib, io, json, os, socket, stat, tempfile, threading
+from core.hive_core import CZeroLogger, HiveDaemon, SecureService, run_client
+with tempfile.TemporaryDirectory() as d:
+    path = os.path.join(d, "hive.sock")
+    old_umask = os.umask(0o002)
+    try:
+        server = HiveDaemon(path, SecureService(c0_logger=CZeroLogger(secret_key=b"k")))
+    finally:
+        os.umask(old_umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        HiveDaemon(path, server.service)
+        raise AssertionError("live socket replaced")
+    except OSError:
+        pass
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(path)
+        sock.sendall(b'{"argv": \n[1, 2]\n')
+        reader = sock.makefile("rb")
+        assert [json.loads(reader.readline())["error"] for _ in range(2)] == ["malformed request"] * 2
+    data = os.path.join(d, "in.bin")
+    open(data, "wb").write(b"hello daemon")
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = run_client(path, ["sensitive-transform", "--input", data, "--context", "c", "--resource-id", "r"])
+    result = json.loads(out.getvalue())
+    direct = SecureService(c0_logger=CZeroLogger(secret_key=b"k")).sensitive_transform(b"hello daemon", "c", "r", None)
+    assert code == 0 and result["digest_sha256"] == direct["digest_sha256"]
+    server.shutdown()
+    server.server_close()
+    # The socket file outlives a dead daemon; the next one replaces it.
+    HiveDaemon(path, server.service).server_close()
+print("daemon round trip ok, socket mode 0600")
+EOF
+
 echo "[Axiom Hive] All tests complete"
\ No newline at end of file